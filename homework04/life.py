@@ -1,7 +1,12 @@
+import functools
 import pathlib
 import random
+import re
 import typing as tp
 
+import life_checkpoint
+import life_io
+import numpy as np
 import pygame
 from pygame.locals import *
 
@@ -9,6 +14,188 @@ Cell = tp.Tuple[int, int]
 Cells = tp.List[int]
 Grid = tp.List[Cells]
 
+MASK64 = (1 << 64) - 1
+
+# Сдвиги к восьми соседям клетки, построчно
+OFFSETS = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+# Границы поля: за краем ограниченного поля клетки мертвы, у тора края склеены
+BOUNDARIES = ("bounded", "torus")
+
+# Новое состояние клетки: RuleTable[состояние][число живых соседей]
+RuleTable = tp.Tuple[tp.Tuple[int, ...], tp.Tuple[int, ...]]
+
+RULE_PATTERN = re.compile(r"^(?:B([0-8]*)/S([0-8]*)|S([0-8]*)/B([0-8]*)|([0-8]*)/([0-8]*))$", re.IGNORECASE)
+
+
+class Cycle(tp.NamedTuple):
+    """Поколение, с которого началось повторение, и период повторения."""
+
+    start: int
+    period: int
+
+
+class Rule(tp.NamedTuple):
+    """
+    Правило клеточного автомата вида `B3/S23`: при каком числе живых
+    соседей мертвая клетка рождается (B) и живая выживает (S).
+
+    `table` - то же правило в виде таблицы, по которой движки находят новое
+    состояние клетки одним обращением без ветвлений.
+    """
+
+    born: tp.FrozenSet[int]
+    survive: tp.FrozenSet[int]
+    table: RuleTable
+
+    @property
+    def name(self) -> str:
+        return "B" + "".join(map(str, sorted(self.born))) + "/S" + "".join(map(str, sorted(self.survive)))
+
+
+@functools.lru_cache(maxsize=None)
+def parse_rule(rule: str) -> Rule:
+    """
+    Разобрать правило в записи `B3/S23` (или `S23/B3`, или `23/3`, где
+    сначала идут условия выживания) и построить по нему таблицу.
+    """
+    match = RULE_PATTERN.match(rule.strip())
+    if match is None:
+        raise ValueError(f"неизвестное правило: {rule!r}")
+    b1, s1, s2, b2, s3, b3 = match.groups()
+    born = frozenset(int(n) for n in (b1 if b1 is not None else b2 if b2 is not None else b3))
+    survive = frozenset(int(n) for n in (s1 if s1 is not None else s2 if s2 is not None else s3))
+    table = (
+        tuple(int(n in born) for n in range(9)),
+        tuple(int(n in survive) for n in range(9)),
+    )
+    return Rule(born, survive, table)
+
+
+CONWAY = parse_rule("B3/S23")
+
+
+@functools.lru_cache(maxsize=None)
+def rule_groups(rule: Rule) -> tp.Tuple[tp.FrozenSet[int], tp.FrozenSet[int], tp.FrozenSet[int]]:
+    """
+    Разложить таблицу правила на три группы чисел соседей: при которых
+    клетка жива в любом случае, только если была жива и только если была
+    мертва. Для B3/S23 это {3}, {2} и пустое множество.
+    """
+    born, survive = rule.table
+    return (
+        frozenset(n for n in range(9) if born[n] and survive[n]),
+        frozenset(n for n in range(9) if survive[n] and not born[n]),
+        frozenset(n for n in range(9) if born[n] and not survive[n]),
+    )
+
+
+class Stats(tp.NamedTuple):
+    """
+    Статистика поколения: число живых клеток, сколько клеток родилось и
+    умерло с предыдущего поколения и рамка живых клеток `(top, left,
+    bottom, right)` (нижняя и правая границы не включаются) или `None`,
+    если живых клеток нет.
+    """
+
+    population: int
+    births: int
+    deaths: int
+    bbox: tp.Optional[tp.Tuple[int, int, int, int]]
+
+    @property
+    def changed(self) -> int:
+        return self.births + self.deaths
+
+
+class Changes(tp.NamedTuple):
+    """
+    Клетки, которые родились и умерли за последний шаг: массивы координат
+    формы (N, 2), строка - (номер строки, номер столбца).
+    """
+
+    born: np.ndarray
+    died: np.ndarray
+
+
+def cell_array(cells: tp.Iterable[Cell]) -> np.ndarray:
+    """Собрать координаты клеток в массив формы (N, 2)."""
+    return np.array(list(cells), dtype=np.int64).reshape(-1, 2)
+
+
+class GridView(tp.Sequence[tp.Tuple[int, ...]]):
+    """
+    Поколение `Grid` только для чтения: строки отдаются кортежами при
+    обращении, само поле не копируется.
+    """
+
+    __slots__ = ("_grid",)
+
+    def __init__(self, grid: Grid) -> None:
+        self._grid = grid
+
+    @tp.overload
+    def __getitem__(self, index: int) -> tp.Tuple[int, ...]: ...
+
+    @tp.overload
+    def __getitem__(self, index: slice) -> tp.Sequence[tp.Tuple[int, ...]]: ...
+
+    def __getitem__(self, index: tp.Union[int, slice]) -> tp.Any:
+        if isinstance(index, slice):
+            return GridView(self._grid[index])
+        return tuple(self._grid[index])
+
+    def __len__(self) -> int:
+        return len(self._grid)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, GridView):
+            return self._grid == other._grid
+        if isinstance(other, list):
+            return self._grid == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"GridView({self._grid!r})"
+
+
+def cell_key(cell: Cell) -> int:
+    """
+    Ключ Зобриста для клетки: 64-битное число, полученное перемешиванием
+    (splitmix64) ее координат.
+
+    Хеш поля - XOR ключей всех живых клеток, поэтому при смене поколения
+    его можно обновить по одним только изменившимся клеткам. Ключи не
+    хранятся в таблице и подходят для поля любого размера.
+    """
+    row, col = cell
+    z = (((row & 0xFFFFFFFF) << 32) | (col & 0xFFFFFFFF)) + 0x9E3779B97F4A7C15 & MASK64
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EB & MASK64
+    return z ^ (z >> 31)
+
+
+class History:
+    """
+    Последние поколения игры, записанные в `step`: `history[0]` - текущее,
+    `history[k]` - на `k` шагов раньше. Поколения хранятся упакованными по
+    битам в `life_checkpoint.FrameRing` и распаковываются движком при
+    обращении.
+    """
+
+    def __init__(self, game: "GameOfLife", ring: life_checkpoint.FrameRing) -> None:
+        self._game = game
+        self.ring = ring
+
+    def __len__(self) -> int:
+        return len(self.ring)
+
+    def __getitem__(self, k: int) -> tp.Any:
+        return self._game.unpack_frame(self.ring[k][1])
+
+    def generation(self, k: int) -> int:
+        """Номер поколения `history[k]`."""
+        return self.ring[k][0]
+
 
 class GameOfLife:
     def __init__(
@@ -16,9 +203,19 @@ class GameOfLife:
         size: tp.Tuple[int, int],
         randomize: bool = True,
         max_generations: tp.Optional[float] = float("inf"),
+        max_period: int = 0,
+        rule: tp.Union[str, Rule] = "B3/S23",
+        history: int = 0,
+        boundary: str = "bounded",
     ) -> None:
         # Размер клеточного поля
         self.rows, self.cols = size
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"неизвестная граница поля: {boundary!r}")
+        # Граница поля: одна из `BOUNDARIES`
+        self.boundary = boundary
+        # Правило, по которому считаются поколения
+        self.rule = rule if isinstance(rule, Rule) else parse_rule(rule)
         # Предыдущее поколение клеток
         self.prev_generation = self.create_grid()
         # Текущее поколение клеток
@@ -27,48 +224,362 @@ class GameOfLife:
         self.max_generations = max_generations
         # Текущее число поколений
         self.generations = 1
+        # Наибольший период цикла, который нужно находить (0 - не искать)
+        self.max_period = max_period
+        # Найденный цикл
+        self.cycle: tp.Optional[Cycle] = None
+        # Хеш текущего поколения и недавние хеши: хеш -> номер поколения
+        self.board_hash = 0
+        self._hashed_generation: tp.Any = None
+        self._hash_history: tp.Dict[int, int] = {}
+        # Статистика и поколение, которое она описывает
+        self._stats: tp.Optional[Stats] = None
+        self._stats_generation: tp.Any = None
+        # Статистика предыдущего поколения и поколение, полученное из него шагом
+        self._stats_previous: tp.Optional[Stats] = None
+        self._stats_previous_generation: tp.Any = None
+        # Родившиеся и умершие клетки и поколение, к которому они относятся
+        self._changes: tp.Optional[Changes] = None
+        self._changes_generation: tp.Any = None
+        # Последние `history` поколений и поколение, записанное в них последним
+        self.history = History(self, life_checkpoint.FrameRing(history, size)) if history else None
+        self._history_generation: tp.Any = None
 
     def create_grid(self, randomize: bool = False) -> Grid:
-        # Copy from previous assignment
-        pass
+        return [[random.randint(0, 1) if randomize else 0 for _ in range(self.cols)] for _ in range(self.rows)]
+
+    @property
+    def torus(self) -> bool:
+        return self.boundary == "torus"
+
+    def wrapped_neighbours(self, cell: Cell) -> tp.List[Cell]:
+        """Координаты восьми соседей клетки на торе (по модулю размера поля)."""
+        row, col = cell
+        return [((row + di) % self.rows, (col + dj) % self.cols) for di, dj in OFFSETS]
 
     def get_neighbours(self, cell: Cell) -> Cells:
-        # Copy from previous assignment
-        pass
+        if self.torus:
+            return [self.curr_generation[i][j] for i, j in self.wrapped_neighbours(cell)]
+        row, col = cell
+        neighbours = []
+        for i in range(max(row - 1, 0), min(row + 2, self.rows)):
+            for j in range(max(col - 1, 0), min(col + 2, self.cols)):
+                if (i, j) != (row, col):
+                    neighbours.append(self.curr_generation[i][j])
+        return neighbours
 
     def get_next_generation(self) -> Grid:
-        # Copy from previous assignment
-        pass
+        table = self.rule.table
+        new_grid = self.create_grid()
+        for i in range(self.rows):
+            for j in range(self.cols):
+                new_grid[i][j] = table[self.curr_generation[i][j]][sum(self.get_neighbours((i, j)))]
+        return new_grid
 
     def step(self) -> None:
         """
         Выполнить один шаг игры.
         """
-        pass
+        self.record_history()
+        self.prev_generation = self.curr_generation
+        self.curr_generation = self.get_next_generation()
+        self.generations += 1
+        self._changes = None
+        self.update_stats()
+        self.update_cycle()
+        self.record_history()
+
+    def record_history(self) -> None:
+        """Записать текущее поколение в историю, если его там еще нет."""
+        if self.history is None or self._history_generation is self.curr_generation:
+            return
+        self.history.ring.append(self.generations, self.pack_frame())
+        self._history_generation = self.curr_generation
+
+    def rewind(self, n: int = 1) -> None:
+        """
+        Вернуться на `n` записанных поколений назад. Более новые поколения
+        удаляются из истории, а поиск цикла начинается заново.
+        """
+        history = self.history
+        if history is None or not 0 <= n < len(history):
+            raise IndexError(f"в истории нет поколения на {n} шагов назад")
+        self.generations = history.generation(n)
+        self.curr_generation = history[n]
+        self.prev_generation = history[n + 1] if n + 1 < len(history) else self.create_grid()
+        history.ring.drop(n)
+        self._history_generation = self.curr_generation
+        self.cycle = None
+        self._hashed_generation = None
+
+    def advance(self, n: int) -> None:
+        """
+        Продвинуть игру сразу на `n` поколений.
+        """
+        for _ in range(n):
+            self.step()
+
+    def iter_generations(
+        self, start: tp.Optional[int] = None, stop: tp.Optional[int] = None, every: int = 1, snapshot: bool = False
+    ) -> tp.Iterator[tp.Tuple[int, tp.Any]]:
+        """
+        Выполнять шаги игры и выдавать пары (номер поколения, поколение) для
+        поколений `start`, `start + every`, ... до `stop` (не включая).
+
+        Поколение выдается видом только для чтения (`generation_view`), а с
+        `snapshot=True` - упакованным по битам кадром (`pack_frame`). Копии
+        поля, которые не запрошены, не создаются. Перебор заканчивается
+        раньше `stop`, если превышено `max_generations` или поле перестало
+        меняться.
+        """
+        start = self.generations if start is None else start
+        if start < self.generations:
+            raise ValueError(f"поколение {start} уже пройдено, текущее - {self.generations}")
+        if start > self.generations:
+            self.advance(start - self.generations)
+        while stop is None or self.generations < stop:
+            if (self.generations - start) % every == 0:
+                yield self.generations, self.pack_frame() if snapshot else self.generation_view()
+            if self.is_max_generations_exceeded or not self.is_changing:
+                return
+            self.step()
+
+    def generation_view(self) -> tp.Any:
+        """
+        Текущее поколение только для чтения. Вид остается верным и после
+        следующих шагов: каждый шаг строит новое поколение.
+        """
+        return GridView(self.curr_generation)
+
+    def to_grid(
+        self, top: int = 0, left: int = 0, rows: tp.Optional[int] = None, cols: tp.Optional[int] = None
+    ) -> Grid:
+        """
+        Получить окно поля размером `rows` х `cols` с левым верхним углом в
+        клетке (`top`, `left`) в виде обычного `Grid`.
+        """
+        rows = self.rows - top if rows is None else rows
+        cols = self.cols - left if cols is None else cols
+        return [list(row[left : left + cols]) for row in self.curr_generation[top : top + rows]]
 
     @property
     def is_max_generations_exceeded(self) -> bool:
         """
         Не превысило ли текущее число поколений максимально допустимое.
         """
-        pass
+        return self.max_generations is not None and self.generations >= self.max_generations
 
     @property
     def is_changing(self) -> bool:
         """
         Изменилось ли состояние клеток с предыдущего шага.
+
+        Если задан `max_period`, игра считается неизменной, как только
+        найден цикл с периодом не больше `max_period`.
+        """
+        if self.max_period:
+            return self.cycle is None
+        return self.generation_changed()
+
+    def generation_changed(self) -> bool:
+        return self.stats.changed > 0
+
+    @property
+    def stats(self) -> Stats:
+        """
+        Статистика текущего поколения. Считается при первом обращении после
+        шага или замены поля, поэтому шаги без обращений к ней ничего не
+        стоят. Если статистику предыдущего поколения уже спрашивали, а
+        текущее получено из него шагом, движок может считать только около
+        прежних живых клеток.
+        """
+        if self._stats is None or self._stats_generation is not self.curr_generation:
+            known = self._stats_previous_generation is self.curr_generation
+            self._stats = self.compute_stats(self._stats_previous if known else None)
+            self._stats_generation = self.curr_generation
+        return self._stats
+
+    def update_stats(self) -> None:
+        """
+        Отметить после шага, что статистика устарела, и запомнить статистику
+        предыдущего поколения, если она уже посчитана.
+        """
+        known = self._stats is not None and self._stats_generation is self.prev_generation
+        self._stats_previous = self._stats if known else None
+        self._stats_previous_generation = self.curr_generation
+        self._stats = None
+
+    def compute_stats(self, previous: tp.Optional[Stats] = None) -> Stats:
+        """Посчитать статистику текущего поколения относительно предыдущего."""
+        population = births = deaths = 0
+        rows = []
+        left, right = self.cols, 0
+        for i, (prev_row, curr_row) in enumerate(zip(self.prev_generation, self.curr_generation)):
+            alive = sum(curr_row)
+            if alive:
+                population += alive
+                rows.append(i)
+                left = min(left, curr_row.index(1))
+                right = max(right, len(curr_row) - curr_row[::-1].index(1))
+            if prev_row != curr_row:
+                changed = sum(a != b for a, b in zip(prev_row, curr_row))
+                born = alive - sum(prev_row)
+                births += (changed + born) // 2
+                deaths += (changed - born) // 2
+        bbox = (rows[0], left, rows[-1] + 1, right) if rows else None
+        return Stats(population, births, deaths, bbox)
+
+    @property
+    def changes(self) -> Changes:
         """
-        pass
+        Клетки, родившиеся и умершие за последний шаг. Интерфейсам этого
+        достаточно, чтобы перерисовать только изменившиеся клетки, не
+        сравнивая поколения целиком.
+        """
+        if self._changes is None or self._changes_generation is not self.curr_generation:
+            self._changes = self.compute_changes()
+            self._changes_generation = self.curr_generation
+        return self._changes
+
+    def compute_changes(self) -> Changes:
+        born: tp.List[Cell] = []
+        died: tp.List[Cell] = []
+        for i, (prev_row, curr_row) in enumerate(zip(self.prev_generation, self.curr_generation)):
+            if prev_row != curr_row:
+                for j, (a, b) in enumerate(zip(prev_row, curr_row)):
+                    if a != b:
+                        (born if b else died).append((i, j))
+        return Changes(cell_array(born), cell_array(died))
+
+    def live_cells(self, generation: tp.Any = None) -> tp.Iterable[Cell]:
+        """Перечислить живые клетки поколения (по умолчанию текущего)."""
+        grid = self.curr_generation if generation is None else generation
+        return ((i, j) for i, row in enumerate(grid) for j, cell in enumerate(row) if cell)
+
+    def changed_cells(self) -> tp.Iterable[Cell]:
+        """Перечислить клетки, которые изменились с предыдущего шага."""
+        for i, (prev_row, curr_row) in enumerate(zip(self.prev_generation, self.curr_generation)):
+            if prev_row != curr_row:
+                yield from ((i, j) for j, (a, b) in enumerate(zip(prev_row, curr_row)) if a != b)
+
+    def hash_cells(self, cells: tp.Iterable[Cell]) -> int:
+        board_hash = 0
+        for cell in cells:
+            board_hash ^= cell_key(cell)
+        return board_hash
 
-    @staticmethod
-    def from_file(filename: pathlib.Path) -> "GameOfLife":
+    def update_cycle(self) -> None:
+        """
+        Обновить хеш поля после шага и проверить, не повторилось ли поколение.
+
+        Хеш обновляется по изменившимся клеткам. Хеши последних `max_period`
+        поколений хранятся в словаре, поэтому цикл находится без сравнения
+        полей целиком.
+        """
+        if not self.max_period:
+            return
+        if self._hashed_generation is self.prev_generation:
+            self.board_hash ^= self.hash_cells(self.changed_cells())
+        else:
+            # Поле заменили снаружи: считаем хеши заново
+            self._hash_history = {self.hash_cells(self.live_cells(self.prev_generation)): self.generations - 1}
+            self.board_hash = self.hash_cells(self.live_cells())
+        self._hashed_generation = self.curr_generation
+
+        history = self._hash_history
+        seen = history.pop(self.board_hash, None)
+        if seen is not None and self.cycle is None and self.generations - seen <= self.max_period:
+            self.cycle = Cycle(start=seen, period=self.generations - seen)
+        history[self.board_hash] = self.generations
+        # Словарь упорядочен по номеру поколения, старые хеши лежат в начале
+        oldest = self.generations - self.max_period
+        while history[next(iter(history))] < oldest:
+            del history[next(iter(history))]
+
+    @classmethod
+    def from_file(cls, filename: pathlib.Path, **kwargs: tp.Any) -> "GameOfLife":
         """
         Прочитать состояние клеток из указанного файла.
+
+        Формат определяется по расширению: `.rle`, `.cells` или текст из
+        `0` и `1`. Файл разбирается построчно прямо во внутреннее
+        представление поля. Правило из заголовка RLE используется, если
+        оно не передано явно.
         """
-        pass
+        pattern = life_io.read_pattern(filename)
+        if pattern.rule is not None:
+            kwargs.setdefault("rule", pattern.rule)
+        game = cls((pattern.rows, pattern.cols), randomize=False, **kwargs)
+        game.curr_generation = game.from_rows(pattern.lines)
+        return game
 
     def save(self, filename: pathlib.Path) -> None:
         """
         Сохранить текущее состояние клеток в указанный файл.
         """
-        pass
+        life_io.write_pattern(filename, (self.rows, self.cols), self.row_cells(), rule=self.rule.name)
+
+    def from_rows(self, lines: tp.Iterable[life_io.RowCells]) -> Grid:
+        """Построить поколение по номерам живых столбцов каждой строки."""
+        grid = self.create_grid()
+        for row, cols in zip(grid, lines):
+            for j in cols:
+                row[j] = 1
+        return grid
+
+    def row_cells(self) -> tp.Iterator[life_io.RowCells]:
+        """Перечислить номера живых столбцов каждой строки текущего поколения."""
+        for row in self.curr_generation:
+            yield [j for j, cell in enumerate(row) if cell]
+
+    def pack_frame(self) -> np.ndarray:
+        """Текущее поколение, упакованное по 8 клеток в байт."""
+        return life_checkpoint.pack_rows((self.rows, self.cols), self.row_cells())
+
+    def unpack_frame(self, frame: np.ndarray) -> tp.Any:
+        """Обратное к `pack_frame`: поколение движка по упакованному кадру."""
+        return self.from_rows(life_checkpoint.unpack_rows(frame, self.cols))
+
+    def save_history(
+        self,
+        filename: pathlib.Path,
+        generations: int,
+        every: int = 1,
+        keyframe_every: int = 100,
+        compression: str = "zlib",
+    ) -> None:
+        """
+        Выполнить `generations` шагов игры и записать текущее и каждое
+        `every`-е следующее поколение в двоичный файл истории.
+        """
+        size = (self.rows, self.cols)
+        with life_checkpoint.HistoryWriter(
+            filename, size, rule=self.rule.name, keyframe_every=keyframe_every, compression=compression
+        ) as writer:
+            writer.append(self.generations, self.pack_frame())
+            for k in range(1, generations + 1):
+                self.step()
+                if k % every == 0:
+                    writer.append(self.generations, self.pack_frame())
+
+    @classmethod
+    def load_history(
+        cls, filename: pathlib.Path, generation: tp.Optional[int] = None, **kwargs: tp.Any
+    ) -> "GameOfLife":
+        """
+        Восстановить игру из файла истории на поколении `generation`
+        (по умолчанию на последнем записанном).
+
+        Если само поколение не записано, игра восстанавливается на ближайшем
+        записанном поколении перед ним и досчитывается до нужного.
+        """
+        with life_checkpoint.HistoryReader(filename) as reader:
+            recorded = reader.generations[-1] if generation is None else reader.nearest(generation)
+            frame = reader.frame(recorded)
+            kwargs.setdefault("rule", reader.rule)
+            game = cls(reader.size, randomize=False, **kwargs)
+        game.curr_generation = game.unpack_frame(frame)
+        game.generations = recorded
+        if generation is not None:
+            game.advance(generation - recorded)
+        return game
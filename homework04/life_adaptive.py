@@ -0,0 +1,247 @@
+import argparse
+import time
+import typing as tp
+
+import life_io
+import numpy as np
+from life import Cell, Cells, Changes, GameOfLife, Grid, Stats, cell_array, parse_rule
+from life_numpy import NumpyGameOfLife
+from life_sparse import SparseGameOfLife
+
+ENGINES: tp.Dict[str, tp.Type[GameOfLife]] = {"numpy": NumpyGameOfLife, "sparse": SparseGameOfLife}
+
+# Оценки времени шага, секунды: NumpyGameOfLife - на клетку поля,
+# SparseGameOfLife - на живую клетку (замерены на полях 256-1024)
+DENSE_COST = 2e-9
+SPARSE_COST = 4e-6
+# Движок меняется, только если другой обещает быть хотя бы во столько раз быстрее
+SWITCH_MARGIN = 2.0
+
+
+class Switch(tp.NamedTuple):
+    """
+    Смена движка: на каком поколении и почему. `predicted_*` - оценки
+    времени шага старого и нового движка, `measured` - среднее время шага
+    старого движка с прошлой проверки, `convert` - время перевода поля.
+    """
+
+    generation: int
+    old: str
+    new: str
+    population: int
+    predicted_old: float
+    predicted_new: float
+    measured: float
+    convert: float
+
+
+def rows_of(cells: tp.Iterable[Cell], rows: int) -> tp.List[life_io.RowCells]:
+    """Разложить живые клетки по строкам: номера живых столбцов каждой строки."""
+    lines: tp.List[life_io.RowCells] = [[] for _ in range(rows)]
+    for i, j in cell_array(cells).tolist():
+        lines[i].append(j)
+    return lines
+
+
+class AdaptiveGameOfLife(GameOfLife):
+    """
+    Игра «Жизнь», которая сама выбирает движок по заполненности поля.
+
+    Поле хранится в одном из движков `ENGINES`, все операции с поколениями
+    передаются ему. Каждые `sample_every` поколений время шага оценивается
+    по населению и площади поля (`DENSE_COST`, `SPARSE_COST`), и если
+    другой движок обещает быть в `SWITCH_MARGIN` раз быстрее, поле
+    переводится в него. Номер поколения, поиск цикла, статистика и история
+    при этом продолжаются как ни в чем не бывало; меняется только тип
+    `curr_generation` и `prev_generation`. Все смены движка записываются в
+    `switches`.
+
+    Правила с B0 умеет считать только `NumpyGameOfLife`.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        sample_every: int = 16,
+        engine: str = "numpy",
+        **kwargs: tp.Any,
+    ) -> None:
+        rule = parse_rule(kwargs["rule"]) if isinstance(kwargs.get("rule"), str) else kwargs.get("rule")
+        boundary = kwargs.get("boundary", "bounded")
+        self.engine: GameOfLife = ENGINES[engine](size, randomize=False, rule=rule or "B3/S23", boundary=boundary)
+        self.sample_every = sample_every
+        self.switches: tp.List[Switch] = []
+        # Время шагов текущего движка с прошлой проверки
+        self._seconds = 0.0
+        self._steps = 0
+        # Поле заменили: выбрать движок перед следующим шагом
+        self._adapt_pending = True
+        super().__init__(size, randomize=randomize, max_generations=max_generations, **kwargs)
+
+    @property
+    def engine_name(self) -> str:
+        return next(name for name, cls in ENGINES.items() if type(self.engine) is cls)
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> tp.Any:
+        return self.engine.curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Any) -> None:
+        self.engine.curr_generation = grid
+        self._adapt_pending = True
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> tp.Any:
+        return self.engine.prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid: tp.Any) -> None:
+        self.engine.prev_generation = grid
+
+    def step(self) -> None:
+        if self._adapt_pending:
+            self.adapt()
+        start = time.perf_counter()
+        super().step()
+        # Новое поколение записано через `curr_generation`, но это не замена поля
+        self._adapt_pending = False
+        self._seconds += time.perf_counter() - start
+        self._steps += 1
+        if self.generations % self.sample_every == 0:
+            self.adapt()
+
+    def predict(self, population: int) -> tp.Dict[str, float]:
+        """Оценки времени шага каждого подходящего движка при населении `population`."""
+        costs = {"numpy": DENSE_COST * self.rows * self.cols}
+        if not self.rule.table[0][0]:
+            costs["sparse"] = SPARSE_COST * population
+        return costs
+
+    def adapt(self) -> None:
+        """Оценить движки по статистике поколения и перейти на более быстрый."""
+        self._adapt_pending = False
+        stats = self.stats
+        costs = self.predict(stats.population)
+        current = self.engine_name
+        best = min(costs, key=lambda name: costs[name])
+        measured = self._seconds / self._steps if self._steps else 0.0
+        self._seconds, self._steps = 0.0, 0
+        if best == current or costs[best] * SWITCH_MARGIN > costs[current]:
+            return
+        start = time.perf_counter()
+        self.convert(best)
+        self.switches.append(
+            Switch(
+                self.generations,
+                current,
+                best,
+                stats.population,
+                costs[current],
+                costs[best],
+                measured,
+                time.perf_counter() - start,
+            )
+        )
+
+    def convert(self, name: str) -> None:
+        """Перевести текущее и предыдущее поколения в движок `name`."""
+        old = self.engine
+        new = ENGINES[name]((self.rows, self.cols), randomize=False, rule=self.rule, boundary=self.boundary)
+        new.prev_generation = new.from_rows(rows_of(old.live_cells(old.prev_generation), self.rows))
+        new.curr_generation = new.from_rows(old.row_cells())
+        hashed = self._hashed_generation is old.curr_generation
+        recorded = self._history_generation is old.curr_generation
+        self.engine = new
+        # Хеш поля и история уже учитывают текущее поколение
+        if hashed:
+            self._hashed_generation = new.curr_generation
+        if recorded:
+            self._history_generation = new.curr_generation
+
+    @property
+    def stats(self) -> Stats:
+        return self.engine.stats
+
+    def update_stats(self) -> None:
+        self.engine.update_stats()
+
+    @property
+    def changes(self) -> Changes:
+        return self.engine.changes
+
+    def create_grid(self, randomize: bool = False) -> tp.Any:
+        return self.engine.create_grid(randomize)
+
+    def get_neighbours(self, cell: Cell) -> Cells:
+        return self.engine.get_neighbours(cell)
+
+    def get_next_generation(self) -> tp.Any:
+        return self.engine.get_next_generation()
+
+    def to_grid(
+        self, top: int = 0, left: int = 0, rows: tp.Optional[int] = None, cols: tp.Optional[int] = None
+    ) -> Grid:
+        return self.engine.to_grid(top, left, rows, cols)
+
+    def generation_view(self) -> tp.Any:
+        return self.engine.generation_view()
+
+    def live_cells(self, generation: tp.Any = None) -> tp.Iterable[Cell]:
+        return self.engine.live_cells(generation)
+
+    def changed_cells(self) -> tp.Iterable[Cell]:
+        return self.engine.changed_cells()
+
+    def hash_cells(self, cells: tp.Iterable[Cell]) -> int:
+        return self.engine.hash_cells(cells)
+
+    def from_rows(self, lines: tp.Iterable[life_io.RowCells]) -> tp.Any:
+        return self.engine.from_rows(lines)
+
+    def row_cells(self) -> tp.Iterator[life_io.RowCells]:
+        return self.engine.row_cells()
+
+    def pack_frame(self) -> np.ndarray:
+        return self.engine.pack_frame()
+
+    def unpack_frame(self, frame: np.ndarray) -> tp.Any:
+        return self.engine.unpack_frame(frame)
+
+
+def benchmark(size: int, patch: int, generations: int) -> tp.Tuple[tp.Dict[str, float], tp.List[Switch]]:
+    """
+    Время `generations` шагов каждого движка и адаптивной игры на пустом
+    поле `size` х `size` со случайным квадратом `patch` х `patch` в середине
+    и смены движка адаптивной игры.
+    """
+    board = np.zeros((size, size), dtype=np.uint8)
+    start = (size - patch) // 2
+    board[start : start + patch, start : start + patch] = np.random.default_rng(0).random((patch, patch)) < 0.4
+    engines: tp.Dict[str, tp.Type[GameOfLife]] = {**ENGINES, "adaptive": AdaptiveGameOfLife}
+    results = {}
+    switches: tp.List[Switch] = []
+    for name, cls in engines.items():
+        game = cls((size, size), randomize=False)
+        game.curr_generation = game.from_rows(np.flatnonzero(row).tolist() for row in board)
+        begin = time.perf_counter()
+        game.advance(generations)
+        results[name] = time.perf_counter() - begin
+        if isinstance(game, AdaptiveGameOfLife):
+            switches = game.switches
+    return results, switches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Адаптивный выбор движка против каждого движка по отдельности")
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--patch", type=int, default=64)
+    parser.add_argument("--generations", type=int, default=500)
+    args = parser.parse_args()
+    results, switches = benchmark(args.size, args.patch, args.generations)
+    for switch in switches:
+        print(switch)
+    for name, seconds in results.items():
+        print(f"{name:>9}: {seconds:.3f} с")
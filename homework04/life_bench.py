@@ -0,0 +1,400 @@
+import argparse
+import json
+import os
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+import typing as tp
+
+import numpy as np
+from life import BOUNDARIES, GameOfLife
+from life_cli import ENGINES
+
+OPERATIONS = ["create_grid", "get_neighbours", "get_next_generation", "step", "save", "from_file", "render"]
+SIZES = [64, 256, 1024, 2048, 4096, 8192]
+DENSITIES = [0.01, 0.1, 0.5]
+QUICK_SIZES = [64, 256]
+QUICK_DENSITIES = [0.1, 0.5]
+
+# Наибольшая сторона поля, на которой движок еще имеет смысл измерять
+MAX_SIDE = {
+    "list": 256,
+    "numpy": 8192,
+    "packed": 4096,
+    "sparse": 2048,
+    "hashlife": 1024,
+    "parallel": 8192,
+    "tiled": 8192,
+    "adaptive": 8192,
+    "mapped": 8192,
+}
+# Запись и чтение узоров в RLE и отрисовка ограничены отдельно
+MAX_IO_SIDE = 2048
+MAX_RENDER_SIDE = 2048
+# Сколько клеток опрашивать в замере `get_neighbours`
+NEIGHBOUR_SAMPLES = 1000
+# Наименьшая длительность одного замера, секунды
+MIN_SAMPLE = 0.02
+# Допустимое замедление относительно базовых замеров (доля). На общей
+# виртуальной машине замеры неизмененного кода расходятся до двух раз,
+# поэтому по умолчанию ловятся только грубые замедления
+THRESHOLD = 1.5
+
+BASELINE = pathlib.Path(__file__).with_name("bench_baseline.json")
+
+
+class Result(tp.NamedTuple):
+    """Время одной операции: лучшее из нескольких повторов, в секундах."""
+
+    engine: str
+    operation: str
+    size: int
+    density: float
+    seconds: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.engine}/{self.operation}/{self.size}/{self.density}"
+
+
+def random_board(size: int, density: float, seed: int = 0) -> np.ndarray:
+    """Случайное поле `size` х `size` с долей живых клеток `density`."""
+    return (np.random.default_rng(seed).random((size, size)) < density).astype(np.uint8)
+
+
+def make_game(engine: str, board: np.ndarray, **kwargs: tp.Any) -> GameOfLife:
+    """Создать игру движком `engine` и положить в нее поле `board`."""
+    game = ENGINES[engine](board.shape, randomize=False, **kwargs)
+    game.curr_generation = game.from_rows(np.flatnonzero(row).tolist() for row in board)
+    return game
+
+
+def close(game: GameOfLife) -> None:
+    method = getattr(game, "close", None)
+    if method is not None:
+        method()
+
+
+def measure(
+    func: tp.Callable[[], tp.Any],
+    repeat: int = 5,
+    budget: float = 1.0,
+    setup: tp.Optional[tp.Callable[[], tp.Any]] = None,
+) -> float:
+    """
+    Время одного вызова `func`: лучшее из `repeat` замеров.
+
+    Быстрые операции в каждом замере вызываются несколько раз подряд, чтобы
+    замер длился не меньше `MIN_SAMPLE` секунд; медленные повторяются, пока
+    не истратят `budget` секунд, но хотя бы один раз. Если задан `setup`,
+    он вызывается перед каждым вызовом `func` вне замера, чтобы операции,
+    которые меняют игру, каждый раз делали одну и ту же работу.
+    """
+
+    def sample(loops: int) -> float:
+        if setup is None:
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            return time.perf_counter() - start
+        elapsed = 0.0
+        for _ in range(loops):
+            setup()
+            start = time.perf_counter()
+            func()
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    # В `budget` входит и время `setup`, поэтому оно считается по часам целиком
+    started = time.perf_counter()
+    loops = 1
+    while True:
+        elapsed = sample(loops)
+        if elapsed >= MIN_SAMPLE:
+            break
+        loops *= 10 if elapsed < MIN_SAMPLE / 10 else 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        if time.perf_counter() - started > budget:
+            break
+        best = min(best, sample(loops) / loops)
+    return best
+
+
+def reset_game(game: GameOfLife, board: np.ndarray) -> tp.Callable[[], None]:
+    """Функция, которая возвращает игру к полю `board` и к текущему номеру поколения."""
+    generations = game.generations
+
+    def reset() -> None:
+        game.curr_generation = game.from_rows(np.flatnonzero(row).tolist() for row in board)
+        game.generations = generations
+
+    return reset
+
+
+def render_frame(
+    game: GameOfLife, reset: tp.Callable[[], None]
+) -> tp.Tuple[tp.Callable[[], None], tp.Callable[[], None]]:
+    """
+    Отрисовка одного поколения в `GUI` без окна (поверхность в памяти):
+    шаг с перерисовкой изменившихся клеток и подготовка к нему - возврат
+    к исходному полю и его полная отрисовка.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import life_gui
+    import pygame
+
+    gui = life_gui.GUI(game, cell_size=1)
+    gui.screen = pygame.Surface((gui.width, gui.height))
+
+    def setup() -> None:
+        reset()
+        gui.draw_grid()
+
+    def frame() -> None:
+        game.step()
+        gui.draw_grid()
+
+    return frame, setup
+
+
+def bench_engine(engine: str, size: int, density: float, operations: tp.Sequence[str]) -> tp.List[Result]:
+    """Измерить операции `operations` одного движка на одном поле."""
+    board = random_board(size, density)
+    results = []
+    game = make_game(engine, board)
+    try:
+        rng = np.random.default_rng(1)
+        cells = [tuple(cell) for cell in rng.integers(0, size, (NEIGHBOUR_SAMPLES, 2)).tolist()]
+        with tempfile.TemporaryDirectory() as tmp:
+            pattern = pathlib.Path(tmp) / "board.rle"
+            benchmarks: tp.Dict[str, tp.Callable[[], tp.Any]] = {
+                "create_grid": lambda: game.create_grid(randomize=True),
+                "get_neighbours": lambda: [game.get_neighbours(cell) for cell in cells],
+                "get_next_generation": game.get_next_generation,
+                "step": game.step,
+                "save": lambda: game.save(pattern),
+                "from_file": lambda: close(ENGINES[engine].from_file(pattern)),
+            }
+            reset = reset_game(game, board)
+            for operation in operations:
+                if operation in ("save", "from_file") and size > MAX_IO_SIDE:
+                    continue
+                # Шаг меняет поле, поэтому каждый вызов начинается с исходного
+                setup: tp.Optional[tp.Callable[[], None]] = reset if operation == "step" else None
+                if operation == "render":
+                    if engine != "numpy" or size > MAX_RENDER_SIDE:
+                        continue
+                    func, setup = render_frame(game, reset)
+                else:
+                    func = benchmarks[operation]
+                if operation == "from_file" and not pattern.exists():
+                    game.save(pattern)
+                results.append(Result(engine, operation, size, density, measure(func, setup=setup)))
+    finally:
+        close(game)
+    return results
+
+
+def run(
+    engines: tp.Sequence[str],
+    sizes: tp.Sequence[int],
+    densities: tp.Sequence[float],
+    operations: tp.Sequence[str] = OPERATIONS,
+    log: tp.Optional[tp.TextIO] = None,
+) -> tp.List[Result]:
+    """Измерить все сочетания движка, размера и плотности."""
+    results = []
+    for engine in engines:
+        for size in sizes:
+            if size > MAX_SIDE[engine]:
+                continue
+            for density in densities:
+                for result in bench_engine(engine, size, density, operations):
+                    if log is not None:
+                        print(f"{result.key:<40} {result.seconds:>10.6f}", file=log)
+                    results.append(result)
+    return results
+
+
+def save_results(filename: tp.Union[str, pathlib.Path], results: tp.Iterable[Result]) -> None:
+    data = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": {result.key: result.seconds for result in results},
+    }
+    pathlib.Path(filename).write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(filename: tp.Union[str, pathlib.Path]) -> tp.Dict[str, float]:
+    """Прочитать замеры, записанные `save_results`."""
+    return dict(json.loads(pathlib.Path(filename).read_text())["results"])
+
+
+def compare(
+    results: tp.Iterable[Result], baseline: tp.Dict[str, float], threshold: float = THRESHOLD
+) -> tp.List[tp.Tuple[str, float, float]]:
+    """
+    Замеры, которые медленнее базовых больше чем на долю `threshold`:
+    тройки (ключ, базовое время, новое время). Базовые замеры имеют смысл
+    только с той же машины, что и новые.
+
+    Если для какого-то замера нет базового, выбрасывается `KeyError` со
+    списком таких ключей: молча пропущенный замер выглядел бы как пройденный.
+    """
+    results = list(results)
+    missing = [result.key for result in results if result.key not in baseline]
+    if missing:
+        raise KeyError(f"нет базовых замеров для {', '.join(missing)}")
+    regressions = []
+    for result in results:
+        base = baseline[result.key]
+        if result.seconds > base * (1 + threshold):
+            regressions.append((result.key, base, result.seconds))
+    return regressions
+
+
+def check_engines(
+    size: int = 48,
+    density: float = 0.35,
+    generations: int = 20,
+    rule: str = "B3/S23",
+    seed: int = 0,
+    boundary: str = "bounded",
+    log: tp.Optional[tp.TextIO] = None,
+) -> tp.List[str]:
+    """
+    Сравнить поколения всех движков с эталонным `GameOfLife` с границей
+    `boundary` и вернуть список расхождений.
+
+    Неограниченный HashLife сравнивается с эталоном на поле, расширенном на
+    `generations` клеток с каждой стороны: за это время влияние края до
+    исходного поля не доходит. На торе HashLife не проверяется. Движки,
+    которые не умеют считать правило `rule` (например, с B0), пропускаются
+    с сообщением в `log`.
+    """
+    board = random_board(size, density, seed)
+    pad = generations + 1
+    padded = np.pad(board, pad)
+    reference = make_game("list", board, rule=rule, boundary=boundary)
+    wide = make_game("list", padded, rule=rule)
+    skip = {"list", "hashlife"} if boundary == "torus" else {"list"}
+    games = {}
+    for engine in ENGINES:
+        if engine in skip:
+            continue
+        try:
+            games[engine] = make_game(engine, board, rule=rule, boundary=boundary)
+        except ValueError as error:
+            if log is not None:
+                print(f"{engine}: пропущен ({error})", file=log)
+    mismatches = []
+    try:
+        for generation in range(1, generations + 1):
+            reference.step()
+            wide.step()
+            expected = reference.to_grid()
+            unbounded = {(i - pad, j - pad) for i, j in wide.live_cells()}
+            for engine, game in list(games.items()):
+                game.step()
+                if engine == "hashlife":
+                    same = {tuple(cell) for cell in game.live_cells()} == unbounded
+                else:
+                    same = game.to_grid() == expected
+                if not same:
+                    # Дальше движок не проверяется: расхождение уже найдено
+                    mismatches.append(f"{engine}: поколение {generation + 1} отличается от эталона")
+                    close(games.pop(engine))
+    finally:
+        for game in games.values():
+            close(game)
+    return mismatches
+
+
+def bench_boundaries(
+    engines: tp.Sequence[str], size: int, density: float = 0.35, log: tp.Optional[tp.TextIO] = None
+) -> tp.Dict[str, tp.Dict[str, float]]:
+    """Время шага каждого движка на ограниченном поле и на торе `size` х `size`."""
+    board = random_board(size, density)
+    results: tp.Dict[str, tp.Dict[str, float]] = {}
+    for engine in engines:
+        if engine == "hashlife" or size > MAX_SIDE[engine]:
+            continue
+        for boundary in BOUNDARIES:
+            game = make_game(engine, board, boundary=boundary)
+            try:
+                results.setdefault(engine, {})[boundary] = measure(game.step)
+            finally:
+                close(game)
+        if log is not None:
+            bounded, torus = results[engine]["bounded"], results[engine]["torus"]
+            print(f"{engine:<9} {bounded:>10.6f} {torus:>10.6f} {torus / bounded - 1:>+8.0%}", file=log)
+    return results
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры скорости движков игры «Жизнь»")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="измерить и сравнить с базовыми замерами")
+    run_parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES))
+    run_parser.add_argument("--sizes", type=int, nargs="+")
+    run_parser.add_argument("--densities", type=float, nargs="+")
+    run_parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=OPERATIONS)
+    run_parser.add_argument("--quick", action="store_true", help=f"только поля {QUICK_SIZES}")
+    run_parser.add_argument("--output", help="куда записать замеры в JSON")
+    run_parser.add_argument(
+        "--baseline", help=f"базовые замеры для сравнения (по умолчанию {BASELINE.name} для --quick)"
+    )
+    run_parser.add_argument("--threshold", type=float, default=THRESHOLD, help="допустимое замедление (доля)")
+    run_parser.add_argument("--update-baseline", action="store_true", help="записать замеры как базовые")
+    check_parser = commands.add_parser("check", help="сравнить поколения всех движков с эталоном")
+    check_parser.add_argument("--size", type=int, default=48)
+    check_parser.add_argument("--generations", type=int, default=20)
+    check_parser.add_argument("--rule", default="B3/S23")
+    check_parser.add_argument("--boundary", choices=BOUNDARIES, default="bounded")
+    boundary_parser = commands.add_parser("boundary", help="сравнить время шага на ограниченном поле и на торе")
+    boundary_parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES))
+    boundary_parser.add_argument("--size", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    if args.command == "boundary":
+        print(f"{'engine':<9} {'bounded':>10} {'torus':>10} {'diff':>8}")
+        bench_boundaries(args.engines, args.size, log=sys.stdout)
+        return 0
+    if args.command == "check":
+        mismatches = check_engines(
+            args.size, generations=args.generations, rule=args.rule, boundary=args.boundary, log=sys.stdout
+        )
+        for mismatch in mismatches:
+            print(mismatch)
+        print("все проверенные движки совпадают с эталоном" if not mismatches else f"расхождений: {len(mismatches)}")
+        return int(bool(mismatches))
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    densities = args.densities or (QUICK_DENSITIES if args.quick else DENSITIES)
+    # Базовые замеры в репозитории покрывают только --quick, поэтому полный
+    # прогон сравнивается лишь с явно указанными
+    baseline = args.baseline or (str(BASELINE) if args.quick else None)
+    results = run(args.engines, sizes, densities, args.operations, log=sys.stdout)
+    if args.output:
+        save_results(args.output, results)
+    if args.update_baseline:
+        save_results(args.baseline or BASELINE, results)
+        return 0
+    if baseline is None or not pathlib.Path(baseline).exists():
+        return 0
+    try:
+        regressions = compare(results, load_results(baseline), args.threshold)
+    except KeyError as error:
+        print(error.args[0])
+        return 1
+    for key, base, seconds in regressions:
+        print(f"замедление {key}: {base:.6f} -> {seconds:.6f} ({seconds / base - 1:+.0%})")
+    return int(bool(regressions))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+import argparse
+import collections
+import multiprocessing
+import random
+import time
+import typing as tp
+
+from life import OFFSETS, Cell
+from life_sparse import SparseGameOfLife
+
+Census = tp.Counter[str]
+
+# Сторона случайного квадрата, с которого начинается суп
+SOUP_SIDE = 16
+# Сколько поколений подряд население должно повторяться с одним периодом,
+# чтобы суп считался успокоившимся
+SETTLE = 60
+UNSTABLE = "unstable"
+UNKNOWN = "unknown"
+
+# Известные объекты: строки узора, `o` - живая клетка
+KNOWN_OBJECTS = {
+    "block": ["oo", "oo"],
+    "beehive": [".oo.", "o..o", ".oo."],
+    "loaf": [".oo.", "o..o", ".o.o", "..o."],
+    "boat": ["oo.", "o.o", ".o."],
+    "ship": ["oo.", "o.o", ".oo"],
+    "tub": [".o.", "o.o", ".o."],
+    "pond": [".oo.", "o..o", "o..o", ".oo."],
+    "blinker": ["ooo"],
+    "toad": [".ooo", "ooo."],
+    "beacon": ["oo..", "oo..", "..oo", "..oo"],
+    "glider": [".o.", "..o", "ooo"],
+}
+
+
+def seed_soup(seed: int, side: int = SOUP_SIDE, **kwargs: tp.Any) -> SparseGameOfLife:
+    """
+    Случайный квадрат `side` х `side` на неограниченном поле - тот же, что
+    дал бы `create_grid(randomize=True)` после `random.seed(seed)`.
+    """
+    random.seed(seed)
+    return SparseGameOfLife((side, side), bounded=False, **kwargs)
+
+
+def stabilize(game: SparseGameOfLife, max_generations: int = 5000, max_period: int = 8) -> bool:
+    """
+    Считать суп, пока его население не станет периодичным.
+
+    Улетающие планеры не дают полю повторяться целиком, поэтому суп
+    считается успокоившимся, когда население `SETTLE` поколений подряд
+    повторяется с периодом не больше `max_period`. Возвращает `False`, если
+    за `max_generations` поколений этого не случилось.
+    """
+    populations = [len(game.curr_generation)]
+    while game.generations < max_generations:
+        game.step()
+        populations.append(len(game.curr_generation))
+        if len(populations) > SETTLE + max_period:
+            recent = populations[-SETTLE - max_period :]
+            for period in range(1, max_period + 1):
+                if all(recent[k] == recent[k + period] for k in range(len(recent) - period)):
+                    return True
+    return False
+
+
+def components(cells: tp.AbstractSet[Cell]) -> tp.List[tp.Set[Cell]]:
+    """Разбить живые клетки на связные группы (соседи - по всем восьми направлениям)."""
+    left = set(cells)
+    groups = []
+    while left:
+        start = left.pop()
+        group = {start}
+        stack = [start]
+        while stack:
+            i, j = stack.pop()
+            for di, dj in OFFSETS:
+                neighbour = (i + di, j + dj)
+                if neighbour in left:
+                    left.remove(neighbour)
+                    group.add(neighbour)
+                    stack.append(neighbour)
+        groups.append(group)
+    return groups
+
+
+def normalize(cells: tp.Iterable[Cell]) -> tp.FrozenSet[Cell]:
+    """Сдвинуть клетки так, чтобы рамка начиналась в (0, 0)."""
+    cells = list(cells)
+    top = min(i for i, _ in cells)
+    left = min(j for _, j in cells)
+    return frozenset((i - top, j - left) for i, j in cells)
+
+
+def encode(cells: tp.AbstractSet[Cell]) -> str:
+    """Записать нормализованные клетки строками из `o` и `b`, разделенными `$`."""
+    rows = max(i for i, _ in cells) + 1
+    cols = max(j for _, j in cells) + 1
+    lines = ("".join("o" if (i, j) in cells else "b" for j in range(cols)).rstrip("b") for i in range(rows))
+    return "$".join(lines)
+
+
+def canonical(phases: tp.Iterable[tp.Iterable[Cell]]) -> str:
+    """
+    Код объекта, не зависящий от положения, поворота, отражения и фазы:
+    наименьшая (по длине, затем по строке) запись из всех фаз и всех восьми
+    симметрий квадрата.
+    """
+    codes = []
+    for cells in phases:
+        cells = list(cells)
+        for transform in range(8):
+            moved = []
+            for i, j in cells:
+                if transform & 4:
+                    i, j = j, i
+                moved.append((-i if transform & 1 else i, -j if transform & 2 else j))
+            codes.append(encode(normalize(moved)))
+    return min(codes, key=lambda code: (len(code), code))
+
+
+def _pattern_cells(lines: tp.Sequence[str]) -> tp.Set[Cell]:
+    return {(i, j) for i, line in enumerate(lines) for j, char in enumerate(line) if char == "o"}
+
+
+def evolve(
+    cells: tp.AbstractSet[Cell], max_period: int = 8
+) -> tp.Optional[tp.Tuple[tp.List[tp.FrozenSet[Cell]], bool]]:
+    """
+    Прогнать объект отдельно от остальных, пока он не повторится с
+    точностью до сдвига. Возвращает его фазы и признак, сдвинулся ли он за
+    период, или `None`, если за `max_period` поколений объект не повторился.
+    """
+    game = SparseGameOfLife((0, 0), randomize=False, bounded=False)
+    game.curr_generation = set(cells)
+    start = normalize(cells)
+    phases = [start]
+    for _ in range(max_period):
+        game.step()
+        if not game.curr_generation:
+            return None
+        phase = normalize(game.curr_generation)
+        if phase == start:
+            return phases, min(game.curr_generation) != min(cells)
+        phases.append(phase)
+    return None
+
+
+def classify(cells: tp.AbstractSet[Cell], max_period: int = 8) -> str:
+    """
+    Опознать объект по его фазам из `evolve`.
+
+    Ключ - имя из `KNOWN_OBJECTS` или код с префиксом по образцу apgcode:
+    `xs<население>` - натюрморт, `xp<период>` - осциллятор, `xq<период>` -
+    корабль. Если объект не повторился (например, это части нескольких
+    объектов, которые еще взаимодействуют), ключ - `UNKNOWN`.
+    """
+    evolved = evolve(cells, max_period)
+    if evolved is None:
+        return UNKNOWN
+    phases, moved = evolved
+    code = canonical(phases)
+    if code in _NAMES:
+        return _NAMES[code]
+    if moved:
+        return f"xq{len(phases)}_{code}"
+    if len(phases) > 1:
+        return f"xp{len(phases)}_{code}"
+    return f"xs{len(cells)}_{code}"
+
+
+def census_soup(seed: int, side: int = SOUP_SIDE, max_generations: int = 5000, max_period: int = 8) -> Census:
+    """Один суп целиком: посеять, успокоить, разбить на объекты и опознать их."""
+    game = seed_soup(seed, side)
+    if not stabilize(game, max_generations, max_period):
+        return collections.Counter([UNSTABLE])
+    return collections.Counter(classify(group, max_period) for group in components(game.curr_generation))
+
+
+def _census_chunk(task: tp.Tuple[tp.Sequence[int], int, int, int]) -> Census:
+    seeds, side, max_generations, max_period = task
+    tally: Census = collections.Counter()
+    for seed in seeds:
+        tally += census_soup(seed, side, max_generations, max_period)
+    return tally
+
+
+def census(
+    seeds: tp.Sequence[int],
+    workers: int = 1,
+    side: int = SOUP_SIDE,
+    max_generations: int = 5000,
+    max_period: int = 8,
+    chunk: int = 8,
+) -> Census:
+    """
+    Перепись объектов из супов с зернами `seeds`.
+
+    Зерна делятся на порции по `chunk`; каждую порцию процесс из пула
+    считает целиком и возвращает свою таблицу частот, а таблицы
+    складываются в конце. Результат не зависит от числа процессов.
+    """
+    tasks = [(seeds[k : k + chunk], side, max_generations, max_period) for k in range(0, len(seeds), chunk)]
+    total: Census = collections.Counter()
+    if workers <= 1:
+        for task in tasks:
+            total += _census_chunk(task)
+        return total
+    with multiprocessing.Pool(workers) as pool:
+        for tally in pool.imap_unordered(_census_chunk, tasks):
+            total += tally
+    return total
+
+
+def throughput(soups: int, max_workers: int, **kwargs: tp.Any) -> tp.List[tp.Tuple[int, float]]:
+    """Супов в секунду для 1..`max_workers` процессов на одних и тех же зернах."""
+    results = []
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        census(range(soups), workers, **kwargs)
+        results.append((workers, soups / (time.perf_counter() - start)))
+    return results
+
+
+def _known_names() -> tp.Dict[str, str]:
+    names = {}
+    for name, lines in KNOWN_OBJECTS.items():
+        evolved = evolve(_pattern_cells(lines))
+        assert evolved is not None, name
+        names[canonical(evolved[0])] = name
+    return names
+
+
+_NAMES = _known_names()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Перепись объектов, в которые превращаются случайные супы")
+    parser.add_argument("--soups", type=int, default=200)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--side", type=int, default=SOUP_SIDE)
+    parser.add_argument("--max-generations", type=int, default=5000)
+    parser.add_argument("--top", type=int, default=20, help="сколько самых частых объектов показать")
+    parser.add_argument("--throughput", action="store_true", help="замерить скорость для 1..workers процессов")
+    args = parser.parse_args()
+
+    if args.throughput:
+        for workers, rate in throughput(args.soups, args.workers, side=args.side, max_generations=args.max_generations):
+            print(f"{workers:>3} процессов: {rate:8.2f} супов/с")
+    else:
+        seeds = range(args.first_seed, args.first_seed + args.soups)
+        start = time.perf_counter()
+        table = census(seeds, args.workers, args.side, args.max_generations)
+        elapsed = time.perf_counter() - start
+        total = sum(table.values())
+        for name, count in table.most_common(args.top):
+            print(f"{name:<40} {count:>8} {count / total:>8.2%}")
+        print(f"{args.soups} супов за {elapsed:.2f} с ({args.soups / elapsed:.2f} супов/с)")
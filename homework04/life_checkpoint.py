@@ -0,0 +1,263 @@
+import argparse
+import bisect
+import lzma
+import pathlib
+import struct
+import time
+import typing as tp
+import zlib
+
+import numpy as np
+
+MAGIC = b"LIFEHIST"
+VERSION = 1
+# Заголовок: версия, сжатие, строки, столбцы, интервал ключевых кадров, длина правила
+HEADER = struct.Struct("<BBQQIH")
+# Кадр: тип (ключевой или разностный), номер поколения, длина сжатых данных
+FRAME = struct.Struct("<BQQ")
+# Хвост файла: смещение оглавления и число кадров
+FOOTER = struct.Struct("<QQ")
+KEYFRAME, DELTA = 0, 1
+
+COMPRESSIONS: tp.Dict[str, tp.Tuple[int, tp.Callable[[bytes], bytes], tp.Callable[[bytes], bytes]]] = {
+    "none": (0, bytes, bytes),
+    "zlib": (1, zlib.compress, zlib.decompress),
+    "lzma": (2, lzma.compress, lzma.decompress),
+}
+
+
+def pack_rows(size: tp.Tuple[int, int], lines: tp.Iterable[tp.Sequence[int]]) -> np.ndarray:
+    """Упаковать поле по 8 клеток в байт: одна строка поля - строка массива."""
+    rows, cols = size
+    frame = np.zeros((rows, (cols + 7) // 8), dtype=np.uint8)
+    bits = np.zeros(cols, dtype=np.uint8)
+    for i, row in enumerate(lines):
+        bits[:] = 0
+        bits[list(row)] = 1
+        frame[i] = np.packbits(bits)
+    return frame
+
+
+def unpack_rows(frame: np.ndarray, cols: int) -> tp.Iterator[tp.List[int]]:
+    """Обратное к `pack_rows`: номера живых столбцов каждой строки."""
+    for row in frame:
+        yield np.flatnonzero(np.unpackbits(row)[:cols]).tolist()
+
+
+class FrameRing:
+    """
+    Последние `capacity` упакованных кадров в кольцевом буфере.
+
+    Память под все кадры выделяется сразу, новый кадр копируется на место
+    самого старого, поэтому расход памяти не зависит от длины игры.
+    `ring[0]` - самый новый кадр, `ring[k]` - записанный на `k` кадров раньше.
+    """
+
+    def __init__(self, capacity: int, size: tp.Tuple[int, int]) -> None:
+        rows, cols = size
+        self.frames = np.zeros((capacity, rows, (cols + 7) // 8), dtype=np.uint8)
+        self.generations = np.zeros(capacity, dtype=np.int64)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, generation: int, frame: np.ndarray) -> None:
+        """Записать кадр `frame` (результат `pack_rows`) поколения `generation`."""
+        self.frames[self._next] = frame
+        self.generations[self._next] = generation
+        self._next = (self._next + 1) % len(self.frames)
+        self._count = min(self._count + 1, len(self.frames))
+
+    def __getitem__(self, k: int) -> tp.Tuple[int, np.ndarray]:
+        """Номер поколения и кадр, записанный на `k` кадров раньше самого нового."""
+        if not 0 <= k < self._count:
+            raise IndexError(k)
+        position = (self._next - 1 - k) % len(self.frames)
+        return int(self.generations[position]), self.frames[position]
+
+    def drop(self, n: int) -> None:
+        """Забыть `n` самых новых кадров."""
+        n = min(n, self._count)
+        self._next = (self._next - n) % len(self.frames)
+        self._count -= n
+
+    def clear(self) -> None:
+        self._next = self._count = 0
+
+
+class HistoryWriter:
+    """
+    Запись истории поколений в двоичный файл.
+
+    Каждые `keyframe_every` кадров пишется ключевой кадр - упакованное по
+    битам поле, между ними - XOR с предыдущим кадром. Все кадры сжимаются
+    (`zlib`, `lzma` или `none`). В конце файла лежит оглавление, по
+    которому `HistoryReader` находит нужный кадр без чтения остальных.
+    """
+
+    def __init__(
+        self,
+        filename: tp.Union[str, pathlib.Path],
+        size: tp.Tuple[int, int],
+        rule: str = "B3/S23",
+        keyframe_every: int = 100,
+        compression: str = "zlib",
+    ) -> None:
+        self.size = size
+        self.keyframe_every = keyframe_every
+        code, self._compress, _ = COMPRESSIONS[compression]
+        self._file = pathlib.Path(filename).open("wb")
+        self._file.write(MAGIC)
+        rule_bytes = rule.encode()
+        self._file.write(HEADER.pack(VERSION, code, size[0], size[1], keyframe_every, len(rule_bytes)))
+        self._file.write(rule_bytes)
+        self._index: tp.List[tp.Tuple[int, int, int]] = []
+        self._prev: tp.Optional[np.ndarray] = None
+
+    def append(self, generation: int, frame: np.ndarray) -> None:
+        """Дописать кадр `frame` (результат `pack_rows`) для поколения `generation`."""
+        if self._prev is None or len(self._index) % self.keyframe_every == 0:
+            kind, payload = KEYFRAME, frame
+        else:
+            kind, payload = DELTA, np.bitwise_xor(frame, self._prev)
+        data = self._compress(payload.tobytes())
+        self._index.append((generation, self._file.tell(), kind))
+        self._file.write(FRAME.pack(kind, generation, len(data)))
+        self._file.write(data)
+        self._prev = frame
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        for generation, offset, kind in self._index:
+            self._file.write(FRAME.pack(kind, generation, offset))
+        self._file.write(FOOTER.pack(index_offset, len(self._index)))
+        self._file.close()
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(self, *exc_info: tp.Any) -> None:
+        self.close()
+
+
+class HistoryReader:
+    """
+    Чтение истории, записанной `HistoryWriter`.
+
+    `frame(generation)` переходит к ближайшему ключевому кадру не позже
+    нужного поколения и применяет разностные кадры только от него.
+    """
+
+    def __init__(self, filename: tp.Union[str, pathlib.Path]) -> None:
+        self._file = pathlib.Path(filename).open("rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename}: это не файл истории")
+        version, code, rows, cols, self.keyframe_every, rule_length = HEADER.unpack(self._file.read(HEADER.size))
+        if version != VERSION:
+            raise ValueError(f"{filename}: неизвестная версия {version}")
+        self.size = rows, cols
+        self.rule = self._file.read(rule_length).decode()
+        self._decompress = next(decompress for c, _, decompress in COMPRESSIONS.values() if c == code)
+        self._file.seek(-FOOTER.size, 2)
+        index_offset, count = FOOTER.unpack(self._file.read(FOOTER.size))
+        self._file.seek(index_offset)
+        self._index = [FRAME.unpack(self._file.read(FRAME.size)) for _ in range(count)]
+        # Номера поколений, для которых есть кадры, по возрастанию
+        self.generations = [generation for _, generation, _ in self._index]
+
+    def _read(self, position: int) -> np.ndarray:
+        offset = self._index[position][2]
+        self._file.seek(offset)
+        _, _, length = FRAME.unpack(self._file.read(FRAME.size))
+        data = self._decompress(self._file.read(length))
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.size[0], -1)
+
+    def nearest(self, generation: int) -> int:
+        """Последнее записанное поколение не позже `generation`."""
+        position = bisect.bisect_right(self.generations, generation)
+        if position == 0:
+            raise KeyError(generation)
+        return self.generations[position - 1]
+
+    def frame(self, generation: int) -> np.ndarray:
+        """Упакованное поле поколения `generation`."""
+        position = bisect.bisect_left(self.generations, generation)
+        if position == len(self.generations) or self.generations[position] != generation:
+            raise KeyError(generation)
+        key = position
+        while self._index[key][0] != KEYFRAME:
+            key -= 1
+        frame = self._read(key).copy()
+        for delta in range(key + 1, position + 1):
+            np.bitwise_xor(frame, self._read(delta), out=frame)
+        return frame
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "HistoryReader":
+        return self
+
+    def __exit__(self, *exc_info: tp.Any) -> None:
+        self.close()
+
+
+def benchmark(size: int, generations: int, every: int, directory: pathlib.Path) -> tp.Dict[str, float]:
+    """
+    Сравнить размер и время записи и чтения истории с сохранением текстового
+    поля через `GameOfLife.save` каждые `every` поколений.
+    """
+    from life_numpy import NumpyGameOfLife
+
+    game = NumpyGameOfLife((size, size))
+    start = time.perf_counter()
+    text_bytes = 0
+    for k in range(generations):
+        if k % every == 0:
+            path = directory / f"gen{k}.txt"
+            game.save(path)
+            text_bytes += path.stat().st_size
+        game.step()
+    text_save = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for k in range(0, generations, every):
+        NumpyGameOfLife.from_file(directory / f"gen{k}.txt")
+    text_load = time.perf_counter() - start
+
+    game = NumpyGameOfLife.from_file(directory / "gen0.txt")
+    history = directory / "history.lifehist"
+    start = time.perf_counter()
+    game.save_history(history, generations - 1, every=every)
+    history_save = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with HistoryReader(history) as reader:
+        for generation in reader.generations:
+            reader.frame(generation)
+    history_load = time.perf_counter() - start
+    return {
+        "text_bytes": text_bytes,
+        "history_bytes": history.stat().st_size,
+        "text_save": text_save,
+        "history_save": history_save,
+        "text_load": text_load,
+        "history_load": history_load,
+    }
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Сравнение истории поколений с текстовыми файлами")
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--generations", type=int, default=200)
+    parser.add_argument("--every", type=int, default=10)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, value in benchmark(args.size, args.generations, args.every, pathlib.Path(tmp)).items():
+            print(f"{name:>14}: {value:.4f}" if isinstance(value, float) else f"{name:>14}: {value}")
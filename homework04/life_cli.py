@@ -0,0 +1,162 @@
+import argparse
+import contextlib
+import pathlib
+import random
+import sys
+import time
+import typing as tp
+
+from life import BOUNDARIES, GameOfLife
+from life_adaptive import AdaptiveGameOfLife
+from life_hashlife import HashLifeGameOfLife
+from life_mapped import MappedGameOfLife
+from life_metrics import Metrics, profiled
+from life_numpy import NumpyGameOfLife
+from life_packed import PackedGameOfLife
+from life_parallel import ParallelGameOfLife
+from life_sparse import SparseGameOfLife
+from life_tiled import TiledGameOfLife
+
+ENGINES: tp.Dict[str, tp.Type[GameOfLife]] = {
+    "list": GameOfLife,
+    "numpy": NumpyGameOfLife,
+    "packed": PackedGameOfLife,
+    "sparse": SparseGameOfLife,
+    "hashlife": HashLifeGameOfLife,
+    "parallel": ParallelGameOfLife,
+    "tiled": TiledGameOfLife,
+    "adaptive": AdaptiveGameOfLife,
+    "mapped": MappedGameOfLife,
+}
+
+
+class RunResult(tp.NamedTuple):
+    """Итог одного прогона: что считали, каким движком и как быстро."""
+
+    name: str
+    engine: str
+    rows: int
+    cols: int
+    generations: int
+    seconds: float
+
+    @property
+    def generations_per_second(self) -> float:
+        return self.generations / self.seconds if self.seconds else float("inf")
+
+    @property
+    def cells_per_second(self) -> float:
+        return self.rows * self.cols * self.generations_per_second
+
+
+def make_game(
+    engine: str,
+    pattern: tp.Optional[pathlib.Path] = None,
+    seed: tp.Optional[int] = None,
+    size: tp.Tuple[int, int] = (100, 100),
+    **kwargs: tp.Any,
+) -> GameOfLife:
+    """Создать игру движком `engine`: из файла узора или случайную с зерном `seed`."""
+    cls = ENGINES[engine]
+    if pattern is not None:
+        return cls.from_file(pattern, **kwargs)
+    random.seed(seed)
+    return cls(size, **kwargs)
+
+
+def simulate(
+    game: GameOfLife,
+    generations: int,
+    checkpoint_every: int = 0,
+    checkpoint: tp.Optional[tp.Callable[[GameOfLife], None]] = None,
+) -> float:
+    """
+    Выполнить `generations` шагов без отрисовки и вернуть затраченное время.
+
+    Каждые `checkpoint_every` поколений вызывается `checkpoint(game)`;
+    время записи в результат не входит.
+    """
+    elapsed = 0.0
+    done = 0
+    chunk = checkpoint_every or generations
+    while done < generations:
+        n = min(chunk, generations - done)
+        start = time.perf_counter()
+        game.advance(n)
+        elapsed += time.perf_counter() - start
+        done += n
+        if checkpoint is not None and checkpoint_every and done < generations:
+            checkpoint(game)
+    return elapsed
+
+
+def run(args: argparse.Namespace) -> tp.List[RunResult]:
+    """Выполнить команду `run`: по прогону на каждый узор и каждое зерно."""
+    sources: tp.List[tp.Tuple[str, tp.Dict[str, tp.Any]]] = [
+        (pathlib.Path(path).stem, {"pattern": pathlib.Path(path)}) for path in args.patterns
+    ]
+    seeds = args.seeds if args.seeds or args.patterns else [0]
+    sources += [(f"seed{seed}", {"seed": seed, "size": tuple(args.size)}) for seed in seeds]
+    output = pathlib.Path(args.output) if args.output else None
+    if output is not None:
+        output.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    with contextlib.ExitStack() as stack:
+        metrics_file = stack.enter_context(open(args.metrics, "w")) if args.metrics else None
+        for name, source in sources:
+            game = make_game(args.engine, boundary=args.boundary, **source)
+
+            def save(game: GameOfLife, name: str = name) -> None:
+                if output is not None:
+                    game.save(output / f"{name}.gen{game.generations}.{args.format}")
+
+            metrics = None
+            if metrics_file is not None:
+                labels = {"name": name, "engine": args.engine}
+                metrics = Metrics(args.metrics_every, metrics_file, allocations=args.profile, labels=labels)
+                metrics.attach(game)
+            try:
+                # Профилируется только цикл шагов, без создания игры
+                with profiled(sys.stderr) if args.profile else contextlib.nullcontext():
+                    seconds = simulate(game, args.generations, args.checkpoint_every, save)
+                save(game)
+            finally:
+                if metrics is not None:
+                    metrics.flush()
+                    metrics.detach()
+                close = getattr(game, "close", None)
+                if close is not None:
+                    close()
+            results.append(RunResult(name, args.engine, game.rows, game.cols, args.generations, seconds))
+    return results
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Игра «Жизнь» без интерфейса")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="посчитать поколения и записать результат")
+    run_parser.add_argument("patterns", nargs="*", help="файлы узоров (.txt, .rle, .cells)")
+    run_parser.add_argument("--seed", dest="seeds", type=int, action="append", default=[], help="случайное поле")
+    run_parser.add_argument("--size", type=int, nargs=2, default=[100, 100], metavar=("ROWS", "COLS"))
+    run_parser.add_argument("--generations", type=int, default=100)
+    run_parser.add_argument("--engine", choices=sorted(ENGINES), default="numpy")
+    run_parser.add_argument("--boundary", choices=BOUNDARIES, default="bounded", help="граница поля")
+    run_parser.add_argument("--output", help="каталог для итоговых полей и контрольных точек")
+    run_parser.add_argument("--checkpoint-every", type=int, default=0, help="записывать поле каждые N поколений")
+    run_parser.add_argument("--format", choices=["txt", "rle", "cells"], default="rle")
+    run_parser.add_argument("--metrics", help="файл для замеров по фазам шага (строки JSON)")
+    run_parser.add_argument("--metrics-every", type=int, default=0, help="итог замеров каждые N поколений")
+    run_parser.add_argument("--profile", action="store_true", help="cProfile и tracemalloc вокруг цикла шагов")
+    args = parser.parse_args(argv)
+
+    print(f"{'name':<16} {'engine':<8} {'size':>11} {'gens':>6} {'sec':>8} {'gen/s':>10} {'cells/s':>12}")
+    for result in run(args):
+        print(
+            f"{result.name:<16} {result.engine:<8} {f'{result.rows}x{result.cols}':>11} {result.generations:>6}"
+            f" {result.seconds:>8.3f} {result.generations_per_second:>10.1f} {result.cells_per_second:>12.4g}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,186 @@
 import curses
+import time
+import typing as tp
 
+import numpy as np
 from life import GameOfLife
 from ui import UI
 
+ALIVE, DEAD = "*", " "
+
+
+class FrameStats(tp.NamedTuple):
+    """Кадров в секунду и оценка числа байт, отправленных в терминал за кадр."""
+
+    fps: float
+    bytes: int
+
+
+def frame_runs(
+    old: tp.Optional[np.ndarray], new: np.ndarray, changed: tp.Optional[np.ndarray] = None
+) -> tp.List[tp.Tuple[int, int, str]]:
+    """
+    Отрезки строк, которые нужно перерисовать, чтобы кадр `old` стал `new`:
+    тройки (строка, столбец, текст). Без `old` перерисовывается весь кадр.
+    Если изменившиеся клетки уже известны, их можно передать маской `changed`.
+    """
+    if changed is None:
+        changed = np.ones(new.shape, dtype=bool) if old is None else old != new
+    runs = []
+    for y in np.flatnonzero(changed.any(axis=1)).tolist():
+        # Границы отрезков подряд идущих изменившихся клеток строки
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], changed[y].astype(np.int8), [0]))))
+        for start, stop in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            runs.append((y, start, "".join(ALIVE if cell else DEAD for cell in new[y, start:stop].tolist())))
+    return runs
+
+
+def run_bytes(y: int, x: int, text: str) -> int:
+    """Байт в терминал на отрезок: перемещение курсора `ESC[y;xH` и сам текст."""
+    return len(f"\x1b[{y + 1};{x + 1}H") + len(text)
+
 
 class Console(UI):
-    def __init__(self, life: GameOfLife) -> None:
+    """
+    Консольный интерфейс игры на curses.
+
+    На экране видно окно поля (viewport), которое можно двигать стрелками;
+    из движка берется только эта часть поля. Последний нарисованный кадр
+    хранится, и каждое поколение в терминал отправляются только
+    изменившиеся отрезки строк. Изменившиеся клетки берутся из
+    `life.changes`, а кадр целиком читается из движка только после сдвига
+    окна или пропуска поколений. Вывод собирается через
+    `noutrefresh`/`doupdate`. С `full_redraw=True` экран каждый кадр
+    очищается и рисуется заново - для сравнения.
+
+    Клавиши: стрелки - сдвинуть окно, пробел - пауза, `q` - выход.
+    """
+
+    def __init__(self, life: GameOfLife, speed: int = 10, full_redraw: bool = False) -> None:
         super().__init__(life)
+        self.speed = speed
+        self.full_redraw = full_redraw
+        # Левый верхний угол окна на поле
+        self.top = self.left = 0
+        self._frame: tp.Optional[np.ndarray] = None
+        # Поколение, которое сейчас на экране
+        self._drawn: tp.Optional[int] = None
+        self.stats = FrameStats(0.0, 0)
+
+    def view_size(self, screen) -> tp.Tuple[int, int]:
+        """Размер окна поля: экран без рамки и строки состояния."""
+        height, width = screen.getmaxyx()
+        return max(min(height - 3, self.life.rows), 0), max(min(width - 2, self.life.cols), 0)
+
+    def pan(self, screen, drow: int, dcol: int) -> None:
+        """Сдвинуть окно, не выходя за края поля."""
+        rows, cols = self.view_size(screen)
+        self.top = min(max(self.top + drow, 0), self.life.rows - rows)
+        self.left = min(max(self.left + dcol, 0), self.life.cols - cols)
+        self._frame = None
 
     def draw_borders(self, screen) -> None:
-        """ Отобразить рамку. """
-        pass
+        """Отобразить рамку."""
+        rows, cols = self.view_size(screen)
+        border = "+" + "-" * cols + "+"
+        screen.addstr(0, 0, border)
+        for y in range(1, rows + 1):
+            screen.addstr(y, 0, "|")
+            screen.addstr(y, cols + 1, "|")
+        screen.addstr(rows + 1, 0, border)
 
-    def draw_grid(self, screen) -> None:
-        """ Отобразить состояние клеток. """
-        pass
+    def draw_grid(self, screen) -> int:
+        """
+        Отобразить состояние клеток в окне и вернуть оценку числа байт,
+        отправленных в терминал.
+        """
+        rows, cols = self.view_size(screen)
+        old = None if self.full_redraw else self._frame
+        changed = None
+        if old is not None and self.life.generations == self._drawn:
+            frame = old
+            changed = np.zeros(frame.shape, dtype=bool)
+        elif old is not None and self._drawn is not None and self.life.generations == self._drawn + 1:
+            frame = old.copy()
+            changed = np.zeros(frame.shape, dtype=bool)
+            for cells, alive in zip(self.life.changes, (True, False)):
+                y, x = (cells - (self.top, self.left)).T
+                inside = (y >= 0) & (y < rows) & (x >= 0) & (x < cols)
+                frame[y[inside], x[inside]] = alive
+                changed[y[inside], x[inside]] = True
+        else:
+            frame = np.asarray(self.life.to_grid(self.top, self.left, rows, cols), dtype=bool).reshape(rows, cols)
+        sent = 0
+        for y, x, text in frame_runs(old, frame, changed):
+            screen.addstr(y + 1, x + 1, text)
+            sent += run_bytes(y + 1, x + 1, text)
+        self._frame = frame
+        self._drawn = self.life.generations
+        return sent
+
+    def draw_status(self, screen) -> None:
+        rows, _ = self.view_size(screen)
+        status = (
+            f"gen {self.life.generations}  view {self.top},{self.left}"
+            f"  {self.stats.fps:.1f} fps  {self.stats.bytes} B/frame"
+        )
+        screen.addstr(rows + 2, 0, status[: screen.getmaxyx()[1] - 1])
+        screen.clrtoeol()
 
     def run(self) -> None:
         screen = curses.initscr()
-        # PUT YOUR CODE HERE
-        curses.endwin()
+        curses.noecho()
+        curses.cbreak()
+        curses.curs_set(0)
+        screen.keypad(True)
+        screen.nodelay(True)
+        try:
+            self.loop(screen)
+        finally:
+            screen.keypad(False)
+            curses.nocbreak()
+            curses.echo()
+            curses.endwin()
+
+    def loop(self, screen) -> None:
+        life = self.life
+        paused = False
+        moves = {curses.KEY_UP: (-1, 0), curses.KEY_DOWN: (1, 0), curses.KEY_LEFT: (0, -1), curses.KEY_RIGHT: (0, 1)}
+        screen.clear()
+        self.draw_borders(screen)
+        last = time.perf_counter()
+        while True:
+            key = screen.getch()
+            if key == ord("q"):
+                break
+            if key == ord(" "):
+                paused = not paused
+            elif key in moves:
+                rows, cols = self.view_size(screen)
+                drow, dcol = moves[key]
+                self.pan(screen, drow * max(rows // 4, 1), dcol * max(cols // 4, 1))
+            elif key == curses.KEY_RESIZE:
+                screen.clear()
+                self.draw_borders(screen)
+                self.pan(screen, 0, 0)
+
+            if self.full_redraw:
+                # Как при перерисовке экрана целиком: терминал получает все заново
+                screen.clear()
+                self.draw_borders(screen)
+            sent = self.draw_grid(screen)
+            now = time.perf_counter()
+            self.stats = FrameStats(1 / max(now - last, 1e-9), sent)
+            last = now
+            self.draw_status(screen)
+            screen.noutrefresh()
+            curses.doupdate()
+
+            if not paused and life.is_changing and not life.is_max_generations_exceeded:
+                life.step()
+            time.sleep(max(1 / self.speed - (time.perf_counter() - now), 0))
+
+
+if __name__ == "__main__":
+    console = Console(GameOfLife((24, 80)))
+    console.run()
@@ -0,0 +1,152 @@
+import argparse
+import random
+import time
+import typing as tp
+
+import numpy as np
+from life import BOUNDARIES, Rule, parse_rule
+from life_numpy import NumpyGameOfLife, next_cells, random_cells
+
+
+def random_boards(count: int, size: tp.Tuple[int, int]) -> np.ndarray:
+    """
+    Получить `count` случайных полей - те же, что дали бы `count` вызовов
+    `create_grid(randomize=True)` подряд при том же состоянии `random`.
+    """
+    rows, cols = size
+    return random_cells(count * rows * cols).reshape(count, rows, cols)
+
+
+class Ensemble:
+    """
+    Пачка из `count` полей одного размера, которые считаются одновременно.
+
+    Поля хранятся в одном массиве формы (count, rows, cols), и шаг делается
+    одним вызовом `next_cells` для всей пачки. Каждое поле останавливается
+    само по себе - как `GameOfLife` в цикле `while is_changing and not
+    is_max_generations_exceeded`: когда оно перестало меняться или (если
+    задан `max_period`) повторило одно из последних `max_period` поколений.
+    Остановившиеся поля убираются из пачки и дальше не считаются.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        max_period: int = 0,
+        rule: tp.Union[str, Rule] = "B3/S23",
+        boundary: str = "bounded",
+    ) -> None:
+        self.rows, self.cols = size
+        self.rule = rule if isinstance(rule, Rule) else parse_rule(rule)
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"неизвестная граница поля: {boundary!r}")
+        self.boundary = boundary
+        self.max_generations = max_generations
+        self.max_period = max_period
+        self.generations = 1
+        boards = random_boards(count, size) if randomize else np.zeros((count, self.rows, self.cols), dtype=np.uint8)
+        # Все поля: остановившиеся хранятся здесь, считающиеся - в `_active`
+        self._boards = boards
+        self._ids = np.arange(count)
+        self._active = boards.copy()
+        # Номер поколения, на котором поле остановилось, и период его цикла
+        # (0 - поле остановлено по `max_generations`)
+        self.stopped_at = np.zeros(count, dtype=np.int64)
+        self.periods = np.zeros(count, dtype=np.int64)
+        # Последние поколения считающихся полей, от недавнего к старому
+        self._history: tp.List[np.ndarray] = []
+        if not max_period:
+            # Как у `GameOfLife`: до первого шага предыдущее поколение пустое
+            empty = np.count_nonzero(self._active, axis=(1, 2)) == 0
+            self._finish(empty, np.ones(count, dtype=np.int64))
+        self._check_max_generations()
+
+    @property
+    def active(self) -> int:
+        """Сколько полей еще считается."""
+        return len(self._ids)
+
+    @property
+    def is_changing(self) -> bool:
+        return self.active > 0
+
+    @property
+    def is_max_generations_exceeded(self) -> bool:
+        return self.max_generations is not None and self.generations >= self.max_generations
+
+    @property
+    def boards(self) -> np.ndarray:
+        """Текущие поля: для остановившихся - поколение, на котором они остановились."""
+        self._boards[self._ids] = self._active
+        return self._boards
+
+    def population(self) -> np.ndarray:
+        """Число живых клеток каждого поля."""
+        return np.count_nonzero(self.boards, axis=(1, 2))
+
+    def step(self) -> None:
+        """Выполнить один шаг для всех считающихся полей."""
+        if not self.active:
+            return
+        depth = max(self.max_period, 1)
+        self._history = [self._active] + self._history[: depth - 1]
+        self._active = next_cells(self._active, self.rule, self.boundary == "torus")
+        self.generations += 1
+        periods = np.zeros(self.active, dtype=np.int64)
+        for period, past in enumerate(self._history, start=1):
+            repeated = (periods == 0) & (self._active == past).all(axis=(1, 2))
+            periods[repeated] = period
+        self._finish(periods > 0, periods)
+        self._check_max_generations()
+
+    def run(self) -> None:
+        """Считать, пока не остановятся все поля."""
+        while self.is_changing:
+            self.step()
+
+    def _check_max_generations(self) -> None:
+        if self.is_max_generations_exceeded:
+            self._finish(np.ones(self.active, dtype=bool), np.zeros(self.active, dtype=np.int64))
+
+    def _finish(self, done: np.ndarray, periods: np.ndarray) -> None:
+        """Убрать из пачки поля с отметкой `done`, записав их итог."""
+        if not done.any():
+            return
+        ids = self._ids[done]
+        self._boards[ids] = self._active[done]
+        self.stopped_at[ids] = self.generations
+        self.periods[ids] = periods[done]
+        keep = ~done
+        self._ids = self._ids[keep]
+        self._active = self._active[keep]
+        self._history = [past[keep] for past in self._history]
+
+
+def benchmark(count: int, size: int, max_generations: int, max_period: int) -> tp.Dict[str, float]:
+    """Сравнить время пачки со временем тех же полей по одному в `NumpyGameOfLife`."""
+    random.seed(0)
+    start = time.perf_counter()
+    for _ in range(count):
+        game = NumpyGameOfLife((size, size), max_generations=max_generations, max_period=max_period)
+        while game.is_changing and not game.is_max_generations_exceeded:
+            game.step()
+    single = time.perf_counter() - start
+    random.seed(0)
+    start = time.perf_counter()
+    Ensemble(count, (size, size), max_generations=max_generations, max_period=max_period).run()
+    batched = time.perf_counter() - start
+    return {"single": single, "ensemble": batched, "speedup": single / batched}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пачка случайных полей против полей по одному")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--generations", type=int, default=1000)
+    parser.add_argument("--max-period", type=int, default=2)
+    args = parser.parse_args()
+    for name, value in benchmark(args.count, args.size, args.generations, args.max_period).items():
+        print(f"{name:>9}: {value:.3f}")
@@ -1,21 +1,133 @@
+import typing as tp
+
+import numpy as np
 import pygame
 from life import GameOfLife
 from pygame.locals import *
 from ui import UI
 
+# Сторона блока клеток, которым обновляется экран
+TILE = 16
+
 
 class GUI(UI):
+    """
+    Графический интерфейс игры на pygame.
+
+    Поле хранится в поверхности размером в одну точку на клетку: цвета
+    клеток пишутся в нее через `pygame.surfarray`, а на экран она
+    переносится масштабированием. Сетка рисуется один раз в отдельную
+    поверхность и накладывается поверх. После шага перерисовываются только
+    блоки `TILE` х `TILE` с изменившимися клетками, и на экран отправляются
+    только их прямоугольники, поэтому время кадра зависит от числа
+    изменений, а не от размера поля. Какие клетки родились и умерли, берется
+    из `life.changes`, поэтому поколения не сравниваются целиком.
+
+    Клавиши: пробел - пауза; на паузе стрелка вправо - шаг вперед, стрелка
+    влево - шаг назад, если у игры включена история (`history`).
+    """
+
     def __init__(self, life: GameOfLife, cell_size: int = 10, speed: int = 10) -> None:
         super().__init__(life)
+        self.cell_size = cell_size
+        self.speed = speed
+        self.width = life.cols * cell_size
+        self.height = life.rows * cell_size
+        self.screen = pygame.display.set_mode((self.width, self.height))
+        # Поле в масштабе одна точка - одна клетка
+        self.cells = pygame.Surface((life.cols, life.rows), depth=32)
+        self.alive_color = self.cells.map_rgb(pygame.Color("green"))
+        self.dead_color = self.cells.map_rgb(pygame.Color("white"))
+        self.lines = self.render_lines()
+        # Поколение, которое сейчас на экране
+        self._drawn: tp.Optional[int] = None
+
+    def render_lines(self) -> pygame.Surface:
+        """Нарисовать сетку на прозрачной поверхности размером с окно."""
+        lines = pygame.Surface((self.width, self.height), SRCALPHA)
+        for x in range(0, self.width, self.cell_size):
+            pygame.draw.line(lines, pygame.Color("black"), (x, 0), (x, self.height))
+        for y in range(0, self.height, self.cell_size):
+            pygame.draw.line(lines, pygame.Color("black"), (0, y), (self.width, y))
+        return lines
 
     def draw_lines(self) -> None:
-        # Copy from previous assignment
-        pass
+        self.screen.blit(self.lines, (0, 0))
 
-    def draw_grid(self) -> None:
-        # Copy from previous assignment
-        pass
+    def changed_tiles(self) -> tp.List[pygame.Rect]:
+        """
+        Закрасить клетки, родившиеся и умершие за последний шаг, и вернуть
+        блоки (в клетках), в которых они лежат.
+        """
+        life = self.life
+        pixels = pygame.surfarray.pixels2d(self.cells)
+        changed = []
+        for cells, color in zip(life.changes, (self.alive_color, self.dead_color)):
+            # У неограниченных полей изменения могут лежать за пределами окна
+            inside = (cells >= 0).all(axis=1) & (cells[:, 0] < life.rows) & (cells[:, 1] < life.cols)
+            rows, cols = cells[inside].T
+            pixels[cols, rows] = color
+            changed.append(cells[inside])
+        del pixels
+        tiles = np.unique(np.concatenate(changed) // TILE, axis=0)
+        return [pygame.Rect(tj * TILE, ti * TILE, TILE, TILE).clip(self.cells.get_rect()) for ti, tj in tiles.tolist()]
+
+    def draw_grid(self) -> tp.List[pygame.Rect]:
+        """
+        Перерисовать изменившиеся части поля и вернуть прямоугольники экрана,
+        которые нужно обновить.
+
+        Если с прошлой отрисовки прошло не ровно одно поколение, поле
+        перерисовывается целиком.
+        """
+        life = self.life
+        if self._drawn is not None and life.generations == self._drawn + 1:
+            tiles = self.changed_tiles()
+        else:
+            grid = np.asarray(life.to_grid(), dtype=bool).reshape(life.rows, life.cols)
+            pygame.surfarray.blit_array(self.cells, np.where(grid.T, self.alive_color, self.dead_color))
+            tiles = [self.cells.get_rect()]
+        self._drawn = life.generations
+
+        size = self.cell_size
+        rects = []
+        for tile in tiles:
+            rect = pygame.Rect(tile.x * size, tile.y * size, tile.w * size, tile.h * size)
+            pygame.transform.scale(self.cells.subsurface(tile), rect.size, self.screen.subsurface(rect))
+            self.screen.blit(self.lines, rect, area=rect)
+            rects.append(rect)
+        return rects
 
     def run(self) -> None:
-        # Copy from previous assignment
-        pass
+        pygame.init()
+        clock = pygame.time.Clock()
+        pygame.display.set_caption("Game of Life")
+        self._drawn = None
+        pygame.display.update(self.draw_grid())
+
+        running = True
+        paused = False
+        while running:
+            for event in pygame.event.get():
+                if event.type == QUIT:
+                    running = False
+                elif event.type == KEYDOWN and event.key == K_SPACE:
+                    paused = not paused
+                elif event.type == KEYDOWN and paused and event.key == K_LEFT and self.life.history is not None:
+                    # Шаг назад по истории поколений
+                    if len(self.life.history) > 1:
+                        self.life.rewind(1)
+                        pygame.display.update(self.draw_grid())
+                elif event.type == KEYDOWN and paused and event.key == K_RIGHT:
+                    self.life.step()
+                    pygame.display.update(self.draw_grid())
+            if not paused and self.life.is_changing and not self.life.is_max_generations_exceeded:
+                self.life.step()
+                pygame.display.update(self.draw_grid())
+            clock.tick(self.speed)
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    gui = GUI(GameOfLife((50, 80)))
+    gui.run()
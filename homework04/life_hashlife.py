@@ -0,0 +1,431 @@
+import collections
+import random
+import typing as tp
+
+import life_io
+from life import (
+    CONWAY,
+    Cell,
+    Cells,
+    Changes,
+    GameOfLife,
+    Grid,
+    Rule,
+    Stats,
+    cell_array,
+    parse_rule,
+)
+
+
+class Node:
+    """
+    Узел квадродерева размером 2^level х 2^level клеток.
+
+    Узлы канонизируются (hash-consing) в `HashLife.join`, поэтому одинаковые
+    участки поля представлены одним и тем же объектом и сравниваются по
+    идентичности.
+    """
+
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population")
+
+    nw: "Node"
+    ne: "Node"
+    sw: "Node"
+    se: "Node"
+
+    def __init__(
+        self,
+        nw: tp.Optional["Node"],
+        ne: tp.Optional["Node"],
+        sw: tp.Optional["Node"],
+        se: tp.Optional["Node"],
+        level: int,
+        population: int,
+    ) -> None:
+        # У листьев (level == 0) детей нет
+        self.nw = nw  # type: ignore[assignment]
+        self.ne = ne  # type: ignore[assignment]
+        self.sw = sw  # type: ignore[assignment]
+        self.se = se  # type: ignore[assignment]
+        self.level = level
+        self.population = population
+
+    def __repr__(self) -> str:
+        return f"Node(level={self.level}, population={self.population})"
+
+
+class Board(tp.NamedTuple):
+    """Корень квадродерева и координаты его левого верхнего угла."""
+
+    node: Node
+    top: int
+    left: int
+
+
+class HashLife:
+    """
+    Алгоритм HashLife: квадродерево из канонических узлов и кэш результатов.
+
+    `successor(node, j)` возвращает центральную половину узла через 2^j
+    поколений; результаты запоминаются в LRU-кэше не больше чем на
+    `max_results` записей. Если таблица канонических узлов разрастается
+    больше `max_nodes`, она перестраивается только из живых узлов, а кэш
+    результатов сбрасывается. Правило `rule` применяется в `life_4x4`;
+    правила с B0 не поддерживаются, потому что пустой узел должен
+    оставаться пустым.
+    """
+
+    def __init__(self, max_nodes: int = 1 << 20, max_results: int = 1 << 20, rule: Rule = CONWAY) -> None:
+        if rule.table[0][0]:
+            raise ValueError(f"HashLife не поддерживает правило {rule.name}")
+        self.rule = rule
+        self.max_nodes = max_nodes
+        self.max_results = max_results
+        self.off = Node(None, None, None, None, 0, 0)
+        self.on = Node(None, None, None, None, 0, 1)
+        self.nodes: tp.Dict[tp.Tuple[Node, Node, Node, Node], Node] = {}
+        self.results: tp.OrderedDict[tp.Tuple[Node, int], Node] = collections.OrderedDict()
+        self.empties = [self.off]
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        key = (nw, ne, sw, se)
+        node = self.nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw, ne, sw, se, nw.level + 1, population)
+            self.nodes[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        while len(self.empties) <= level:
+            e = self.empties[-1]
+            self.empties.append(self.join(e, e, e, e))
+        return self.empties[level]
+
+    def centre(self, node: Node) -> Node:
+        """Поместить узел в центр пустого узла на уровень выше."""
+        e = self.empty(node.level - 1)
+        return self.join(
+            self.join(e, e, e, node.nw),
+            self.join(e, e, node.ne, e),
+            self.join(e, node.sw, e, e),
+            self.join(node.se, e, e, e),
+        )
+
+    def inner(self, node: Node) -> Node:
+        """Центральная половина узла."""
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    @staticmethod
+    def is_padded(node: Node) -> bool:
+        """Все живые клетки узла лежат в его центральной половине."""
+        return (
+            node.level >= 3
+            and node.nw.population == node.nw.se.se.population
+            and node.ne.population == node.ne.sw.sw.population
+            and node.sw.population == node.sw.ne.ne.population
+            and node.se.population == node.se.nw.nw.population
+        )
+
+    def life_4x4(self, node: Node) -> Node:
+        """Центральные 2х2 клетки узла уровня 2 через одно поколение."""
+        quads = (node.nw, node.ne, node.sw, node.se)
+        cells = [[0] * 4 for _ in range(4)]
+        for q, quad in enumerate(quads):
+            top, left = (q // 2) * 2, (q % 2) * 2
+            for c, leaf in enumerate((quad.nw, quad.ne, quad.sw, quad.se)):
+                cells[top + c // 2][left + c % 2] = leaf.population
+        table = self.rule.table
+        result = []
+        for i, j in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            alive = sum(cells[i + di][j + dj] for di in (-1, 0, 1) for dj in (-1, 0, 1)) - cells[i][j]
+            result.append(self.on if table[cells[i][j]][alive] else self.off)
+        return self.join(*result)
+
+    def successor(self, node: Node, j: int) -> Node:
+        """
+        Центральная половина узла уровня k через 2^j поколений, j <= k - 2.
+        """
+        if node.population == 0:
+            return node.nw
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+            return result
+
+        if node.level == 2:
+            result = self.life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join, successor = self.join, self.successor
+            c1 = successor(nw, j)
+            c2 = successor(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = successor(ne, j)
+            c4 = successor(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = successor(join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = successor(join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = successor(sw, j)
+            c8 = successor(join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = successor(se, j)
+            if j < node.level - 2:
+                # Нужное число поколений уже пройдено, осталось собрать центр
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw),
+                    join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw),
+                    join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                result = join(
+                    successor(join(c1, c2, c4, c5), j),
+                    successor(join(c2, c3, c5, c6), j),
+                    successor(join(c4, c5, c7, c8), j),
+                    successor(join(c5, c6, c8, c9), j),
+                )
+
+        self.results[key] = result
+        if len(self.results) > self.max_results:
+            self.results.popitem(last=False)
+        return result
+
+    def expand(self, board: Board) -> Board:
+        """Расширить поле на уровень, оставив его содержимое в центре."""
+        half = 1 << (board.node.level - 1)
+        return Board(self.centre(board.node), board.top - half, board.left - half)
+
+    def crop(self, board: Board) -> Board:
+        """Убрать пустые края поля, пока это возможно."""
+        while self.is_padded(board.node):
+            quarter = 1 << (board.node.level - 2)
+            board = Board(self.inner(board.node), board.top + quarter, board.left + quarter)
+        return board
+
+    def advance(self, board: Board, n: int) -> Board:
+        """
+        Продвинуть поле на `n` поколений, разложив `n` на степени двойки:
+        каждый шаг 2^j выполняется одним вызовом `successor`.
+        """
+        while n > 0:
+            j = n.bit_length() - 1
+            while board.node.level < j + 2 or not self.is_padded(board.node):
+                board = self.expand(board)
+            board = self.expand(board)
+            quarter = 1 << (board.node.level - 2)
+            board = Board(self.successor(board.node, j), board.top + quarter, board.left + quarter)
+            n -= 1 << j
+        board = self.crop(board)
+        if len(self.nodes) > self.max_nodes:
+            self.collect(board.node)
+        return board
+
+    def collect(self, *roots: Node) -> None:
+        """
+        Перестроить таблицу канонических узлов, оставив в ней только узлы,
+        достижимые из `roots`, и сбросить кэш результатов.
+        """
+        nodes: tp.Dict[tp.Tuple[Node, Node, Node, Node], Node] = {}
+        stack = list(roots) + self.empties[1:]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)  # type: ignore[assignment]
+            if key in nodes:
+                continue
+            nodes[key] = node  # type: ignore[index]
+            stack.extend(key)  # type: ignore[arg-type]
+        self.nodes = nodes
+        self.results.clear()
+
+    def from_cells(self, cells: tp.Iterable[Cell]) -> Board:
+        cells = list(cells)
+        if not cells:
+            return Board(self.empty(3), 0, 0)
+        top = min(i for i, _ in cells)
+        left = min(j for _, j in cells)
+        extent = max(max(i - top, j - left) for i, j in cells) + 1
+        level = max(3, (extent - 1).bit_length())
+        return Board(self.build(level, [(i - top, j - left) for i, j in cells]), top, left)
+
+    def build(self, level: int, cells: tp.List[Cell]) -> Node:
+        """Построить узел уровня `level` из клеток с координатами внутри него."""
+        if not cells:
+            return self.empty(level)
+        if level == 0:
+            return self.on
+        half = 1 << (level - 1)
+        quads: tp.List[tp.List[Cell]] = [[], [], [], []]
+        for i, j in cells:
+            quads[(i >= half) * 2 + (j >= half)].append((i % half, j % half))
+        return self.join(*(self.build(level - 1, quad) for quad in quads))
+
+    def cells(
+        self,
+        board: Board,
+        top: int = -(1 << 62),
+        left: int = -(1 << 62),
+        bottom: int = 1 << 62,
+        right: int = 1 << 62,
+    ) -> tp.Iterator[Cell]:
+        """Перечислить живые клетки поля внутри прямоугольника [top, bottom) х [left, right)."""
+        stack = [board]
+        while stack:
+            node, i, j = stack.pop()
+            size = 1 << node.level
+            if node.population == 0 or i >= bottom or j >= right or i + size <= top or j + size <= left:
+                continue
+            if node.level == 0:
+                yield i, j
+                continue
+            half = size >> 1
+            stack.append(Board(node.nw, i, j))  # type: ignore[arg-type]
+            stack.append(Board(node.ne, i, j + half))  # type: ignore[arg-type]
+            stack.append(Board(node.sw, i + half, j))  # type: ignore[arg-type]
+            stack.append(Board(node.se, i + half, j + half))  # type: ignore[arg-type]
+
+    def get(self, board: Board, cell: Cell) -> int:
+        row, col = cell
+        node, i, j = board
+        if not (i <= row < i + (1 << node.level) and j <= col < j + (1 << node.level)):
+            return 0
+        while node.level > 0 and node.population:
+            half = 1 << (node.level - 1)
+            south, east = row >= i + half, col >= j + half
+            node = (node.se if east else node.sw) if south else (node.ne if east else node.nw)  # type: ignore
+            i, j = i + half * south, j + half * east
+        return node.population
+
+
+class HashLifeGameOfLife(GameOfLife):
+    """
+    Игра «Жизнь» на алгоритме HashLife.
+
+    `advance(n)` проходит 2^k поколений за один вызов `successor`, поэтому
+    миллионы поколений периодических и повторяющихся узоров считаются за
+    доли секунды. Поле бесконечно, как у `SparseGameOfLife(bounded=False)`;
+    `size` задает окно, которое заполняется случайно и сохраняется в файл.
+    Поэтому границы поля нет, и тор не поддерживается.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        max_nodes: int = 1 << 20,
+        max_results: int = 1 << 20,
+        **kwargs: tp.Any,
+    ) -> None:
+        if kwargs.get("boundary", "bounded") != "bounded":
+            raise ValueError(f"{type(self).__name__} считает только неограниченное поле")
+        rule = kwargs.get("rule", CONWAY)
+        self.universe = HashLife(
+            max_nodes=max_nodes, max_results=max_results, rule=rule if isinstance(rule, Rule) else parse_rule(rule)
+        )
+        super().__init__(size, randomize=randomize, max_generations=max_generations, **kwargs)
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> Board:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Union[Grid, tp.AbstractSet[Cell], Board]) -> None:
+        self._curr_generation = self.to_board(grid)
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> Board:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid: tp.Union[Grid, tp.AbstractSet[Cell], Board]) -> None:
+        self._prev_generation = self.to_board(grid)
+
+    def to_board(self, grid: tp.Union[Grid, tp.AbstractSet[Cell], Board]) -> Board:
+        if isinstance(grid, Board):
+            return grid
+        if isinstance(grid, (set, frozenset)):
+            return self.universe.from_cells(grid)
+        return self.universe.from_cells((i, j) for i, row in enumerate(grid) for j, cell in enumerate(row) if cell)
+
+    def create_grid(self, randomize: bool = False) -> Board:  # type: ignore[override]
+        if not randomize:
+            return self.universe.from_cells(())
+        return self.universe.from_cells(
+            [(i, j) for i in range(self.rows) for j in range(self.cols) if random.randint(0, 1)]
+        )
+
+    def live_cells(self, generation: tp.Any = None) -> tp.Set[Cell]:
+        return set(self.universe.cells(self.curr_generation if generation is None else generation))
+
+    def changed_cells(self) -> tp.Set[Cell]:
+        return self.live_cells(self.curr_generation) ^ self.live_cells(self.prev_generation)
+
+    def get_neighbours(self, cell: Cell) -> Cells:
+        row, col = cell
+        return [
+            self.universe.get(self.curr_generation, (row + di, col + dj))
+            for di in (-1, 0, 1)
+            for dj in (-1, 0, 1)
+            if di or dj
+        ]
+
+    def get_next_generation(self) -> Board:  # type: ignore[override]
+        return self.universe.advance(self.curr_generation, 1)
+
+    def advance(self, n: int) -> None:
+        self.record_history()
+        self.prev_generation = self.curr_generation
+        self.curr_generation = self.universe.advance(self.curr_generation, n)
+        self.generations += n
+        self.update_cycle()
+        self.record_history()
+
+    def generation_view(self) -> Board:
+        # Узлы канонические и не меняются, поэтому поле можно отдать как есть
+        return self.curr_generation
+
+    def generation_changed(self) -> bool:
+        curr, prev = self.curr_generation, self.prev_generation
+        if curr == prev:
+            return False
+        if curr.node.population != prev.node.population:
+            return True
+        return set(self.universe.cells(curr)) != set(self.universe.cells(prev))
+
+    def compute_changes(self) -> Changes:
+        curr = self.live_cells()
+        prev = self.live_cells(self.prev_generation)
+        return Changes(cell_array(curr - prev), cell_array(prev - curr))
+
+    def compute_stats(self, previous: tp.Optional[Stats] = None) -> Stats:
+        curr = self.live_cells()
+        prev = self.live_cells(self.prev_generation)
+        births = len(curr - prev)
+        deaths = len(prev - curr)
+        if not curr:
+            return Stats(0, births, deaths, None)
+        rows = [i for i, _ in curr]
+        cols = [j for _, j in curr]
+        return Stats(len(curr), births, deaths, (min(rows), min(cols), max(rows) + 1, max(cols) + 1))
+
+    def to_grid(
+        self, top: int = 0, left: int = 0, rows: tp.Optional[int] = None, cols: tp.Optional[int] = None
+    ) -> Grid:
+        rows = self.rows - top if rows is None else rows
+        cols = self.cols - left if cols is None else cols
+        grid = [[0] * cols for _ in range(rows)]
+        for i, j in self.universe.cells(self.curr_generation, top, left, top + rows, left + cols):
+            grid[i - top][j - left] = 1
+        return grid
+
+    def from_rows(self, lines: tp.Iterable[life_io.RowCells]) -> Board:  # type: ignore[override]
+        return self.universe.from_cells((i, j) for i, cols in enumerate(lines) for j in cols)
+
+    def row_cells(self) -> tp.Iterator[life_io.RowCells]:
+        by_row = collections.defaultdict(list)
+        for i, j in self.universe.cells(self.curr_generation, 0, 0, self.rows, self.cols):
+            by_row[i].append(j)
+        for i in range(self.rows):
+            yield sorted(by_row.get(i, ()))
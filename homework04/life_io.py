@@ -0,0 +1,245 @@
+import mmap
+import pathlib
+import re
+import typing as tp
+
+# Живые клетки одной строки: отсортированные номера столбцов
+RowCells = tp.Sequence[int]
+
+RLE_HEADER = re.compile(rb"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*([^\s,]+))?", re.IGNORECASE)
+RLE_TOKEN = re.compile(rb"(\d*)([^\d\s])")
+LINE_WIDTH = 70
+
+
+class Pattern(tp.NamedTuple):
+    """
+    Узор, прочитанный из файла: размер, правило (если указано в файле) и
+    итератор по строкам. Строки читаются из файла по мере обхода итератора.
+    """
+
+    rows: int
+    cols: int
+    rule: tp.Optional[str]
+    lines: tp.Iterator[RowCells]
+
+
+def pattern_format(filename: tp.Union[str, pathlib.Path]) -> str:
+    """Формат файла по расширению: `rle`, `cells` или `text` (0 и 1)."""
+    suffix = pathlib.Path(filename).suffix.lower()
+    return {".rle": "rle", ".cells": "cells"}.get(suffix, "text")
+
+
+def _open_map(filename: tp.Union[str, pathlib.Path]) -> tp.Tuple[tp.BinaryIO, tp.Union[mmap.mmap, bytes]]:
+    f = pathlib.Path(filename).open("rb")
+    try:
+        return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Пустой файл нельзя отобразить в память
+        return f, b""
+
+
+def _lines(data: tp.Union[mmap.mmap, bytes]) -> tp.Iterator[bytes]:
+    start = 0
+    size = len(data)
+    while start < size:
+        end = data.find(b"\n", start)
+        end = size if end == -1 else end
+        yield data[start:end].rstrip(b"\r")
+        start = end + 1
+
+
+def read_pattern(filename: tp.Union[str, pathlib.Path]) -> Pattern:
+    """
+    Прочитать узор в формате, определенном по расширению файла.
+
+    Файл отображается в память (`mmap`), поэтому строки поля разбираются
+    по одной и текст целиком в памяти не держится.
+    """
+    fmt = pattern_format(filename)
+    if fmt == "rle":
+        return read_rle(filename)
+    if fmt == "cells":
+        return read_cells(filename)
+    return read_text(filename)
+
+
+def read_text(filename: tp.Union[str, pathlib.Path]) -> Pattern:
+    """Прочитать поле, где каждая клетка записана символом `0` или `1`."""
+    f, data = _open_map(filename)
+    rows = cols = 0
+    for line in _lines(data):
+        if line.strip():
+            rows += 1
+            cols = max(cols, len(line.strip()))
+
+    def lines() -> tp.Iterator[RowCells]:
+        with f:
+            for line in _lines(data):
+                line = line.strip()
+                if line:
+                    yield [m.start() for m in re.finditer(b"1", line)]
+
+    return Pattern(rows, cols, None, lines())
+
+
+def read_cells(filename: tp.Union[str, pathlib.Path]) -> Pattern:
+    """
+    Прочитать узор в формате plaintext (`.cells`): `!` - комментарий,
+    `.` - мертвая клетка, `O` - живая.
+    """
+    f, data = _open_map(filename)
+    rows = cols = 0
+    for line in _lines(data):
+        if not line.startswith(b"!"):
+            rows += 1
+            cols = max(cols, len(line.rstrip()))
+
+    def lines() -> tp.Iterator[RowCells]:
+        with f:
+            for line in _lines(data):
+                if not line.startswith(b"!"):
+                    yield [m.start() for m in re.finditer(rb"[O*]", line)]
+
+    return Pattern(rows, cols, None, lines())
+
+
+def read_rle(filename: tp.Union[str, pathlib.Path]) -> Pattern:
+    """
+    Прочитать узор в формате RLE: `b` - мертвые клетки, `o` - живые,
+    `$` - конец строки, `!` - конец узора; перед символом может стоять
+    число повторений.
+    """
+    f, data = _open_map(filename)
+    lines = _lines(data)
+    rows = cols = 0
+    rule = None
+    for line in lines:
+        if line.startswith(b"#") or not line.strip():
+            continue
+        header = RLE_HEADER.match(line.strip())
+        if header is None:
+            raise ValueError(f"{filename}: нет заголовка RLE")
+        cols, rows = int(header.group(1)), int(header.group(2))
+        rule = header.group(3).decode() if header.group(3) else None
+        break
+
+    def body() -> tp.Iterator[RowCells]:
+        row: tp.List[int] = []
+        col = emitted = 0
+        with f:
+            for n, tag in _rle_tokens(lines):
+                if tag == b"$":
+                    # n$ завершает текущую строку и пропускает n - 1 пустых
+                    for _ in range(min(n, rows - emitted)):
+                        yield row
+                        row = []
+                        emitted += 1
+                    col = 0
+                elif tag == b"b":
+                    col += n
+                else:
+                    row.extend(range(col, col + n))
+                    col += n
+        for _ in range(rows - emitted):
+            yield row
+            row = []
+
+    return Pattern(rows, cols, rule, body())
+
+
+def _rle_tokens(lines: tp.Iterable[bytes]) -> tp.Iterator[tp.Tuple[int, bytes]]:
+    """Разобрать тело RLE на пары (число повторений, символ) до `!`."""
+    carry = b""
+    for line in lines:
+        text = carry + line.strip()
+        # Число повторений может продолжиться на следующей строке
+        tail = re.search(rb"\d+$", text)
+        carry = tail.group(0) if tail else b""
+        for count, tag in RLE_TOKEN.findall(text[: len(text) - len(carry)]):
+            if tag == b"!":
+                return
+            yield int(count) if count else 1, tag
+
+
+def write_pattern(
+    filename: tp.Union[str, pathlib.Path],
+    size: tp.Tuple[int, int],
+    lines: tp.Iterable[RowCells],
+    rule: str = "B3/S23",
+) -> None:
+    """Записать поле построчно в формате, определенном по расширению файла."""
+    fmt = pattern_format(filename)
+    with pathlib.Path(filename).open("w") as f:
+        if fmt == "rle":
+            write_rle(f, size, lines, rule)
+        elif fmt == "cells":
+            write_cells(f, size, lines)
+        else:
+            write_text(f, size, lines)
+
+
+def write_text(f: tp.TextIO, size: tp.Tuple[int, int], lines: tp.Iterable[RowCells]) -> None:
+    _, cols = size
+    for row in lines:
+        line = ["0"] * cols
+        for j in row:
+            line[j] = "1"
+        f.write("".join(line) + "\n")
+
+
+def write_cells(f: tp.TextIO, size: tp.Tuple[int, int], lines: tp.Iterable[RowCells]) -> None:
+    # Размер поля в `.cells` не хранится, поэтому строки не укорачиваются:
+    # иначе при чтении поле стало бы уже
+    _, cols = size
+    for row in lines:
+        line = ["."] * cols
+        for j in row:
+            line[j] = "O"
+        f.write("".join(line) + "\n")
+
+
+def write_rle(f: tp.TextIO, size: tp.Tuple[int, int], lines: tp.Iterable[RowCells], rule: str = "B3/S23") -> None:
+    """
+    Записать поле в формате RLE, не собирая текст целиком: пустые строки
+    сворачиваются в `n$`, мертвые клетки в конце строки не пишутся.
+    """
+    rows, cols = size
+    f.write(f"x = {cols}, y = {rows}, rule = {rule}\n")
+    width = 0
+
+    def emit(count: int, tag: str) -> None:
+        nonlocal width
+        token = (str(count) if count > 1 else "") + tag
+        if width + len(token) > LINE_WIDTH:
+            f.write("\n")
+            width = 0
+        f.write(token)
+        width += len(token)
+
+    blank = 0
+    started = False
+    for row in lines:
+        if not row:
+            blank += 1
+            continue
+        if started or blank:
+            emit(blank + started, "$")
+        started, blank = True, 0
+        col = 0
+        for start, length in _runs(row):
+            if start > col:
+                emit(start - col, "b")
+            emit(length, "o")
+            col = start + length
+    f.write("!\n")
+
+
+def _runs(row: RowCells) -> tp.Iterator[tp.Tuple[int, int]]:
+    """Разбить отсортированные номера столбцов на отрезки подряд идущих."""
+    start = prev = row[0]
+    for j in row[1:]:
+        if j != prev + 1:
+            yield start, prev + 1 - start
+            start = j
+        prev = j
+    yield start, prev + 1 - start
@@ -0,0 +1,374 @@
+import argparse
+import functools
+import pathlib
+import tempfile
+import time
+import tracemalloc
+import typing as tp
+
+import life_checkpoint
+import life_io
+import numpy as np
+from life import Cell, Cells, Changes, GameOfLife, Grid, Rule, Stats
+from life_numpy import NumpyGameOfLife, cell_keys, random_cells
+from life_packed import rule_expression
+
+# Сколько байт упакованного поля обрабатывать за раз: полоса строк такого
+# размера и ее временные массивы - все, что шаг держит в памяти
+STRIPE_BYTES = 1 << 20
+# Число единичных битов каждого байта
+BIT_COUNTS = np.array([bin(n).count("1") for n in range(256)], dtype=np.uint8)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_expression(rule: Rule) -> tp.Tuple[tp.Any, bool]:
+    """Выражение правила из `life_packed.rule_expression`, скомпилированное для `eval`."""
+    expression, full = rule_expression(rule)
+    return compile(expression, f"<rule {rule.name}>", "eval"), full
+
+
+def tail_mask(cols: int) -> int:
+    """Маска столбцов поля в последнем байте строки."""
+    return (0xFF << (8 - cols % 8)) & 0xFF if cols % 8 else 0xFF
+
+
+def next_stripe(window: np.ndarray, rule: Rule, cols: int, torus: bool = False) -> np.ndarray:
+    """
+    Следующее поколение строк `window[1:-1]` упакованного поля.
+
+    `window` - полоса строк вместе с соседней строкой сверху и снизу
+    (нулевой за краем ограниченного поля, с другого края - на торе). Клетки упакованы по 8 в байт, как в
+    `life_checkpoint.pack_rows`: старший бит байта - левый столбец. Соседи
+    складываются тем же битовым счетчиком, что и в `life_packed`, только
+    над массивами байт, а не над целыми числами. С `torus=True` левый
+    сосед первого столбца - последний столбец, и наоборот.
+    """
+    code, full = compile_expression(rule)
+    here = window[1:-1]
+    neighbours = []
+    for row in (window[:-2], here, window[2:]):
+        # Сосед слева: сдвиг вправо с битом из предыдущего байта, и наоборот
+        west = row >> 1
+        west[:, 1:] |= row[:, :-1] << 7
+        east = row << 1
+        east[:, :-1] |= row[:, 1:] >> 7
+        if torus:
+            shift = 7 - (cols - 1) % 8
+            west[:, 0] |= ((row[:, -1] >> shift) & 1) << 7
+            east[:, -1] |= (row[:, 0] >> 7) << shift
+        neighbours += [west, east] if row is here else [west, row, east]
+    ones = np.zeros_like(here)
+    twos = np.zeros_like(here)
+    fours = np.zeros_like(here)
+    eights = np.zeros_like(here)
+    for x in neighbours:
+        carry = ones & x
+        ones ^= x
+        if full:
+            carry2 = twos & carry
+            twos ^= carry
+            eights |= fours & carry2
+            fours ^= carry2
+        else:
+            fours |= twos & carry
+            twos ^= carry
+    namespace = {"ones": ones, "twos": twos, "fours": fours, "eights": eights, "here": here}
+    result = np.zeros_like(here) | eval(code, {}, namespace)
+    result[:, -1] &= tail_mask(cols)
+    return result
+
+
+def stripe_cells(start: int, stripe: np.ndarray, cols: int) -> np.ndarray:
+    """Координаты единичных битов полосы, первая строка которой - строка `start` поля."""
+    cells = np.argwhere(np.unpackbits(stripe, axis=1, count=cols))
+    cells[:, 0] += start
+    return cells
+
+
+class MappedGameOfLife(GameOfLife):
+    """
+    Игра «Жизнь» на поле, которое лежит в файлах на диске и не читается в
+    память целиком.
+
+    Поле упаковано по 8 клеток в байт (как кадры `life_checkpoint`) и
+    хранится в трех файлах в каталоге `directory` (по умолчанию во
+    временном), отображенных в память через `np.memmap`. Шаг читает
+    текущее поколение полосами по `stripe` строк вместе с соседней строкой
+    сверху и снизу и пишет следующее поколение в свободный файл, попутно
+    считая статистику. Поэтому памяти нужно порядка `STRIPE_BYTES` на
+    временный массив, сколько бы ни было клеток.
+
+    `curr_generation` и `prev_generation` - упакованные массивы в файлах.
+    Присвоенный им `Grid` (или массив клеток) упаковывается в свободный
+    файл. Узоры читаются и записываются построчно, так что `from_file`,
+    `save`, `save_history` и `load_history` работают как у других движков.
+    Файлы нужно закрыть вызовом `close()` или через `with`.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        directory: tp.Optional[tp.Union[str, pathlib.Path]] = None,
+        stripe: tp.Optional[int] = None,
+        **kwargs: tp.Any,
+    ) -> None:
+        rows, cols = size
+        width = (cols + 7) // 8
+        self.stripe = stripe or max(1, STRIPE_BYTES // max(width, 1))
+        self._tmp = tempfile.TemporaryDirectory(prefix="life-") if directory is None else None
+        self.directory = pathlib.Path(self._tmp.name if self._tmp is not None else tp.cast(str, directory))
+        self._buffers = [
+            np.memmap(self.directory / f"generation{k}.bits", dtype=np.uint8, mode="w+", shape=(rows, width))
+            for k in range(3)
+        ]
+        self._curr_generation: tp.Any = None
+        self._prev_generation: tp.Any = None
+        self._stats_generation = self._changes_generation = self._hashed_generation = None
+        self._stats_previous_generation = self._history_generation = None
+        # Статистика, посчитанная при шаге: (предыдущее поколение, новое, статистика)
+        self._step_stats: tp.Optional[tp.Tuple[np.ndarray, np.ndarray, Stats]] = None
+        super().__init__(size, randomize=randomize, max_generations=max_generations, **kwargs)
+
+    def _free_buffer(self) -> np.ndarray:
+        """
+        Файл, в котором нет ни текущего, ни предыдущего поколения. Старое
+        содержимое будет перезаписано, поэтому кэши по нему сбрасываются.
+        """
+        buffer = next(b for b in self._buffers if b is not self._curr_generation and b is not self._prev_generation)
+        for name in (
+            "_stats_generation",
+            "_stats_previous_generation",
+            "_changes_generation",
+            "_hashed_generation",
+            "_history_generation",
+        ):
+            if getattr(self, name) is buffer:
+                setattr(self, name, None)
+        if self._step_stats is not None and any(board is buffer for board in self._step_stats[:2]):
+            self._step_stats = None
+        return buffer
+
+    def _is_packed(self, grid: tp.Union[Grid, np.ndarray]) -> bool:
+        """
+        Упаковано ли поле по битам, как `pack_frame`. При одном столбце
+        упакованный кадр отличается от клеток только значениями: живая
+        клетка - 128, а не 1.
+        """
+        width = (self.cols + 7) // 8
+        if not isinstance(grid, np.ndarray) or grid.shape != (self.rows, width):
+            return False
+        return width != self.cols or bool((grid > 1).any())
+
+    def _claim(self, grid: tp.Union[Grid, np.ndarray]) -> np.ndarray:
+        """Положить поле (клетки или упакованный кадр) в свободный файл."""
+        if any(grid is buffer for buffer in self._buffers):
+            return tp.cast(np.ndarray, grid)
+        if self._is_packed(grid):
+            buffer = self._free_buffer()
+            buffer[:] = grid
+            return buffer
+        buffer = self._free_buffer()
+        cells = np.asarray(grid, dtype=np.uint8)
+        for start in range(0, self.rows, self.stripe):
+            buffer[start : start + self.stripe] = np.packbits(cells[start : start + self.stripe], axis=1)
+        return buffer
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> np.ndarray:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Union[Grid, np.ndarray]) -> None:
+        self._curr_generation = self._claim(grid)
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> np.ndarray:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid: tp.Union[Grid, np.ndarray]) -> None:
+        self._prev_generation = self._claim(grid)
+
+    def stripes(self, board: np.ndarray) -> tp.Iterator[tp.Tuple[int, np.ndarray]]:
+        """Перечислить полосы поля по `stripe` строк: (номер первой строки, полоса)."""
+        for start in range(0, self.rows, self.stripe):
+            yield start, board[start : start + self.stripe]
+
+    def create_grid(self, randomize: bool = False) -> np.ndarray:  # type: ignore[override]
+        buffer = self._free_buffer()
+        for start, stripe in self.stripes(buffer):
+            if randomize:
+                stripe[:] = np.packbits(random_cells(len(stripe) * self.cols).reshape(-1, self.cols), axis=1)
+            else:
+                stripe[:] = 0
+        return buffer
+
+    def get_neighbours(self, cell: Cell) -> Cells:
+        if self.torus:
+            board = self.curr_generation
+            return [int(board[i, j // 8]) >> (7 - j % 8) & 1 for i, j in self.wrapped_neighbours(cell)]
+        row, col = cell
+        top, left = max(row - 1, 0), max(col - 1, 0)
+        window = [value for line in self.to_grid(top, left, row + 2 - top, col + 2 - left) for value in line]
+        del window[(row - top) * (min(col + 2, self.cols) - left) + (col - left)]
+        return window
+
+    def _step_stripes(self, src: np.ndarray, dst: np.ndarray) -> tp.Iterator[tp.Tuple[int, np.ndarray, np.ndarray]]:
+        window = np.zeros((self.stripe + 2, src.shape[1]), dtype=np.uint8)
+        for start, stripe in self.stripes(src):
+            stop = start + len(stripe)
+            part = window[: len(stripe) + 2]
+            if self.torus:
+                part[0], part[-1] = src[(start - 1) % self.rows], src[stop % self.rows]
+            else:
+                part[0] = src[start - 1] if start > 0 else 0
+                part[-1] = src[stop] if stop < self.rows else 0
+            part[1:-1] = stripe
+            result = next_stripe(part, self.rule, self.cols, self.torus)
+            dst[start:stop] = result
+            yield start, part[1:-1], result
+
+    def get_next_generation(self) -> np.ndarray:  # type: ignore[override]
+        src, dst = self.curr_generation, self._free_buffer()
+        self._step_stats = src, dst, self._count(self._step_stripes(src, dst))
+        return dst
+
+    def _count(self, stripes: tp.Iterable[tp.Tuple[int, np.ndarray, np.ndarray]]) -> Stats:
+        """Статистика по парам полос (предыдущее поколение, текущее)."""
+        population = births = deaths = 0
+        first = last = -1
+        columns = np.zeros(max((self.cols + 7) // 8, 1), dtype=np.uint8)
+        for start, prev, curr in stripes:
+            population += int(BIT_COUNTS[curr].sum(dtype=np.int64))
+            births += int(BIT_COUNTS[curr & ~prev].sum(dtype=np.int64))
+            deaths += int(BIT_COUNTS[prev & ~curr].sum(dtype=np.int64))
+            alive = np.flatnonzero(curr.any(axis=1))
+            if len(alive):
+                first = start + int(alive[0]) if first < 0 else first
+                last = start + int(alive[-1])
+                columns |= np.bitwise_or.reduce(curr, axis=0)
+        if first < 0:
+            return Stats(0, births, deaths, None)
+        cols = np.flatnonzero(np.unpackbits(columns, count=self.cols))
+        return Stats(population, births, deaths, (first, int(cols[0]), last + 1, int(cols[-1]) + 1))
+
+    def compute_stats(self, previous: tp.Optional[Stats] = None) -> Stats:
+        """Статистика считается во время шага; заново - только если поле заменили снаружи."""
+        if self._step_stats is not None:
+            src, dst, stats = self._step_stats
+            if src is self.prev_generation and dst is self.curr_generation:
+                return stats
+        prev = self.prev_generation
+        return self._count(
+            (start, prev[start : start + len(curr)], curr) for start, curr in self.stripes(self.curr_generation)
+        )
+
+    def compute_changes(self) -> Changes:
+        born, died = [], []
+        for start, curr in self.stripes(self.curr_generation):
+            prev = self.prev_generation[start : start + len(curr)]
+            born.append(stripe_cells(start, curr & ~prev, self.cols))
+            died.append(stripe_cells(start, prev & ~curr, self.cols))
+        return Changes(np.concatenate(born), np.concatenate(died))
+
+    def live_cells(self, generation: tp.Any = None) -> np.ndarray:  # type: ignore[override]
+        board = self.curr_generation if generation is None else generation
+        return np.concatenate([stripe_cells(start, stripe, self.cols) for start, stripe in self.stripes(board)])
+
+    def changed_cells(self) -> np.ndarray:  # type: ignore[override]
+        return np.concatenate(self.changes)
+
+    def hash_cells(self, cells: tp.Iterable[Cell]) -> int:
+        keys = cell_keys(np.asarray(cells, dtype=np.int64).reshape(-1, 2))
+        return int(np.bitwise_xor.reduce(keys)) if len(keys) else 0
+
+    def to_grid(
+        self, top: int = 0, left: int = 0, rows: tp.Optional[int] = None, cols: tp.Optional[int] = None
+    ) -> Grid:
+        rows = self.rows - top if rows is None else rows
+        cols = self.cols - left if cols is None else cols
+        # Распаковываются только байты, в которые попадает окно
+        first = left // 8
+        block = self.curr_generation[top : top + rows, first : (left + cols + 7) // 8]
+        cells = np.unpackbits(block, axis=1)
+        return cells[:, left - 8 * first : left - 8 * first + min(cols, self.cols - left)].tolist()
+
+    def generation_view(self) -> np.ndarray:
+        # Файлы перезаписываются через шаг, поэтому вид - распакованная копия всего поля
+        view = np.unpackbits(self.curr_generation, axis=1, count=self.cols)
+        view.flags.writeable = False
+        return view
+
+    def from_rows(self, lines: tp.Iterable[life_io.RowCells]) -> np.ndarray:  # type: ignore[override]
+        buffer = self._free_buffer()
+        bits = np.zeros(self.cols, dtype=np.uint8)
+        done = 0
+        for i, cols in enumerate(lines):
+            bits[:] = 0
+            bits[list(cols)] = 1
+            buffer[i] = np.packbits(bits)
+            done = i + 1
+        buffer[done:] = 0
+        return buffer
+
+    def row_cells(self) -> tp.Iterator[life_io.RowCells]:
+        return life_checkpoint.unpack_rows(self.curr_generation, self.cols)
+
+    def pack_frame(self) -> np.ndarray:
+        return np.array(self.curr_generation)
+
+    def unpack_frame(self, frame: np.ndarray) -> np.ndarray:
+        # Поле движка и есть упакованный кадр; в файл он попадет при присваивании
+        return np.array(frame)
+
+    def close(self) -> None:
+        """Закрыть файлы поля и удалить временный каталог. После этого поле недоступно."""
+        if not self._buffers:
+            return
+        self._buffers = []
+        self._curr_generation = self._prev_generation = None
+        self._step_stats = None
+        self._stats_generation = self._changes_generation = self._hashed_generation = None
+        self._stats_previous_generation = self._history_generation = None
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+    def __enter__(self) -> "MappedGameOfLife":
+        return self
+
+    def __exit__(self, *exc_info: tp.Any) -> None:
+        self.close()
+
+
+def benchmark(size: int, generations: int) -> tp.Dict[str, tp.Dict[str, float]]:
+    """
+    Время шага и наибольший объем памяти, выделенной через `tracemalloc`,
+    для `NumpyGameOfLife` и `MappedGameOfLife` на случайном поле
+    `size` х `size`.
+    """
+    results = {}
+    engines: tp.Dict[str, tp.Type[GameOfLife]] = {"numpy": NumpyGameOfLife, "mapped": MappedGameOfLife}
+    for name, cls in engines.items():
+        rng = np.random.default_rng(0)
+        game = cls((size, size), randomize=False)
+        game.curr_generation = game.from_rows(np.flatnonzero(rng.random(size) < 0.3).tolist() for _ in range(size))
+        tracemalloc.start()
+        start = time.perf_counter()
+        game.advance(generations)
+        seconds = (time.perf_counter() - start) / generations
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        getattr(game, "close", lambda: None)()
+        results[name] = {"step": seconds, "peak_mb": peak / 2**20}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Поле в файлах на диске против поля в памяти")
+    parser.add_argument("--size", type=int, default=8192)
+    parser.add_argument("--generations", type=int, default=5)
+    args = parser.parse_args()
+    for name, values in benchmark(args.size, args.generations).items():
+        print(f"{name:>7}: {values['step']:.3f} с/шаг, пик памяти {values['peak_mb']:.1f} МБ")
@@ -0,0 +1,247 @@
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import pstats
+import time
+import tracemalloc
+import typing as tp
+
+from life import GameOfLife
+
+# Методы игры и интерфейса, время которых считается, и имена их фаз
+GAME_PHASES = {
+    "record_history": "history",
+    "get_next_generation": "next_generation",
+    "compute_stats": "stats",
+    "update_cycle": "cycle",
+    "save": "io",
+}
+UI_PHASES = {"draw_grid": "render"}
+# Время шага, не попавшее ни в одну фазу: присваивание поколений
+# (копирование или преобразование в сеттерах движка) и учет
+OTHER = "other"
+
+
+class Summary(tp.NamedTuple):
+    """
+    Итог за несколько поколений: сколько поколений и клеток посчитано,
+    время шагов и каждой фазы в секундах и сколько памяти в среднем и
+    самое большее выделялось за шаг (0, если выделения не считались).
+    """
+
+    generations: int
+    cells: int
+    seconds: float
+    phases: tp.Dict[str, float]
+    allocated: float
+    max_allocated: int
+
+    @property
+    def cells_per_second(self) -> float:
+        return self.cells / self.seconds if self.seconds else float("inf")
+
+    def to_json(self, **labels: tp.Any) -> str:
+        # Бесконечность не число JSON: без времени скорость неизвестна
+        speed = self.cells_per_second if self.seconds else None
+        data = {**labels, **self._asdict(), "cells_per_second": speed}
+        return json.dumps(data, sort_keys=True)
+
+
+class Metrics:
+    """
+    Замеры шагов игры и кадров интерфейса по фазам.
+
+    `attach` подменяет у объекта (игры или `UI`) методы из `GAME_PHASES`
+    и `UI_PHASES` обертками с таймером, а `detach` убирает их. Сама игра о
+    замерах ничего не знает, поэтому без `attach` они ничего не стоят.
+
+    Каждые `every` поколений (если задано) и при `flush` итог `Summary` за
+    эти поколения записывается строкой JSON (вместе с `labels`) в `output`
+    и передается в `callbacks`, после чего счетчики обнуляются. С
+    `allocations=True` для каждого шага через `tracemalloc` считается,
+    сколько памяти он выделил сверх уже занятой; это заметно замедляет шаги.
+    """
+
+    def __init__(
+        self,
+        every: int = 0,
+        output: tp.Optional[tp.TextIO] = None,
+        callbacks: tp.Iterable[tp.Callable[[Summary], None]] = (),
+        allocations: bool = False,
+        labels: tp.Optional[tp.Dict[str, tp.Any]] = None,
+    ) -> None:
+        self.every = every
+        self.output = output
+        self.callbacks = list(callbacks)
+        self.allocations = allocations
+        # Поля, которые добавляются к каждой строке JSON (например, имя прогона)
+        self.labels = labels or {}
+        self._attached: tp.List[tp.Tuple[tp.Any, tp.List[str]]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Обнулить счетчики текущего окна."""
+        self.generations = 0
+        self.cells = 0
+        self.seconds = 0.0
+        self.phases: tp.Dict[str, float] = {}
+        self._allocated = 0
+        self._max_allocated = 0
+        # Время фаз внутри текущего шага
+        self._in_step = 0.0
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def timed(self, phase: str, method: tp.Callable[..., tp.Any]) -> tp.Callable[..., tp.Any]:
+        """
+        Обернуть `method`, добавляя время каждого вызова к фазе `phase`.
+        Время вложенных фаз (например, статистики, которую спросил поиск
+        цикла) к ней не добавляется, поэтому фазы не пересекаются.
+        """
+
+        @functools.wraps(method)
+        def wrapper(*args: tp.Any, **kwargs: tp.Any) -> tp.Any:
+            outer = self._in_step
+            self._in_step = 0.0
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.add(phase, elapsed - self._in_step)
+                self._in_step = outer + elapsed
+
+        return wrapper
+
+    def measure(self, game: tp.Any, func: tp.Callable[[], None], generations: int = 1, rest: str = OTHER) -> None:
+        """
+        Выполнить `func`, которая продвигает игру на `generations` поколений:
+        время, число клеток и выделенная память. Время вне фаз относится
+        к фазе `rest`.
+        """
+        self._in_step = 0.0
+        if self.allocations:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if self.allocations:
+            allocated = max(tracemalloc.get_traced_memory()[1] - before, 0)
+            self._allocated += allocated
+            self._max_allocated = max(self._max_allocated, allocated)
+        self.add(rest, max(elapsed - self._in_step, 0.0))
+        self.seconds += elapsed
+        self.generations += generations
+        self.cells += game.rows * game.cols * generations
+        if self.every and self.generations >= self.every:
+            self.flush()
+
+    def timed_step(self, game: tp.Any, step: tp.Callable[[], None]) -> tp.Callable[[], None]:
+        """Обернуть `game.step`: время шага, число клеток и выделенная память."""
+
+        @functools.wraps(step)
+        def wrapper() -> None:
+            self.measure(game, step)
+
+        return wrapper
+
+    def timed_advance(self, game: tp.Any, advance: tp.Callable[[int], None]) -> tp.Callable[[int], None]:
+        """
+        Обернуть `game.advance` движка, который переходит сразу на `n`
+        поколений, не вызывая `step` (как HashLife). Время вне фаз - это
+        подсчет поколений. Итог за `every` поколений выдается после всего
+        `advance`, поэтому поколений в нем может быть больше.
+        """
+
+        @functools.wraps(advance)
+        def wrapper(n: int) -> None:
+            self.measure(game, lambda: advance(n), n, GAME_PHASES["get_next_generation"])
+
+        return wrapper
+
+    def attach(self, target: tp.Any) -> None:
+        """Начать замеры игры или интерфейса `target`."""
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        wrapped = []
+        for name, phase in {**GAME_PHASES, **UI_PHASES}.items():
+            method = getattr(target, name, None)
+            if method is not None:
+                setattr(target, name, self.timed(phase, method))
+                wrapped.append(name)
+        if hasattr(target, "get_next_generation"):
+            target.step = self.timed_step(target, target.step)
+            wrapped.append("step")
+            # `GameOfLife.advance` сам вызывает `step`, а переопределенный - нет
+            if type(target).advance is not GameOfLife.advance:
+                target.advance = self.timed_advance(target, target.advance)
+                wrapped.append("advance")
+        self._attached.append((target, wrapped))
+
+    def detach(self) -> None:
+        """Вернуть исходные методы всем объектам, к которым подключались замеры."""
+        for target, names in self._attached:
+            for name in names:
+                delattr(target, name)
+        self._attached = []
+        if self.allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def summary(self) -> Summary:
+        """Итог текущего окна."""
+        allocated = self._allocated / self.generations if self.generations else 0.0
+        return Summary(self.generations, self.cells, self.seconds, dict(self.phases), allocated, self._max_allocated)
+
+    def flush(self) -> tp.Optional[Summary]:
+        """Отдать итог текущего окна в `output` и `callbacks` и начать новое окно."""
+        if not self.generations and not self.phases:
+            return None
+        summary = self.summary()
+        if self.output is not None:
+            print(summary.to_json(**self.labels), file=self.output, flush=True)
+        for callback in self.callbacks:
+            callback(summary)
+        self.reset()
+        return summary
+
+    def __enter__(self) -> "Metrics":
+        return self
+
+    def __exit__(self, *exc_info: tp.Any) -> None:
+        self.flush()
+        self.detach()
+
+
+@contextlib.contextmanager
+def profiled(output: tp.TextIO, limit: int = 20, allocations: bool = True) -> tp.Iterator[cProfile.Profile]:
+    """
+    Выполнить блок под `cProfile` (и `tracemalloc`, если `allocations`) и
+    записать в `output` `limit` самых дорогих функций по общему времени и
+    мест, выделивших больше всего памяти.
+    """
+    profile = cProfile.Profile()
+    tracing = allocations and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        snapshot = tracemalloc.take_snapshot() if allocations else None
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(limit)
+        output.write(text.getvalue())
+        if snapshot is not None:
+            if tracing:
+                # Пик известен, только если его не сбрасывали замеры `Metrics`
+                print(f"пик памяти: {tracemalloc.get_traced_memory()[1] / 2**20:.1f} МБ", file=output)
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(False, cProfile.__file__)])
+            for stat in snapshot.statistics("lineno")[:limit]:
+                print(stat, file=output)
+        if tracing:
+            tracemalloc.stop()
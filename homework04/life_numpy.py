@@ -0,0 +1,289 @@
+import pathlib
+import random
+import typing as tp
+
+import life_io
+import numpy as np
+from life import (
+    CONWAY,
+    Cell,
+    Cells,
+    Changes,
+    GameOfLife,
+    Grid,
+    Rule,
+    Stats,
+    rule_groups,
+)
+
+# Сколько строк поля записывать в файл за один раз
+SAVE_BLOCK = 1024
+
+
+def read_text_array(filename: pathlib.Path) -> tp.Optional[np.ndarray]:
+    """
+    Прочитать поле из `0` и `1` через `np.memmap` без разбора по строкам.
+
+    Возвращает `None`, если строки файла разной длины (или концы строк
+    разные): такой файл нужно читать построчно.
+    """
+    data = np.memmap(filename, dtype=np.uint8, mode="r") if pathlib.Path(filename).stat().st_size else None
+    if data is None:
+        return None
+    newlines = np.flatnonzero(data[: 1 << 20] == ord("\n"))
+    if not len(newlines) or data.size % (newlines[0] + 1):
+        return None
+    cols = int(newlines[0])
+    lines = data.reshape(-1, cols + 1)
+    if not (lines[:, -1] == ord("\n")).all():
+        return None
+    # Строки с `\r\n`: `\r` не клетка, как и при чтении `life_io.read_text`
+    if cols and lines[0, cols - 1] == ord("\r"):
+        if not (lines[:, cols - 1] == ord("\r")).all():
+            return None
+        cols -= 1
+    return (lines[:, :cols] == ord("1")).astype(np.uint8)
+
+
+def random_cells(count: int) -> np.ndarray:
+    """
+    Получить `count` случайных клеток, совпадающих с последовательностью
+    `random.randint(0, 1)`, но без вызова функции для каждой клетки.
+
+    `randint(0, 1)` берет старшие два бита очередного 32-битного слова
+    генератора и отбрасывает значения больше единицы, поэтому слова можно
+    получить пачкой через `getrandbits`, а затем вернуть генератор в то
+    состояние, в котором он оказался бы после `count` вызовов `randint`.
+    """
+    if count <= 0:
+        return np.zeros(0, dtype=np.uint8)
+    state = random.getstate()
+    chunks = []
+    needed = count
+    while needed > 0:
+        size = max(2 * needed, 64)
+        words = np.frombuffer(random.getrandbits(32 * size).to_bytes(4 * size, "little"), dtype="<u4")
+        chunks.append(words >> 30)
+        needed -= int(np.count_nonzero(chunks[-1] < 2))
+    bits = np.concatenate(chunks)
+    accepted = np.flatnonzero(bits < 2)[:count]
+    random.setstate(state)
+    random.getrandbits(32 * (int(accepted[-1]) + 1))
+    return bits[accepted].astype(np.uint8)
+
+
+def cell_keys(cells: np.ndarray) -> np.ndarray:
+    """Векторный вариант `life.cell_key` для массива координат формы (N, 2)."""
+    rows = cells[:, 0].astype(np.int64) & 0xFFFFFFFF
+    cols = cells[:, 1].astype(np.int64) & 0xFFFFFFFF
+    z = ((rows.astype(np.uint64) << np.uint64(32)) | cols.astype(np.uint64)) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def count_neighbours(grid: np.ndarray, torus: bool = False) -> np.ndarray:
+    """
+    Посчитать число живых соседей для каждой клетки поля.
+
+    Поле дополняется рамкой из мертвых клеток, поэтому края не
+    заворачиваются, как и в `GameOfLife.get_neighbours`; с `torus=True`
+    рамка - противоположные края поля. Рамка строится той же единственной
+    копией поля, что и без тора. Поле - последние две оси массива, так что
+    можно передать сразу пачку полей.
+    """
+    widths = [(0, 0)] * (grid.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(grid, widths, mode="wrap" if torus else "constant")
+    rows, cols = grid.shape[-2:]
+    counts = np.zeros(grid.shape, dtype=np.uint8)
+    for di in range(3):
+        for dj in range(3):
+            if di != 1 or dj != 1:
+                counts += padded[..., di : di + rows, dj : dj + cols]
+    return counts
+
+
+def _any_of(counts: np.ndarray, numbers: tp.AbstractSet[int]) -> np.ndarray:
+    first, *rest = sorted(numbers)
+    result = counts == first
+    for n in rest:
+        result |= counts == n
+    return result
+
+
+def next_cells(grid: np.ndarray, rule: Rule = CONWAY, torus: bool = False) -> np.ndarray:
+    """
+    Получить следующее поколение для поля `grid`.
+
+    Правило применяется сравнениями по группам из `rule_groups`; для B3/S23
+    это ровно `(counts == 3) | (alive & (counts == 2))`. Выборка из таблицы
+    правила по массиву индексов оказалась вдвое медленнее таких сравнений.
+    """
+    counts = count_neighbours(grid, torus)
+    always, if_alive, if_dead = rule_groups(rule)
+    parts = []
+    if always:
+        parts.append(_any_of(counts, always))
+    if if_alive:
+        parts.append(grid.astype(bool) & _any_of(counts, if_alive))
+    if if_dead:
+        parts.append(~grid.astype(bool) & _any_of(counts, if_dead))
+    if not parts:
+        return np.zeros(grid.shape, dtype=np.uint8)
+    result = parts[0]
+    for part in parts[1:]:
+        result |= part
+    return result.view(np.uint8)
+
+
+class NumpyGameOfLife(GameOfLife):
+    """
+    Игра «Жизнь», в которой поле хранится в массиве NumPy, а число соседей
+    считается сразу для всего поля суммой восьми сдвинутых срезов.
+    """
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> np.ndarray:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Union[Grid, np.ndarray]) -> None:
+        self._curr_generation = np.asarray(grid, dtype=np.uint8)
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> np.ndarray:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid: tp.Union[Grid, np.ndarray]) -> None:
+        self._prev_generation = np.asarray(grid, dtype=np.uint8)
+
+    def create_grid(self, randomize: bool = False) -> np.ndarray:  # type: ignore[override]
+        if randomize:
+            return random_cells(self.rows * self.cols).reshape(self.rows, self.cols)
+        return np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+    def get_neighbours(self, cell: Cell) -> Cells:
+        if self.torus:
+            rows, cols = zip(*self.wrapped_neighbours(cell))
+            return self.curr_generation[rows, cols].tolist()
+        row, col = cell
+        top, left = max(row - 1, 0), max(col - 1, 0)
+        window = self.curr_generation[top : row + 2, left : col + 2].ravel().tolist()
+        del window[(row - top) * (min(col + 2, self.cols) - left) + (col - left)]
+        return window
+
+    def get_next_generation(self) -> np.ndarray:  # type: ignore[override]
+        return next_cells(self.curr_generation, self.rule, self.torus)
+
+    def to_grid(
+        self, top: int = 0, left: int = 0, rows: tp.Optional[int] = None, cols: tp.Optional[int] = None
+    ) -> Grid:
+        rows = self.rows - top if rows is None else rows
+        cols = self.cols - left if cols is None else cols
+        return self.curr_generation[top : top + rows, left : left + cols].tolist()
+
+    def compute_stats(self, previous: tp.Optional[Stats] = None) -> Stats:
+        """
+        Статистика по срезам массива: число изменившихся клеток по XOR
+        поколений, население и рамка по максимумам строк и столбцов.
+
+        Если известна статистика предыдущего поколения, считается только ее
+        рамка, расширенная на одну клетку: за ее пределами клетки были мертвы
+        и не могли ожить (кроме правил с B0). Разность поколений в этой
+        рамке сохраняется для `compute_changes`. На торе так можно, только
+        если рамка не касается краев поля.
+        """
+        curr, prev = self.curr_generation, self.prev_generation
+        top = left = 0
+        if previous is not None and not self.rule.table[0][0] and not self.wraps(previous.bbox):
+            if previous.bbox is None:
+                self._diff = (0, 0, np.zeros((0, 0), dtype=np.uint8))
+                return Stats(0, 0, 0, None)
+            top, left, bottom, right = previous.bbox
+            top, left = max(top - 1, 0), max(left - 1, 0)
+            curr, prev = curr[top : bottom + 1, left : right + 1], prev[top : bottom + 1, left : right + 1]
+            prev_population = previous.population
+        else:
+            prev_population = int(np.count_nonzero(prev))
+        diff = np.bitwise_xor(curr, prev)
+        self._diff = (top, left, diff)
+        changed = int(np.count_nonzero(diff))
+        population = int(np.count_nonzero(curr))
+        births = (changed + population - prev_population) // 2
+        if not population:
+            return Stats(0, births, changed - births, None)
+        rows = np.flatnonzero(curr.max(axis=1))
+        cols = np.flatnonzero(curr.max(axis=0))
+        bbox = (top + int(rows[0]), left + int(cols[0]), top + int(rows[-1]) + 1, left + int(cols[-1]) + 1)
+        return Stats(population, births, changed - births, bbox)
+
+    def wraps(self, bbox: tp.Optional[tp.Tuple[int, int, int, int]]) -> bool:
+        """Могут ли клетки в рамке `bbox` влиять на клетки за противоположным краем тора."""
+        if not self.torus or bbox is None:
+            return False
+        top, left, bottom, right = bbox
+        return top == 0 or left == 0 or bottom == self.rows or right == self.cols
+
+    def live_cells(self, generation: tp.Any = None) -> np.ndarray:  # type: ignore[override]
+        grid = self.curr_generation if generation is None else generation
+        return np.argwhere(grid)
+
+    def compute_changes(self) -> Changes:
+        # Разность поколений в рамке сохраняется при подсчете статистики
+        self.stats
+        top, left, diff = self._diff
+        cells = np.argwhere(diff)
+        cells += (top, left)
+        alive = self.curr_generation[cells[:, 0], cells[:, 1]].astype(bool)
+        return Changes(cells[alive], cells[~alive])
+
+    def changed_cells(self) -> np.ndarray:  # type: ignore[override]
+        return np.concatenate(self.changes)
+
+    def hash_cells(self, cells: tp.Iterable[Cell]) -> int:
+        keys = cell_keys(np.asarray(cells, dtype=np.int64).reshape(-1, 2))
+        return int(np.bitwise_xor.reduce(keys)) if len(keys) else 0
+
+    @classmethod
+    def from_file(cls, filename: pathlib.Path, **kwargs: tp.Any) -> "NumpyGameOfLife":
+        if life_io.pattern_format(filename) == "text":
+            grid = read_text_array(filename)
+            if grid is not None:
+                game = cls(grid.shape, randomize=False, **kwargs)
+                game.curr_generation = grid
+                return game
+        return tp.cast(NumpyGameOfLife, super().from_file(filename, **kwargs))
+
+    def from_rows(self, lines: tp.Iterable[life_io.RowCells]) -> np.ndarray:  # type: ignore[override]
+        grid = self.create_grid()
+        for i, cols in enumerate(lines):
+            grid[i, cols] = 1
+        return grid
+
+    def row_cells(self) -> tp.Iterator[life_io.RowCells]:
+        for row in self.curr_generation:
+            yield np.flatnonzero(row).tolist()
+
+    def generation_view(self) -> np.ndarray:
+        view = self.curr_generation.view()
+        view.flags.writeable = False
+        return view
+
+    def pack_frame(self) -> np.ndarray:
+        return np.packbits(self.curr_generation, axis=1)
+
+    def unpack_frame(self, frame: np.ndarray) -> np.ndarray:
+        return np.unpackbits(frame, axis=1, count=self.cols)
+
+    def save(self, filename: pathlib.Path) -> None:
+        if life_io.pattern_format(filename) != "text":
+            super().save(filename)
+            return
+        lines = np.empty((min(SAVE_BLOCK, self.rows), self.cols + 1), dtype=np.uint8)
+        lines[:, -1] = ord("\n")
+        with pathlib.Path(filename).open("wb") as f:
+            for start in range(0, self.rows, SAVE_BLOCK):
+                block = self.curr_generation[start : start + SAVE_BLOCK]
+                np.add(block, ord("0"), out=lines[: len(block), :-1])
+                f.write(lines[: len(block)].tobytes())
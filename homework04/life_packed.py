@@ -0,0 +1,346 @@
+import functools
+import random
+import typing as tp
+
+import life_io
+from life import (
+    CONWAY,
+    Cell,
+    Cells,
+    Changes,
+    GameOfLife,
+    Grid,
+    Rule,
+    Stats,
+    cell_array,
+    rule_groups,
+)
+
+NextRows = tp.Callable[[tp.List[int], int, int], tp.List[int]]
+
+# Шаблон функции шага: восемь сдвинутых строк складываются битовым
+# счетчиком, и по его разрядам вычисляется выражение правила
+NEXT_ROWS = """
+def next_rows(data, rows, mask):
+    last = mask.bit_length() - 1
+    new_data = []
+    for i in range(rows):
+{neighbour_rows}
+        here = data[i]
+        ones = twos = fours = eights = 0
+        for x in (
+            {west_above}, above, {east_above},
+            {west_here}, {east_here},
+            {west_below}, below, {east_below},
+        ):
+            carry = ones & x
+            ones ^= x
+{adder}
+        new_data.append(({expression}) & mask)
+    return new_data
+"""
+
+# Разряды до четверок; четверки насыщаются: «четыре соседа или больше»
+SATURATING_ADDER = """\
+            fours |= twos & carry
+            twos ^= carry"""
+
+FULL_ADDER = """\
+            carry2 = twos & carry
+            twos ^= carry
+            eights |= fours & carry2
+            fours ^= carry2"""
+
+# Соседние строки: за краем ограниченного поля - пустые, на торе - строки
+# противоположного края (отрицательный индекс списка, без копирования)
+BOUNDED_ROWS = """\
+        above = data[i - 1] if i > 0 else 0
+        below = data[i + 1] if i + 1 < rows else 0"""
+
+TORUS_ROWS = """\
+        above = data[i - 1]
+        below = data[i + 1 - rows]"""
+
+
+def pack_row(cells: tp.Iterable[int]) -> int:
+    """
+    Упаковать строку клеток в одно целое число: клетка в столбце `j`
+    хранится в `j`-м бите.
+    """
+    bits = "".join("1" if cell else "0" for cell in cells)
+    return int(bits[::-1], 2) if bits else 0
+
+
+def iter_bits(row: int) -> tp.Iterator[int]:
+    """Перечислить номера установленных битов числа."""
+    while row:
+        low = row & -row
+        yield low.bit_length() - 1
+        row ^= low
+
+
+def unpack_row(row: int, cols: int) -> Cells:
+    """Распаковать строку, упакованную `pack_row`, обратно в список клеток."""
+    return [int(c) for c in format(row, "b").zfill(cols)[::-1]]
+
+
+def count_literals(n: int, full: bool) -> tp.FrozenSet[str]:
+    """Условие «ровно `n` соседей» на разряды счетчика."""
+    digits = ["ones", "twos", "fours", "eights"] if full else ["ones", "twos"]
+    literals = {digit if n >> k & 1 else "~" + digit for k, digit in enumerate(digits)}
+    if not full:
+        literals.add("~fours")
+    return frozenset(literals)
+
+
+def rule_expression(rule: Rule) -> tp.Tuple[str, bool]:
+    """
+    Записать таблицу правила выражением над разрядами счетчика соседей и
+    строкой `here`. Возвращает выражение и нужен ли полный счетчик (если
+    правило различает числа соседей от четырех и больше).
+    """
+    always, if_alive, if_dead = rule_groups(rule)
+    full = max(always | if_alive | if_dead, default=0) >= 4
+    terms = [count_literals(n, full) for n in sorted(always)]
+    terms += [count_literals(n, full) | {"here"} for n in sorted(if_alive)]
+    terms += [count_literals(n, full) | {"~here"} for n in sorted(if_dead)]
+    if not terms:
+        return "0", full
+    # Общие для всех слагаемых множители выносятся за скобки
+    common = frozenset.intersection(*terms)
+    rest = [" & ".join(sorted(term - common)) for term in terms]
+    factors = sorted(common)
+    if all(rest):
+        factors.append("(" + " | ".join(rest) + ")")
+    return " & ".join(factors), full
+
+
+def shifts(row: str, torus: bool) -> tp.Dict[str, str]:
+    """
+    Выражения для соседей строки `row` слева (`west_<row>`) и справа
+    (`east_<row>`): сдвиги на один бит, а на торе - повороты строки, при
+    которых крайний бит переходит на другой край.
+    """
+    if torus:
+        return {
+            f"west_{row}": f"(({row} << 1) | ({row} >> last)) & mask",
+            f"east_{row}": f"({row} >> 1) | (({row} & 1) << last)",
+        }
+    return {f"west_{row}": f"({row} << 1) & mask", f"east_{row}": f"{row} >> 1"}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_rule(rule: Rule, torus: bool = False) -> NextRows:
+    """
+    Собрать для правила функцию шага `next_rows(data, rows, mask)`.
+
+    Правило подставляется в код готовым битовым выражением, поэтому во
+    внутреннем цикле нет ни ветвлений, ни обращений к таблице: для B3/S23
+    получается `twos & ~fours & (ones | here & ~ones)`. Граница поля тоже
+    подставляется в код: на торе строки поворачиваются, а не сдвигаются.
+    """
+    expression, full = rule_expression(rule)
+    source = NEXT_ROWS.format(
+        adder=FULL_ADDER if full else SATURATING_ADDER,
+        expression=expression,
+        neighbour_rows=TORUS_ROWS if torus else BOUNDED_ROWS,
+        **shifts("above", torus),
+        **shifts("here", torus),
+        **shifts("below", torus),
+    )
+    namespace: tp.Dict[str, tp.Any] = {}
+    exec(compile(source, f"<rule {rule.name}>", "exec"), namespace)
+    return tp.cast(NextRows, namespace["next_rows"])
+
+
+class PackedBoard:
+    """
+    Клеточное поле, в котором каждая строка хранится как целое число Python,
+    используемое в качестве битового множества.
+
+    На одну клетку приходится один бит вместо ссылки на `int` в списке,
+    поэтому поле занимает примерно в 64 раза меньше памяти. Индексация и
+    итерация возвращают обычные списки, так что поле можно передавать туда,
+    где ожидается `Grid`.
+    """
+
+    __slots__ = ("rows", "cols", "data")
+
+    def __init__(self, rows: int, cols: int, data: tp.Optional[tp.List[int]] = None) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.data = data if data is not None else [0] * rows
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "PackedBoard":
+        rows = len(grid)
+        cols = len(grid[0]) if rows else 0
+        return cls(rows, cols, [pack_row(row) for row in grid])
+
+    def to_grid(self) -> Grid:
+        return [unpack_row(row, self.cols) for row in self.data]
+
+    @property
+    def mask(self) -> int:
+        """Маска, в которой установлены биты всех столбцов поля."""
+        return (1 << self.cols) - 1
+
+    def population(self) -> int:
+        return sum(row.bit_count() for row in self.data)
+
+    def __getitem__(self, row: int) -> Cells:
+        return unpack_row(self.data[row], self.cols)
+
+    def __iter__(self) -> tp.Iterator[Cells]:
+        for row in self.data:
+            yield unpack_row(row, self.cols)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PackedBoard):
+            return (self.rows, self.cols, self.data) == (other.rows, other.cols, other.data)
+        if isinstance(other, list):
+            return self.to_grid() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PackedBoard(rows={self.rows}, cols={self.cols})"
+
+    def frozen(self) -> "PackedBoard":
+        """Копия поля только для чтения: строки хранятся в кортеже."""
+        board = PackedBoard(self.rows, self.cols)
+        board.data = tuple(self.data)  # type: ignore[assignment]
+        return board
+
+    def get(self, cell: Cell) -> int:
+        row, col = cell
+        return (self.data[row] >> col) & 1
+
+    def set(self, cell: Cell, value: int) -> None:
+        row, col = cell
+        if value:
+            self.data[row] |= 1 << col
+        else:
+            self.data[row] &= ~(1 << col)
+
+    def next_generation(self, rule: Rule = CONWAY, torus: bool = False) -> "PackedBoard":
+        """
+        Получить следующее поколение побитовыми операциями.
+
+        Восемь соседей каждой строки складываются битовым счетчиком (единицы,
+        двойки, четверки и, если правилу нужно, восьмерки): одна операция
+        над строкой обрабатывает сразу все ее клетки. Функция шага
+        собирается для правила и границы один раз в `compile_rule`.
+        """
+        return PackedBoard(self.rows, self.cols, compile_rule(rule, torus)(self.data, self.rows, self.mask))
+
+
+class PackedGameOfLife(GameOfLife):
+    """
+    Игра «Жизнь» на упакованном поле `PackedBoard`.
+
+    Присваивание `curr_generation` или `prev_generation` обычного `Grid`
+    упаковывает его, поэтому `from_file`, `save` и интерфейсы работают
+    без изменений.
+    """
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> PackedBoard:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Union[Grid, PackedBoard]) -> None:
+        self._curr_generation = grid if isinstance(grid, PackedBoard) else PackedBoard.from_grid(grid)
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> PackedBoard:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid: tp.Union[Grid, PackedBoard]) -> None:
+        self._prev_generation = grid if isinstance(grid, PackedBoard) else PackedBoard.from_grid(grid)
+
+    def create_grid(self, randomize: bool = False) -> PackedBoard:  # type: ignore[override]
+        if not randomize:
+            return PackedBoard(self.rows, self.cols)
+        data = [pack_row([random.randint(0, 1) for _ in range(self.cols)]) for _ in range(self.rows)]
+        return PackedBoard(self.rows, self.cols, data)
+
+    def get_neighbours(self, cell: Cell) -> Cells:
+        if self.torus:
+            return [self.curr_generation.get(neighbour) for neighbour in self.wrapped_neighbours(cell)]
+        row, col = cell
+        neighbours = []
+        for i in range(max(row - 1, 0), min(row + 2, self.rows)):
+            for j in range(max(col - 1, 0), min(col + 2, self.cols)):
+                if (i, j) != (row, col):
+                    neighbours.append(self.curr_generation.get((i, j)))
+        return neighbours
+
+    def get_next_generation(self) -> PackedBoard:  # type: ignore[override]
+        return self.curr_generation.next_generation(self.rule, self.torus)
+
+    def generation_view(self) -> PackedBoard:
+        return self.curr_generation.frozen()
+
+    def to_grid(
+        self, top: int = 0, left: int = 0, rows: tp.Optional[int] = None, cols: tp.Optional[int] = None
+    ) -> Grid:
+        rows = self.rows - top if rows is None else rows
+        cols = self.cols - left if cols is None else cols
+        board = self.curr_generation
+        return [unpack_row(row, board.cols)[left : left + cols] for row in board.data[top : top + rows]]
+
+    def live_cells(self, generation: tp.Any = None) -> tp.Iterator[Cell]:
+        board = self.curr_generation if generation is None else generation
+        for i, row in enumerate(board.data):
+            for j in iter_bits(row):
+                yield i, j
+
+    def compute_stats(self, previous: tp.Optional[Stats] = None) -> Stats:
+        population = births = deaths = 0
+        first = last = -1
+        columns = 0
+        for i, (prev_row, curr_row) in enumerate(zip(self.prev_generation.data, self.curr_generation.data)):
+            if curr_row:
+                population += curr_row.bit_count()
+                columns |= curr_row
+                first = i if first < 0 else first
+                last = i
+            if prev_row != curr_row:
+                births += (curr_row & ~prev_row).bit_count()
+                deaths += (prev_row & ~curr_row).bit_count()
+        if first < 0:
+            return Stats(0, births, deaths, None)
+        # Крайние столбцы - младший и старший биты объединения всех строк
+        bbox = (first, (columns & -columns).bit_length() - 1, last + 1, columns.bit_length())
+        return Stats(population, births, deaths, bbox)
+
+    def compute_changes(self) -> Changes:
+        born: tp.List[Cell] = []
+        died: tp.List[Cell] = []
+        for i, (prev_row, curr_row) in enumerate(zip(self.prev_generation.data, self.curr_generation.data)):
+            if prev_row != curr_row:
+                born.extend((i, j) for j in iter_bits(curr_row & ~prev_row))
+                died.extend((i, j) for j in iter_bits(prev_row & ~curr_row))
+        return Changes(cell_array(born), cell_array(died))
+
+    def changed_cells(self) -> tp.Iterator[Cell]:
+        for i, (prev_row, curr_row) in enumerate(zip(self.prev_generation.data, self.curr_generation.data)):
+            for j in iter_bits(prev_row ^ curr_row):
+                yield i, j
+
+    def from_rows(self, lines: tp.Iterable[life_io.RowCells]) -> PackedBoard:  # type: ignore[override]
+        data = [0] * self.rows
+        for i, cols in enumerate(lines):
+            bits = bytearray(b"0" * self.cols)
+            for j in cols:
+                bits[self.cols - 1 - j] = ord("1")
+            data[i] = int(bits, 2) if bits else 0
+        return PackedBoard(self.rows, self.cols, data)
+
+    def row_cells(self) -> tp.Iterator[life_io.RowCells]:
+        for row in self.curr_generation.data:
+            yield list(iter_bits(row))
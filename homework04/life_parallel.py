@@ -0,0 +1,165 @@
+import argparse
+import multiprocessing
+import time
+import typing as tp
+from multiprocessing import shared_memory
+
+import numpy as np
+from life import Grid, parse_rule
+from life_numpy import NumpyGameOfLife, next_cells
+
+# Поля, к которым подключился процесс-работник: имя блока -> (блок, массив)
+_attached: tp.Dict[str, tp.Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def _attach(names: tp.Sequence[str], shape: tp.Tuple[int, int]) -> None:
+    for name in names:
+        if name not in _attached:
+            shm = shared_memory.SharedMemory(name=name)
+            _attached[name] = shm, np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+
+
+def _step_stripe(task: tp.Tuple[str, str, int, int, str, bool]) -> None:
+    """
+    Посчитать строки [start, stop) следующего поколения.
+
+    Соседние полосы обмениваются только граничными строками (halo): полоса
+    читает из общего поля на одну строку больше сверху и снизу, а пишет
+    только свои строки во второй буфер. На торе граничные строки крайних
+    полос берутся с противоположного края поля.
+    """
+    src_name, dst_name, start, stop, rule, torus = task
+    src = _attached[src_name][1]
+    dst = _attached[dst_name][1]
+    if torus:
+        # Заворачиваются и строки полосы, но это меняет только граничные строки, которые не пишутся
+        window = src.take(range(start - 1, stop + 1), axis=0, mode="wrap")
+        dst[start:stop] = next_cells(window, parse_rule(rule), torus=True)[1:-1]
+        return
+    top = max(start - 1, 0)
+    bottom = min(stop + 1, src.shape[0])
+    dst[start:stop] = next_cells(src[top:bottom], parse_rule(rule))[start - top : stop - top]
+
+
+def split_rows(rows: int, parts: int) -> tp.List[tp.Tuple[int, int]]:
+    """Разбить `rows` строк на `parts` почти равных горизонтальных полос."""
+    parts = max(1, min(parts, rows))
+    bounds = [rows * k // parts for k in range(parts + 1)]
+    return [(bounds[k], bounds[k + 1]) for k in range(parts) if bounds[k] < bounds[k + 1]]
+
+
+class ParallelGameOfLife(NumpyGameOfLife):
+    """
+    Игра «Жизнь», в которой поле разбито на горизонтальные полосы, а каждую
+    полосу считает отдельный процесс.
+
+    Текущее и следующее поколения лежат в двух блоках
+    `multiprocessing.shared_memory`, которые меняются местами после каждого
+    шага, поэтому между процессами передаются только номера строк. Правила
+    подсчета те же, что и у `NumpyGameOfLife`, и результат совпадает с ним
+    бит в бит.
+
+    Пул процессов нужно закрыть вызовом `close()` или через `with`.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        workers: int = 2,
+        **kwargs: tp.Any,
+    ) -> None:
+        rows, cols = size
+        self.workers = workers
+        self._shms = [shared_memory.SharedMemory(create=True, size=max(rows * cols, 1)) for _ in range(2)]
+        self._buffers = [np.ndarray((rows, cols), dtype=np.uint8, buffer=shm.buf) for shm in self._shms]
+        self._front = 0
+        names = [shm.name for shm in self._shms]
+        self._pool = multiprocessing.Pool(workers, initializer=_attach, initargs=(names, (rows, cols)))
+        self._stripes = split_rows(rows, workers)
+        super().__init__(size, randomize=randomize, max_generations=max_generations, **kwargs)
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> np.ndarray:
+        return self._buffers[self._front]
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Union[Grid, np.ndarray]) -> None:
+        for index, buffer in enumerate(self._buffers):
+            if grid is buffer:
+                self._front = index
+                return
+        self._buffers[self._front][:] = np.asarray(grid, dtype=np.uint8)
+        # Буфер тот же, а поле другое: кэши по поколению недействительны
+        self._stats_generation = self._changes_generation = self._hashed_generation = None
+        self._stats_previous_generation = self._history_generation = None
+
+    def get_next_generation(self) -> np.ndarray:  # type: ignore[override]
+        src, dst = self._shms[self._front], self._shms[1 - self._front]
+        tasks = [(src.name, dst.name, start, stop, self.rule.name, self.torus) for start, stop in self._stripes]
+        self._pool.map(_step_stripe, tasks)
+        return self._buffers[1 - self._front]
+
+    def generation_view(self) -> np.ndarray:
+        # Буферы общей памяти перезаписываются через шаг, поэтому нужна копия
+        view = self.curr_generation.copy()
+        view.flags.writeable = False
+        return view
+
+    def close(self) -> None:
+        """Остановить процессы и освободить общую память."""
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None  # type: ignore[assignment]
+        # Поколения остаются доступны и после закрытия пула
+        self._curr_generation = self.curr_generation.copy()
+        self._prev_generation = self.prev_generation.copy()
+        self._buffers = [self._curr_generation, self._curr_generation.copy()]
+        self._front = 0
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> "ParallelGameOfLife":
+        return self
+
+    def __exit__(self, *exc_info: tp.Any) -> None:
+        self.close()
+
+
+def benchmark(sizes: tp.Sequence[int], workers: tp.Sequence[int], generations: int) -> tp.List[tp.Dict[str, float]]:
+    """
+    Измерить скорость шага для каждого размера поля и числа процессов.
+
+    Возвращает строки таблицы с размером поля, числом процессов, временем на
+    поколение и ускорением относительно одного процесса.
+    """
+    results = []
+    for side in sizes:
+        board = np.random.default_rng(side).integers(0, 2, size=(side, side), dtype=np.uint8)
+        base = 0.0
+        for count in workers:
+            with ParallelGameOfLife((side, side), randomize=False, workers=count) as game:
+                game.curr_generation = board
+                game.step()
+                start = time.perf_counter()
+                for _ in range(generations):
+                    game.step()
+                elapsed = (time.perf_counter() - start) / generations
+            base = base or elapsed
+            results.append({"size": side, "workers": count, "seconds": elapsed, "speedup": base / elapsed})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Масштабирование ParallelGameOfLife по числу процессов")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2048, 4096, 8192, 16384])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--generations", type=int, default=10)
+    args = parser.parse_args()
+    print(f"{'size':>6} {'workers':>7} {'sec/gen':>9} {'speedup':>7}")
+    for row in benchmark(args.sizes, args.workers, args.generations):
+        print(f"{row['size']:>6} {row['workers']:>7} {row['seconds']:>9.4f} {row['speedup']:>7.2f}")
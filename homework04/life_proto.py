@@ -1,4 +1,6 @@
 import random
+import threading
+import time
 import typing as tp
 
 import pygame
@@ -8,10 +10,19 @@ Cell = tp.Tuple[int, int]
 Cells = tp.List[int]
 Grid = tp.List[Cells]
 
+# Сколько поколений можно догнать за один кадр, если шаги не успевают за временем
+MAX_CATCH_UP = 10
+
 
 class GameOfLife:
     def __init__(
-        self, width: int = 640, height: int = 480, cell_size: int = 10, speed: int = 10
+        self,
+        width: int = 640,
+        height: int = 480,
+        cell_size: int = 10,
+        speed: int = 10,
+        generations_per_second: tp.Optional[float] = None,
+        headless: bool = False,
     ) -> None:
         self.width = width
         self.height = height
@@ -19,15 +30,26 @@ class GameOfLife:
 
         # Устанавливаем размер окна
         self.screen_size = width, height
-        # Создание нового окна
-        self.screen = pygame.display.set_mode(self.screen_size)
+        # Создание нового окна; без окна рисуем в поверхность в памяти
+        if headless:
+            self.screen = pygame.Surface(self.screen_size)
+        else:
+            self.screen = pygame.display.set_mode(self.screen_size)
 
         # Вычисляем количество ячеек по вертикали и горизонтали
         self.cell_width = self.width // self.cell_size
         self.cell_height = self.height // self.cell_size
 
-        # Скорость протекания игры
+        # Скорость протекания игры: кадров в секунду
         self.speed = speed
+        # Поколений в секунду; если не задано, одно поколение на кадр
+        self.generations_per_second = generations_per_second
+        self.generations = 0
+        # Накопленная доля еще не сделанного поколения
+        self._lag = 0.0
+
+        # Список клеток
+        self.grid = self.create_grid()
 
     def draw_lines(self) -> None:
         """ Отрисовать сетку """
@@ -36,7 +58,7 @@ class GameOfLife:
         for y in range(0, self.height, self.cell_size):
             pygame.draw.line(self.screen, pygame.Color("black"), (0, y), (self.width, y))
 
-    def run(self) -> None:
+    def run(self, threaded: bool = False) -> None:
         """ Запустить игру """
         pygame.init()
         clock = pygame.time.Clock()
@@ -44,7 +66,12 @@ class GameOfLife:
         self.screen.fill(pygame.Color("white"))
 
         # Создание списка клеток
-        # PUT YOUR CODE HERE
+        self.grid = self.create_grid(randomize=True)
+
+        if self.generations_per_second is not None:
+            self.run_fixed_timestep(clock, threaded)
+            pygame.quit()
+            return
 
         running = True
         while running:
@@ -54,13 +81,81 @@ class GameOfLife:
             self.draw_lines()
 
             # Отрисовка списка клеток
+            self.draw_grid()
             # Выполнение одного шага игры (обновление состояния ячеек)
-            # PUT YOUR CODE HERE
+            self.grid = self.get_next_generation()
 
             pygame.display.flip()
             clock.tick(self.speed)
         pygame.quit()
 
+    def run_fixed_timestep(self, clock: pygame.time.Clock, threaded: bool = False) -> None:
+        """
+        Игровой цикл, в котором поколения считаются с частотой
+        `generations_per_second` независимо от частоты кадров `speed`.
+
+        Каждый кадр рисует последнее готовое поколение; поколения, вышедшие
+        между кадрами, не рисуются. С `threaded=True` поколения считаются в
+        отдельном потоке, иначе - перед отрисовкой кадра.
+        """
+        stop = threading.Event()
+        worker = threading.Thread(target=self.simulate, args=(stop,), daemon=True)
+        if threaded:
+            worker.start()
+        drawn = None
+        last = time.perf_counter()
+        running = True
+        try:
+            while running:
+                for event in pygame.event.get():
+                    if event.type == QUIT:
+                        running = False
+                if not threaded:
+                    now = time.perf_counter()
+                    self.update(now - last)
+                    last = now
+                grid = self.grid
+                if grid is not drawn:
+                    self.draw_lines()
+                    self.draw_grid(grid)
+                    pygame.display.flip()
+                    drawn = grid
+                clock.tick(self.speed)
+        finally:
+            stop.set()
+            if threaded:
+                worker.join()
+
+    def update(self, elapsed: float) -> int:
+        """
+        Сделать шаги, которые должны были пройти за `elapsed` секунд, и
+        вернуть их число.
+
+        Если шаги не успевают за временем, за один вызов делается не больше
+        `MAX_CATCH_UP` поколений, а остальное отставание отбрасывается.
+        """
+        assert self.generations_per_second is not None
+        self._lag += elapsed * self.generations_per_second
+        steps = min(int(self._lag), MAX_CATCH_UP)
+        self._lag -= int(self._lag)
+        for _ in range(steps):
+            # Новое поколение - новый список, поэтому отрисовка в другом потоке
+            # всегда видит поколение целиком
+            self.grid = self.get_next_generation()
+            self.generations += 1
+        return steps
+
+    def simulate(self, stop: threading.Event) -> None:
+        """Считать поколения с постоянной частотой, пока не установлен `stop`"""
+        assert self.generations_per_second is not None
+        period = 1 / self.generations_per_second
+        last = time.perf_counter()
+        while not stop.is_set():
+            now = time.perf_counter()
+            self.update(now - last)
+            last = now
+            stop.wait(max(period - (time.perf_counter() - now), 0))
+
     def create_grid(self, randomize: bool = False) -> Grid:
         """
         Создание списка клеток.
@@ -79,13 +174,21 @@ class GameOfLife:
         out : Grid
             Матрица клеток размером `cell_height` х `cell_width`.
         """
-        pass
+        return [
+            [random.randint(0, 1) if randomize else 0 for _ in range(self.cell_width)]
+            for _ in range(self.cell_height)
+        ]
 
-    def draw_grid(self) -> None:
+    def draw_grid(self, grid: tp.Optional[Grid] = None) -> None:
         """
-        Отрисовка списка клеток с закрашиванием их в соответствующе цвета.
+        Отрисовка списка клеток `grid` (по умолчанию текущего) с закрашиванием
+        их в соответствующе цвета.
         """
-        pass
+        for i, row in enumerate(self.grid if grid is None else grid):
+            for j, cell in enumerate(row):
+                color = pygame.Color("green") if cell else pygame.Color("white")
+                rect = (j * self.cell_size + 1, i * self.cell_size + 1, self.cell_size - 1, self.cell_size - 1)
+                pygame.draw.rect(self.screen, color, rect)
 
     def get_neighbours(self, cell: Cell) -> Cells:
         """
@@ -105,7 +208,13 @@ class GameOfLife:
         out : Cells
             Список соседних клеток.
         """
-        pass
+        row, col = cell
+        neighbours = []
+        for i in range(max(row - 1, 0), min(row + 2, self.cell_height)):
+            for j in range(max(col - 1, 0), min(col + 2, self.cell_width)):
+                if (i, j) != (row, col):
+                    neighbours.append(self.grid[i][j])
+        return neighbours
 
     def get_next_generation(self) -> Grid:
         """
@@ -116,4 +225,12 @@ class GameOfLife:
         out : Grid
             Новое поколение клеток.
         """
-        pass
+        new_grid = self.create_grid()
+        for i in range(self.cell_height):
+            for j in range(self.cell_width):
+                alive = sum(self.get_neighbours((i, j)))
+                if self.grid[i][j]:
+                    new_grid[i][j] = int(alive in (2, 3))
+                else:
+                    new_grid[i][j] = int(alive == 3)
+        return new_grid
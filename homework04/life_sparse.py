@@ -0,0 +1,165 @@
+import collections
+import random
+import typing as tp
+
+import life_io
+from life import (
+    OFFSETS,
+    Cell,
+    Cells,
+    Changes,
+    GameOfLife,
+    Grid,
+    Stats,
+    cell_array,
+    rule_groups,
+)
+
+LiveCells = tp.Set[Cell]
+
+
+class SparseGameOfLife(GameOfLife):
+    """
+    Игра «Жизнь», в которой хранятся только координаты живых клеток.
+
+    Следующее поколение считается только вокруг живых клеток, поэтому время
+    шага и занимаемая память зависят от числа живых клеток, а не от площади
+    поля. В ограниченном режиме (`bounded=True`) клетки за пределами `size`
+    не рождаются, как и в `GameOfLife`; в неограниченном режиме поле
+    бесконечно, а `size` задает только окно, которое сохраняется в файл.
+    На торе (`boundary="torus"`) координаты соседей берутся по модулю
+    размера поля, поэтому тор бывает только ограниченным.
+
+    Правила с рождением при нуле соседей (B0) не поддерживаются: по ним
+    оживают клетки вдали от живых, которых движок не просматривает.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        bounded: bool = True,
+        **kwargs: tp.Any,
+    ) -> None:
+        self.bounded = bounded
+        super().__init__(size, randomize=randomize, max_generations=max_generations, **kwargs)
+        if self.rule.table[0][0]:
+            raise ValueError(f"{type(self).__name__} не поддерживает правило {self.rule.name}")
+        if self.torus and not bounded:
+            raise ValueError("неограниченное поле не может быть тором")
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> LiveCells:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Union[Grid, tp.AbstractSet[Cell]]) -> None:
+        self._curr_generation = self.to_cells(grid)
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> LiveCells:
+        return self._prev_generation
+
+    @prev_generation.setter
+    def prev_generation(self, grid: tp.Union[Grid, tp.AbstractSet[Cell]]) -> None:
+        self._prev_generation = self.to_cells(grid)
+
+    @staticmethod
+    def to_cells(grid: tp.Union[Grid, tp.AbstractSet[Cell]]) -> LiveCells:
+        """Получить множество живых клеток из `Grid` или из множества координат."""
+        if isinstance(grid, set):
+            return grid
+        if isinstance(grid, frozenset):
+            return set(grid)
+        return {(i, j) for i, row in enumerate(grid) for j, cell in enumerate(row) if cell}
+
+    def to_grid(
+        self, top: int = 0, left: int = 0, rows: tp.Optional[int] = None, cols: tp.Optional[int] = None
+    ) -> Grid:
+        """
+        Получить окно поля размером `rows` х `cols` с левым верхним углом в
+        клетке (`top`, `left`) в виде обычного `Grid`.
+        """
+        rows = self.rows - top if rows is None else rows
+        cols = self.cols - left if cols is None else cols
+        grid = [[0] * cols for _ in range(rows)]
+        for i, j in self.curr_generation:
+            if top <= i < top + rows and left <= j < left + cols:
+                grid[i - top][j - left] = 1
+        return grid
+
+    def generation_view(self) -> tp.FrozenSet[Cell]:
+        return frozenset(self.curr_generation)
+
+    def live_cells(self, generation: tp.Any = None) -> LiveCells:
+        return self.curr_generation if generation is None else generation
+
+    def changed_cells(self) -> LiveCells:
+        return self.curr_generation ^ self.prev_generation
+
+    def compute_changes(self) -> Changes:
+        curr, prev = self.curr_generation, self.prev_generation
+        return Changes(cell_array(curr - prev), cell_array(prev - curr))
+
+    def compute_stats(self, previous: tp.Optional[Stats] = None) -> Stats:
+        curr, prev = self.curr_generation, self.prev_generation
+        births = sum(1 for cell in curr if cell not in prev)
+        deaths = len(prev) - (len(curr) - births)
+        if not curr:
+            return Stats(0, births, deaths, None)
+        rows = [i for i, _ in curr]
+        cols = [j for _, j in curr]
+        return Stats(len(curr), births, deaths, (min(rows), min(cols), max(rows) + 1, max(cols) + 1))
+
+    def in_bounds(self, cell: Cell) -> bool:
+        row, col = cell
+        return not self.bounded or (0 <= row < self.rows and 0 <= col < self.cols)
+
+    def create_grid(self, randomize: bool = False) -> LiveCells:  # type: ignore[override]
+        if not randomize:
+            return set()
+        return {(i, j) for i in range(self.rows) for j in range(self.cols) if random.randint(0, 1)}
+
+    def get_neighbours(self, cell: Cell) -> Cells:
+        live = self.curr_generation
+        if self.torus:
+            return [int(neighbour in live) for neighbour in self.wrapped_neighbours(cell)]
+        row, col = cell
+        neighbours = []
+        for di, dj in OFFSETS:
+            neighbour = (row + di, col + dj)
+            if self.in_bounds(neighbour):
+                neighbours.append(int(neighbour in live))
+        return neighbours
+
+    def get_next_generation(self) -> LiveCells:  # type: ignore[override]
+        live = self.curr_generation
+        rows, cols = self.rows, self.cols
+        if self.torus:
+            counts = collections.Counter(((i + di) % rows, (j + dj) % cols) for i, j in live for di, dj in OFFSETS)
+        else:
+            counts = collections.Counter((i + di, j + dj) for i, j in live for di, dj in OFFSETS)
+        always, if_alive, if_dead = rule_groups(self.rule)
+        new_live = {
+            cell
+            for cell, n in counts.items()
+            if n in always or (n in if_alive and cell in live) or (n in if_dead and cell not in live)
+        }
+        if self.rule.table[1][0]:
+            # Живые клетки без соседей не попали в счетчик
+            new_live |= {cell for cell in live if cell not in counts}
+        if self.bounded and not self.torus:
+            new_live = {(i, j) for i, j in new_live if 0 <= i < rows and 0 <= j < cols}
+        return new_live
+
+    def from_rows(self, lines: tp.Iterable[life_io.RowCells]) -> LiveCells:  # type: ignore[override]
+        return {(i, j) for i, cols in enumerate(lines) for j in cols}
+
+    def row_cells(self) -> tp.Iterator[life_io.RowCells]:
+        by_row = collections.defaultdict(list)
+        for i, j in self.curr_generation:
+            if 0 <= i < self.rows and 0 <= j < self.cols:
+                by_row[i].append(j)
+        for i in range(self.rows):
+            yield sorted(by_row.get(i, ()))
@@ -0,0 +1,133 @@
+import typing as tp
+
+import numpy as np
+from life import Grid
+from life_numpy import NumpyGameOfLife, next_cells
+
+
+class TileStats(tp.NamedTuple):
+    """Сколько плиток было пересчитано и сколько пропущено за поколение."""
+
+    active: int
+    skipped: int
+
+
+class TiledGameOfLife(NumpyGameOfLife):
+    """
+    Игра «Жизнь», в которой поле разбито на плитки `tile_size` х `tile_size`
+    и пересчитываются только активные плитки.
+
+    Плитка активна, если в прошлом поколении изменилась она сама или одна из
+    восьми соседних плиток: иначе окрестность каждой ее клетки осталась
+    прежней, и клетки не могут измениться. Устойчивые участки поля поэтому
+    ничего не стоят: новое поколение пишется в массив позапрошлого, где
+    неактивные плитки уже совпадают с текущим поколением, а изменившиеся
+    плитки ищутся только среди пересчитанных. После каждого шага в
+    `tile_stats` лежит число активных и пропущенных плиток, а в
+    `total_tile_stats` - их сумма за всю игру.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        tile_size: int = 32,
+        **kwargs: tp.Any,
+    ) -> None:
+        rows, cols = size
+        self.tile_size = tile_size
+        self.tile_rows = -(-rows // tile_size)
+        self.tile_cols = -(-cols // tile_size)
+        self._active = np.ones((self.tile_rows, self.tile_cols), dtype=bool)
+        # Шаг, который еще не принят: (новое поколение, активные плитки, старое поколение)
+        self._pending: tp.Optional[tp.Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        # Массив, из которого получено текущее поколение: вне активных плиток
+        # он совпадает с текущим, поэтому в него пишется следующее
+        self._spare: tp.Optional[np.ndarray] = None
+        self.tile_stats = TileStats(0, 0)
+        self.total_tile_stats = TileStats(0, 0)
+        super().__init__(size, randomize=randomize, max_generations=max_generations, **kwargs)
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> np.ndarray:
+        return self._curr_generation
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Union[Grid, np.ndarray]) -> None:
+        if self._pending is not None and grid is self._pending[0]:
+            _, self._active, self._spare = self._pending
+        else:
+            # Поле заменили целиком, поэтому пересчитать нужно все плитки
+            self._active = np.ones((self.tile_rows, self.tile_cols), dtype=bool)
+            self._spare = None
+        self._pending = None
+        self._curr_generation = np.asarray(grid, dtype=np.uint8)
+
+    def changed_tiles(self, old: np.ndarray, new: np.ndarray) -> np.ndarray:
+        """Карта плиток, в которых хотя бы одна клетка изменилась."""
+        size = self.tile_size
+        diff = np.zeros((self.tile_rows * size, self.tile_cols * size), dtype=bool)
+        diff[: self.rows, : self.cols] = old != new
+        return np.asarray(diff.reshape(self.tile_rows, size, self.tile_cols, size).any(axis=(1, 3)))
+
+    def dilate(self, tiles: np.ndarray) -> np.ndarray:
+        """Добавить к отмеченным плиткам всех их соседей (на торе - и через край)."""
+        padded = np.pad(tiles, 1, mode="wrap" if self.torus else "constant")
+        rows, cols = tiles.shape
+        result = np.zeros_like(tiles)
+        for di in range(3):
+            for dj in range(3):
+                result |= padded[di : di + rows, dj : dj + cols]
+        return result
+
+    def step_tiles(self, curr: np.ndarray, active: np.ndarray, new: np.ndarray) -> np.ndarray:
+        """
+        Пересчитать только активные плитки в массив `new`, где остальные
+        плитки уже совпадают с `curr`, и вернуть карту изменившихся плиток.
+        """
+        size = self.tile_size
+        changed = np.zeros_like(active)
+        for ti in np.flatnonzero(active.any(axis=1)).tolist():
+            r0, r1 = ti * size, min((ti + 1) * size, self.rows)
+            top, bottom = max(r0 - 1, 0), min(r1 + 1, self.rows)
+            # Соседние активные плитки одной полосы считаются одним срезом
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], active[ti].astype(np.int8), [0]))))
+            for start, stop in zip(edges[::2].tolist(), edges[1::2].tolist()):
+                c0, c1 = start * size, min(stop * size, self.cols)
+                if self.torus:
+                    # Рамка в одну клетку вокруг блока - с противоположных краев поля
+                    rows = np.arange(r0 - 1, r1 + 1) % self.rows
+                    cols = np.arange(c0 - 1, c1 + 1) % self.cols
+                    new[r0:r1, c0:c1] = next_cells(curr[np.ix_(rows, cols)], self.rule)[1:-1, 1:-1]
+                else:
+                    left, right = max(c0 - 1, 0), min(c1 + 1, self.cols)
+                    block = next_cells(curr[top:bottom, left:right], self.rule)
+                    new[r0:r1, c0:c1] = block[r0 - top : r1 - top, c0 - left : c1 - left]
+                diff = (new[r0:r1, c0:c1] != curr[r0:r1, c0:c1]).any(axis=0)
+                changed[ti, start:stop] = np.logical_or.reduceat(diff, np.arange(0, c1 - c0, size))
+        return changed
+
+    def get_next_generation(self) -> np.ndarray:  # type: ignore[override]
+        curr = self.curr_generation
+        active = self._active
+        if active.all() or self._spare is None:
+            new = next_cells(curr, self.rule, self.torus)
+            changed = self.changed_tiles(curr, new)
+        else:
+            new = self._spare
+            changed = self.step_tiles(curr, active, new)
+        count = int(active.sum())
+        self.tile_stats = TileStats(count, active.size - count)
+        self.total_tile_stats = TileStats(
+            self.total_tile_stats.active + self.tile_stats.active,
+            self.total_tile_stats.skipped + self.tile_stats.skipped,
+        )
+        self._pending = new, self.dilate(changed), curr
+        return new
+
+    def generation_view(self) -> np.ndarray:
+        # Массив поколения перезаписывается через шаг, поэтому нужна копия
+        view = self.curr_generation.copy()
+        view.flags.writeable = False
+        return view
@@ -1,6 +1,7 @@
 import json
 import os
 import random
+import tempfile
 import unittest
 
 import life
@@ -138,3 +139,198 @@ class TestGameOfLife(unittest.TestCase):
         for _ in range(self.max_generations + 1):
             game.step()
         self.assertFalse(game.is_changing)
+
+    def test_cycle_is_detected(self):
+        game = life.GameOfLife((5, 5), randomize=False, max_period=4)
+        game.curr_generation = [
+            [0, 0, 0, 0, 0],
+            [0, 0, 1, 0, 0],
+            [0, 0, 1, 0, 0],
+            [0, 0, 1, 0, 0],
+            [0, 0, 0, 0, 0],
+        ]
+        game.step()
+        self.assertTrue(game.is_changing)
+        self.assertIsNone(game.cycle)
+        game.step()
+        self.assertFalse(game.is_changing)
+        self.assertEqual(life.Cycle(start=1, period=2), game.cycle)
+
+    def test_cycle_longer_than_max_period_is_ignored(self):
+        game = life.GameOfLife((5, 5), randomize=False, max_period=1)
+        game.curr_generation = [[0] * 5, [0, 0, 1, 0, 0], [0, 0, 1, 0, 0], [0, 0, 1, 0, 0], [0] * 5]
+        for _ in range(10):
+            game.step()
+        self.assertIsNone(game.cycle)
+        self.assertTrue(game.is_changing)
+
+    def test_board_hash_is_incremental(self):
+        game = life.GameOfLife((self.rows, self.cols), max_period=50)
+        game.curr_generation = self.grid
+        for _ in range(self.max_generations + 1):
+            game.step()
+            self.assertEqual(game.hash_cells(game.live_cells()), game.board_hash)
+        self.assertEqual(1, game.cycle.period)
+
+    def test_parse_rule(self):
+        self.assertEqual(life.CONWAY, life.parse_rule("b3/s23"))
+        self.assertEqual(life.CONWAY, life.parse_rule("S23/B3"))
+        self.assertEqual(life.CONWAY, life.parse_rule("23/3"))
+        seeds = life.parse_rule("B2/S")
+        self.assertEqual("B2/S", seeds.name)
+        self.assertEqual(((0, 0, 1, 0, 0, 0, 0, 0, 0), (0,) * 9), seeds.table)
+        with self.assertRaises(ValueError):
+            life.parse_rule("B9/S23")
+
+    def test_rule_drives_next_generation(self):
+        # У мертвой клетки в центре шесть живых соседей
+        grid = [[1, 1, 1], [0, 0, 0], [1, 1, 1]]
+        conway = life.GameOfLife((3, 3), randomize=False)
+        conway.curr_generation = grid
+        highlife = life.GameOfLife((3, 3), randomize=False, rule="B36/S23")
+        highlife.curr_generation = grid
+        self.assertEqual(0, conway.get_next_generation()[1][1])
+        self.assertEqual(1, highlife.get_next_generation()[1][1])
+
+    def test_rule_is_saved_in_rle(self):
+        game = life.GameOfLife((self.rows, self.cols), rule="B36/S23")
+        game.curr_generation = self.grid
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grid.rle")
+            game.save(path)
+            loaded = life.GameOfLife.from_file(path)
+            history = os.path.join(tmp, "grid.lifehist")
+            game.save_history(history, 2)
+            restored = life.GameOfLife.load_history(history)
+        self.assertEqual("B36/S23", loaded.rule.name)
+        self.assertEqual(self.grid, loaded.curr_generation)
+        self.assertEqual("B36/S23", restored.rule.name)
+
+    def test_iter_generations(self):
+        game = life.GameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        reference = life.GameOfLife((self.rows, self.cols))
+        reference.curr_generation = self.grid
+        expected = {}
+        for generation in range(1, 12):
+            expected[generation] = reference.curr_generation
+            reference.step()
+        seen = list(game.iter_generations(start=3, stop=12, every=4))
+        self.assertEqual([3, 7, 11], [generation for generation, _ in seen])
+        for generation, view in seen:
+            self.assertEqual(expected[generation], view)
+            with self.assertRaises(TypeError):
+                view[0][0] = 1
+        self.assertEqual(12, game.generations)
+        with self.assertRaises(ValueError):
+            next(game.iter_generations(start=5))
+
+    def test_iter_generations_stops_early(self):
+        game = life.GameOfLife((self.rows, self.cols), max_generations=5)
+        game.curr_generation = self.grid
+        self.assertEqual([1, 2, 3, 4, 5], [generation for generation, _ in game.iter_generations()])
+        game = life.GameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        generations = [generation for generation, _ in game.iter_generations()]
+        self.assertFalse(game.is_changing)
+        self.assertEqual(game.generations, generations[-1])
+        self.assertLess(generations[-1], 30)
+
+    def test_iter_generations_snapshots(self):
+        game = life.GameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        (_, frame), (_, after) = game.iter_generations(stop=3, snapshot=True)
+        self.assertEqual((self.rows, 1), frame.shape)
+        self.assertEqual(self.grid, [[int(bit) for bit in format(byte, "08b")] for byte in frame[:, 0]])
+        self.assertEqual((self.rows, 1), after.shape)
+        self.assertEqual(3, game.generations)
+
+    def test_stats_match_generations(self):
+        random.seed(7)
+        game = life.GameOfLife((12, 15))
+        for _ in range(10):
+            prev = game.curr_generation
+            game.step()
+            cells = {(i, j) for i, row in enumerate(game.curr_generation) for j, cell in enumerate(row) if cell}
+            stats = game.stats
+            self.assertEqual(len(cells), stats.population)
+            self.assertEqual(len([1 for i, j in cells if not prev[i][j]]), stats.births)
+            self.assertEqual(sum(map(sum, prev)) - len(cells) + stats.births, stats.deaths)
+            rows, cols = [i for i, _ in cells], [j for _, j in cells]
+            self.assertEqual((min(rows), min(cols), max(rows) + 1, max(cols) + 1), stats.bbox)
+            self.assertEqual(stats.changed > 0, game.is_changing)
+
+    def test_stats_are_recomputed_after_assignment(self):
+        game = life.GameOfLife((4, 4), randomize=False)
+        game.curr_generation = [[0, 0, 0, 0], [0, 1, 1, 0], [0, 1, 1, 0], [0, 0, 0, 0]]
+        game.step()
+        self.assertEqual(life.Stats(4, 0, 0, (1, 1, 3, 3)), game.stats)
+        self.assertFalse(game.is_changing)
+        game.curr_generation = [[1, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
+        self.assertEqual(life.Stats(1, 1, 4, (0, 0, 1, 1)), game.stats)
+        game.step()
+        self.assertEqual(life.Stats(0, 0, 1, None), game.stats)
+        self.assertTrue(game.is_changing)
+
+    def test_changes(self):
+        random.seed(9)
+        game = life.GameOfLife((12, 15))
+        for _ in range(5):
+            prev = game.curr_generation
+            game.step()
+            born, died = game.changes
+            expected_born = [[i, j] for i in range(12) for j in range(15) if game.curr_generation[i][j] > prev[i][j]]
+            expected_died = [[i, j] for i in range(12) for j in range(15) if game.curr_generation[i][j] < prev[i][j]]
+            self.assertEqual(expected_born, born.tolist())
+            self.assertEqual(expected_died, died.tolist())
+            self.assertEqual((len(born), len(died)), (game.stats.births, game.stats.deaths))
+
+    def test_history_and_rewind(self):
+        game = life.GameOfLife((self.rows, self.cols), randomize=False, history=4)
+        game.curr_generation = self.grid
+        self.assertEqual(0, len(game.history))
+        generations = [game.curr_generation]
+        for _ in range(6):
+            game.step()
+            generations.append(game.curr_generation)
+        self.assertEqual(4, len(game.history))
+        self.assertEqual(4, game.history.ring.frames.shape[0])
+        for k in range(4):
+            self.assertEqual(generations[-1 - k], game.history[k])
+            self.assertEqual(7 - k, game.history.generation(k))
+        with self.assertRaises(IndexError):
+            game.history[4]
+        game.rewind(2)
+        self.assertEqual(5, game.generations)
+        self.assertEqual(generations[4], game.curr_generation)
+        self.assertEqual(generations[3], game.prev_generation)
+        self.assertEqual(2, len(game.history))
+        game.step()
+        self.assertEqual(generations[5], game.curr_generation)
+        self.assertEqual(generations[5], game.history[0])
+        with self.assertRaises(IndexError):
+            game.rewind(3)
+        with self.assertRaises(IndexError):
+            life.GameOfLife((2, 2)).rewind(1)
+
+    def test_torus_neighbours_wrap_around(self):
+        game = life.GameOfLife((self.rows, self.cols), boundary="torus")
+        game.curr_generation = self.grid
+        neighbours = game.get_neighbours((0, 0))
+        self.assertEqual(8, len(neighbours))
+        self.assertEqual(6, sum(neighbours))
+        self.assertEqual((1, 7), game.wrapped_neighbours((0, 0))[5])
+        with self.assertRaises(ValueError):
+            life.GameOfLife((3, 3), boundary="sphere")
+
+    def test_glider_crosses_the_torus(self):
+        game = life.GameOfLife((7, 7), randomize=False, boundary="torus")
+        glider = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+        game.curr_generation = [row + [0] * 4 for row in glider] + [[0] * 7 for _ in range(4)]
+        start = game.curr_generation
+        for _ in range(27):
+            game.step()
+            self.assertEqual(5, game.stats.population)
+        self.assertNotEqual(start, game.curr_generation)
+        game.step()
+        self.assertEqual(start, game.curr_generation)
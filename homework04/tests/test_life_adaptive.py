@@ -0,0 +1,81 @@
+import random
+import unittest
+from unittest import mock
+
+import life
+import life_adaptive
+import life_numpy
+
+
+class TestAdaptiveGameOfLife(unittest.TestCase):
+    def setUp(self):
+        random.seed(9)
+        self.reference = life.GameOfLife((24, 30), max_period=2)
+        random.seed(9)
+
+    def test_dense_board_moves_to_numpy(self):
+        game = life_adaptive.AdaptiveGameOfLife((24, 30), engine="sparse", max_period=2)
+        self.assertEqual("sparse", game.engine_name)
+        for _ in range(20):
+            self.reference.step()
+            game.step()
+            self.assertEqual(self.reference.curr_generation, game.to_grid())
+            self.assertEqual(self.reference.stats, game.stats)
+        self.assertEqual("numpy", game.engine_name)
+        (switch,) = game.switches
+        self.assertEqual(("sparse", "numpy", 1), (switch.old, switch.new, switch.generation))
+        self.assertLess(switch.predicted_new, switch.predicted_old)
+
+    def test_switch_keeps_cycle_and_history(self):
+        with mock.patch.object(life_adaptive, "DENSE_COST", 1.0):
+            game = life_adaptive.AdaptiveGameOfLife((24, 30), max_period=2, history=10, sample_every=4)
+            grids = [self.reference.curr_generation]
+            while self.reference.is_changing:
+                self.reference.step()
+                game.step()
+                grids.append(self.reference.curr_generation)
+                self.assertEqual(self.reference.curr_generation, game.to_grid())
+                self.assertEqual(self.reference.is_changing, game.is_changing)
+                self.assertEqual(self.reference.stats, game.stats)
+            self.assertEqual(self.reference.cycle, game.cycle)
+            self.assertEqual("sparse", game.engine_name)
+            self.assertEqual([("numpy", "sparse", 1)], [(s.old, s.new, s.generation) for s in game.switches])
+            game.rewind(3)
+            self.assertEqual(self.reference.generations - 3, game.generations)
+            self.assertEqual(grids[-4], game.to_grid())
+
+    def test_assigned_board_is_sampled_before_next_step(self):
+        game = life_adaptive.AdaptiveGameOfLife((64, 64), sample_every=1000)
+        game.step()
+        self.assertEqual("numpy", game.engine_name)
+        with mock.patch.object(life_adaptive, "DENSE_COST", 1.0):
+            game.step()
+            self.assertEqual("numpy", game.engine_name)
+            game.curr_generation = game.create_grid(randomize=True)
+            game.step()
+        self.assertEqual("sparse", game.engine_name)
+        self.assertEqual(3, game.switches[0].generation)
+
+    def test_b0_rule_stays_on_numpy(self):
+        with mock.patch.object(life_adaptive, "DENSE_COST", 1.0):
+            game = life_adaptive.AdaptiveGameOfLife((10, 10), rule="B0/S8", sample_every=1)
+            game.advance(5)
+        self.assertEqual("numpy", game.engine_name)
+
+    def test_torus_survives_switch(self):
+        random.seed(4)
+        reference = life_numpy.NumpyGameOfLife((16, 16), boundary="torus")
+        random.seed(4)
+        with mock.patch.object(life_adaptive, "DENSE_COST", 1.0):
+            game = life_adaptive.AdaptiveGameOfLife((16, 16), sample_every=1, boundary="torus")
+            for _ in range(6):
+                reference.step()
+                game.step()
+                self.assertEqual(reference.to_grid(), game.to_grid())
+        self.assertEqual("sparse", game.engine_name)
+
+    def test_benchmark_returns_switches(self):
+        with mock.patch.object(life_adaptive, "DENSE_COST", 1.0):
+            results, switches = life_adaptive.benchmark(32, 8, 4)
+        self.assertEqual({"numpy", "sparse", "adaptive"}, set(results))
+        self.assertEqual(["sparse"], [switch.new for switch in switches])
@@ -0,0 +1,77 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import life_bench
+import life_numpy
+
+
+class BrokenGameOfLife(life_numpy.NumpyGameOfLife):
+    def get_next_generation(self):
+        new = super().get_next_generation()
+        new[0, 0] ^= 1
+        return new
+
+
+class TestBench(unittest.TestCase):
+    def test_engines_match_reference(self):
+        for rule in ("B3/S23", "B36/S23"):
+            with self.subTest(rule=rule):
+                self.assertEqual([], life_bench.check_engines(size=20, generations=8, rule=rule))
+
+    def test_engines_without_rule_are_skipped(self):
+        log = io.StringIO()
+        self.assertEqual([], life_bench.check_engines(size=12, generations=3, rule="B0123478/S01234678", log=log))
+        self.assertEqual(["hashlife", "sparse"], sorted(line.split(":")[0] for line in log.getvalue().splitlines()))
+
+    def test_mismatch_is_reported(self):
+        with mock.patch.dict(life_bench.ENGINES, {"broken": BrokenGameOfLife}):
+            mismatches = life_bench.check_engines(size=12, generations=3)
+        self.assertEqual(["broken: поколение 2 отличается от эталона"], mismatches)
+
+    def test_random_board_density(self):
+        board = life_bench.random_board(200, 0.1)
+        self.assertEqual((200, 200), board.shape)
+        self.assertAlmostEqual(0.1, board.mean(), delta=0.01)
+        game = life_bench.make_game("packed", board)
+        self.assertEqual(board.tolist(), game.to_grid())
+
+    def test_results_round_trip_and_compare(self):
+        results = life_bench.run(["numpy"], [16], [0.5], ["step", "save", "from_file"])
+        self.assertEqual(
+            ["numpy/step/16/0.5", "numpy/save/16/0.5", "numpy/from_file/16/0.5"], [r.key for r in results]
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.json")
+            life_bench.save_results(path, results)
+            baseline = life_bench.load_results(path)
+        self.assertEqual([], life_bench.compare(results, baseline))
+        slower = [r._replace(seconds=r.seconds * 2) for r in results]
+        self.assertEqual(3, len(life_bench.compare(slower, baseline, threshold=0.5)))
+        self.assertEqual([], life_bench.compare(slower, baseline, threshold=1.5))
+        del baseline["numpy/save/16/0.5"]
+        with self.assertRaisesRegex(KeyError, "numpy/save/16/0.5"):
+            life_bench.compare(results, baseline)
+
+    def test_every_step_starts_from_the_seeded_board(self):
+        boards = []
+        step = life_numpy.NumpyGameOfLife.step
+
+        def recorded_step(game):
+            boards.append(game.curr_generation.tolist())
+            step(game)
+
+        with mock.patch.object(life_numpy.NumpyGameOfLife, "step", recorded_step):
+            life_bench.bench_engine("numpy", 16, 0.5, ["step", "render"])
+        self.assertGreater(len(boards), 2)
+        board = life_bench.random_board(16, 0.5).tolist()
+        self.assertTrue(all(seen == board for seen in boards))
+
+    def test_sizes_above_engine_limit_are_skipped(self):
+        with mock.patch.dict(life_bench.MAX_SIDE, {"list": 8}):
+            self.assertEqual([], life_bench.run(["list"], [16], [0.5], ["step"]))
+
+    def test_engines_match_reference_on_torus(self):
+        self.assertEqual([], life_bench.check_engines(size=19, generations=8, boundary="torus"))
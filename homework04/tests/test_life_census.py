@@ -0,0 +1,47 @@
+import collections
+import unittest
+
+import life_census
+
+
+class TestCensus(unittest.TestCase):
+    def test_components(self):
+        cells = {(0, 0), (1, 1), (5, 5), (5, 6), (9, 0)}
+        groups = sorted(life_census.components(cells), key=min)
+        self.assertEqual([{(0, 0), (1, 1)}, {(5, 5), (5, 6)}, {(9, 0)}], groups)
+
+    def test_canonical_ignores_position_rotation_and_reflection(self):
+        boat = {(0, 0), (0, 1), (1, 0), (1, 2), (2, 1)}
+        turned = {(10 + j, 20 - i) for i, j in boat}
+        mirrored = {(i, -j) for i, j in boat}
+        code = life_census.canonical([boat])
+        self.assertEqual(code, life_census.canonical([turned]))
+        self.assertEqual(code, life_census.canonical([mirrored]))
+        self.assertNotEqual(code, life_census.canonical([{(0, 0), (0, 1), (1, 0), (1, 1)}]))
+
+    def test_classify(self):
+        self.assertEqual("block", life_census.classify({(4, 4), (4, 5), (5, 4), (5, 5)}))
+        self.assertEqual("blinker", life_census.classify({(0, 7), (1, 7), (2, 7)}))
+        self.assertEqual("glider", life_census.classify({(2, 1), (2, 2), (2, 3), (1, 3), (0, 2)}))
+        self.assertEqual("beacon", life_census.classify({(0, 0), (0, 1), (1, 0), (2, 3), (3, 2), (3, 3)}))
+        # Баржа - натюрморт без имени в таблице
+        barge = {(0, 1), (1, 0), (1, 2), (2, 1), (2, 3), (3, 2)}
+        self.assertEqual("xs6_bbo$bobo$obo$bo", life_census.classify(barge))
+        # R-пентамино не повторяется за восемь поколений
+        self.assertEqual(life_census.UNKNOWN, life_census.classify({(0, 1), (0, 2), (1, 0), (1, 1), (2, 1)}))
+
+    def test_stabilize(self):
+        game = life_census.seed_soup(3, side=8)
+        self.assertTrue(life_census.stabilize(game))
+        self.assertFalse(life_census.stabilize(life_census.seed_soup(3, side=8), max_generations=20))
+
+    def test_census_does_not_depend_on_workers(self):
+        seeds = range(12)
+        serial = life_census.census(seeds, workers=1, side=8, chunk=5)
+        parallel = life_census.census(seeds, workers=2, side=8, chunk=5)
+        self.assertEqual(serial, parallel)
+        expected = collections.Counter()
+        for seed in seeds:
+            expected += life_census.census_soup(seed, side=8)
+        self.assertEqual(expected, serial)
+        self.assertGreater(serial["block"], 0)
@@ -0,0 +1,82 @@
+import copy
+import os
+import random
+import tempfile
+import unittest
+
+import life
+import life_checkpoint
+import life_numpy
+import life_sparse
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "run.lifehist")
+        random.seed(42)
+        self.start = life.GameOfLife((13, 21)).curr_generation
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def reference(self, generation):
+        game = life.GameOfLife((13, 21), randomize=False)
+        game.curr_generation = copy.deepcopy(self.start)
+        game.advance(generation - 1)
+        return game.curr_generation
+
+    def test_pack_round_trip(self):
+        lines = [[0, 3, 20], [], [7, 8, 9]]
+        frame = life_checkpoint.pack_rows((3, 21), lines)
+        self.assertEqual((3, 3), frame.shape)
+        self.assertEqual(lines, list(life_checkpoint.unpack_rows(frame, 21)))
+
+    def test_every_recorded_generation_is_restored(self):
+        for compression in ("none", "zlib", "lzma"):
+            with self.subTest(compression=compression):
+                game = life.GameOfLife((13, 21), randomize=False)
+                game.curr_generation = copy.deepcopy(self.start)
+                game.save_history(self.path, 12, keyframe_every=4, compression=compression)
+                with life_checkpoint.HistoryReader(self.path) as reader:
+                    self.assertEqual(list(range(1, 14)), reader.generations)
+                    self.assertEqual((13, 21), reader.size)
+                    self.assertEqual("B3/S23", reader.rule)
+                for generation in (1, 4, 5, 6, 13):
+                    loaded = life.GameOfLife.load_history(self.path, generation)
+                    self.assertEqual(generation, loaded.generations)
+                    self.assertEqual(self.reference(generation), loaded.curr_generation)
+
+    def test_missing_generation_is_computed_from_nearest_frame(self):
+        game = life_numpy.NumpyGameOfLife((13, 21), randomize=False)
+        game.curr_generation = self.start
+        game.save_history(self.path, 20, every=5)
+        with life_checkpoint.HistoryReader(self.path) as reader:
+            self.assertEqual([1, 6, 11, 16, 21], reader.generations)
+            self.assertEqual(6, reader.nearest(9))
+        loaded = life_sparse.SparseGameOfLife.load_history(self.path, 9)
+        self.assertEqual(self.reference(9), loaded.to_grid())
+        self.assertEqual(self.reference(21), life.GameOfLife.load_history(self.path).curr_generation)
+
+
+class TestFrameRing(unittest.TestCase):
+    def test_keeps_last_frames(self):
+        ring = life_checkpoint.FrameRing(3, (2, 10))
+        frames = [life_checkpoint.pack_rows((2, 10), [[k], [9 - k]]) for k in range(5)]
+        buffer = ring.frames
+        for k, frame in enumerate(frames):
+            ring.append(k, frame)
+        self.assertIs(buffer, ring.frames)
+        self.assertEqual(3, len(ring))
+        for k in range(3):
+            generation, frame = ring[k]
+            self.assertEqual(4 - k, generation)
+            self.assertTrue((frames[4 - k] == frame).all())
+        with self.assertRaises(IndexError):
+            ring[3]
+        ring.drop(2)
+        self.assertEqual(2, ring[0][0])
+        ring.append(7, frames[0])
+        self.assertEqual([7, 2], [ring[0][0], ring[1][0]])
+        ring.clear()
+        self.assertEqual(0, len(ring))
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import life
+import life_cli
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            life_cli.main(argv)
+        return out.getvalue().splitlines()
+
+    def test_seeded_runs_are_reproducible(self):
+        random.seed(7)
+        game = life.GameOfLife((12, 15))
+        game.advance(9)
+        for engine in ("list", "numpy", "packed", "sparse"):
+            with self.subTest(engine=engine):
+                output = os.path.join(self.tmp.name, engine)
+                lines = self.run_cli(
+                    "run", "--seed", "7", "--size", "12", "15", "--generations", "9", "--engine", engine,
+                    "--output", output,
+                )
+                self.assertEqual(2, len(lines))
+                self.assertTrue(lines[1].startswith("seed7"))
+                saved = life.GameOfLife.from_file(os.path.join(output, "seed7.gen10.rle"))
+                self.assertEqual(game.curr_generation, saved.to_grid(0, 0, 12, 15))
+
+    def test_pattern_with_checkpoints(self):
+        pattern = os.path.join(os.path.dirname(__file__), "..", "glider.txt")
+        lines = self.run_cli(
+            "run", pattern, "--generations", "10", "--checkpoint-every", "4", "--output", self.tmp.name,
+            "--format", "txt",
+        )
+        self.assertIn("glider", lines[1])
+        self.assertEqual(
+            ["glider.gen11.txt", "glider.gen5.txt", "glider.gen9.txt"], sorted(os.listdir(self.tmp.name))
+        )
+
+    def test_simulate_reports_time_without_checkpoints(self):
+        game = life.GameOfLife((5, 5), randomize=False)
+        calls = []
+        seconds = life_cli.simulate(game, 7, 3, lambda game: calls.append(game.generations))
+        self.assertEqual([4, 7], calls)
+        self.assertEqual(8, game.generations)
+        self.assertGreaterEqual(seconds, 0)
+
+    def test_metrics_and_profile(self):
+        metrics = os.path.join(self.tmp.name, "metrics.jsonl")
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            lines = self.run_cli(
+                "run", "--seed", "1", "--seed", "2", "--size", "20", "20", "--generations", "10", "--engine", "numpy",
+                "--metrics", metrics, "--metrics-every", "4", "--profile",
+            )
+        self.assertEqual(3, len(lines))
+        with open(metrics) as f:
+            summaries = [json.loads(line) for line in f]
+        self.assertEqual(["seed1"] * 3 + ["seed2"] * 3, [summary["name"] for summary in summaries])
+        self.assertEqual([4, 4, 2] * 2, [summary["generations"] for summary in summaries])
+        self.assertIn("next_generation", summaries[0]["phases"])
+        self.assertIn("function calls", errors.getvalue())
+
+    def test_metrics_of_hashlife(self):
+        metrics = os.path.join(self.tmp.name, "metrics.jsonl")
+        self.run_cli(
+            "run", "--seed", "1", "--size", "16", "16", "--generations", "10", "--engine", "hashlife",
+            "--metrics", metrics,
+        )
+        with open(metrics) as f:
+            summaries = [json.loads(line, parse_constant=self.fail) for line in f]
+        self.assertEqual([10], [summary["generations"] for summary in summaries])
+        self.assertIn("next_generation", summaries[0]["phases"])
@@ -0,0 +1,93 @@
+import unittest
+
+import life
+import life_console
+import life_hashlife
+import numpy as np
+
+
+class FakeScreen:
+    def __init__(self, height, width):
+        self.height, self.width = height, width
+        self.lines = [[" "] * width for _ in range(height)]
+        self.writes = []
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def addstr(self, y, x, text):
+        self.writes.append((y, x, text))
+        self.lines[y][x : x + len(text)] = text
+
+    def clrtoeol(self):
+        pass
+
+    def view(self, rows, cols):
+        return [[int(ch == life_console.ALIVE) for ch in line[1 : cols + 1]] for line in self.lines[1 : rows + 1]]
+
+
+class TestConsole(unittest.TestCase):
+    def setUp(self):
+        self.game = life.GameOfLife((20, 30), randomize=False)
+        grid = [[0] * 30 for _ in range(20)]
+        for i, j in [(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)]:
+            grid[i][j] = 1
+        self.game.curr_generation = grid
+
+    def test_frame_runs(self):
+        old = np.array([[0, 0, 0, 0], [1, 1, 0, 0]], dtype=bool)
+        new = np.array([[0, 1, 1, 0], [1, 0, 0, 1]], dtype=bool)
+        self.assertEqual([(0, 1, "**"), (1, 1, " "), (1, 3, "*")], life_console.frame_runs(old, new))
+        self.assertEqual([(0, 0, "    "), (1, 0, "**  ")], life_console.frame_runs(None, old))
+
+    def test_only_changes_are_sent(self):
+        console = life_console.Console(self.game)
+        screen = FakeScreen(13, 12)
+        full = console.draw_grid(screen)
+        self.assertEqual(10 * 10, sum(len(text) for _, _, text in screen.writes))
+        for _ in range(4):
+            self.game.step()
+            screen.writes = []
+            sent = console.draw_grid(screen)
+            self.assertLess(sent, full)
+            self.assertLessEqual(sum(len(text) for _, _, text in screen.writes), 10)
+            self.assertEqual(self.game.to_grid(0, 0, 10, 10), screen.view(10, 10))
+
+    def test_full_redraw(self):
+        console = life_console.Console(self.game, full_redraw=True)
+        screen = FakeScreen(13, 12)
+        console.draw_grid(screen)
+        self.game.step()
+        screen.writes = []
+        console.draw_grid(screen)
+        self.assertEqual(10 * 10, sum(len(text) for _, _, text in screen.writes))
+
+    def test_pan_is_clipped_to_board(self):
+        game = life_hashlife.HashLifeGameOfLife((20, 30), randomize=False)
+        game.curr_generation = self.game.curr_generation
+        console = life_console.Console(game)
+        screen = FakeScreen(13, 12)
+        console.pan(screen, 100, 100)
+        self.assertEqual((10, 20), (console.top, console.left))
+        console.pan(screen, -12, -1)
+        self.assertEqual((0, 19), (console.top, console.left))
+        console.draw_grid(screen)
+        self.assertEqual(game.to_grid(0, 19, 10, 10), screen.view(10, 10))
+
+    def test_board_is_read_only_after_pan(self):
+        console = life_console.Console(self.game)
+        screen = FakeScreen(13, 12)
+        console.draw_grid(screen)
+        to_grid = self.game.to_grid
+        calls = []
+        self.game.to_grid = lambda *args: calls.append(args) or to_grid(*args)
+        for _ in range(3):
+            self.game.step()
+            console.draw_grid(screen)
+            self.assertEqual(to_grid(0, 0, 10, 10), screen.view(10, 10))
+        screen.writes = []
+        self.assertEqual(0, console.draw_grid(screen))
+        self.assertEqual([], calls)
+        console.pan(screen, 5, 5)
+        console.draw_grid(screen)
+        self.assertEqual([(5, 5, 10, 10)], calls)
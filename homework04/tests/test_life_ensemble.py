@@ -0,0 +1,82 @@
+import random
+import unittest
+
+import life
+import life_ensemble
+import life_numpy
+import numpy as np
+
+
+class TestEnsemble(unittest.TestCase):
+    def test_random_boards_match_create_grid(self):
+        random.seed(3)
+        expected = [life.GameOfLife((5, 7)).curr_generation for _ in range(4)]
+        after = random.random()
+        random.seed(3)
+        boards = life_ensemble.random_boards(4, (5, 7))
+        self.assertEqual(expected, boards.tolist())
+        self.assertEqual(after, random.random())
+
+    def test_batched_neighbours_match_single_boards(self):
+        boards = life_ensemble.random_boards(3, (6, 9))
+        counts = life_numpy.count_neighbours(boards)
+        for board, count in zip(boards, counts):
+            self.assertTrue((life_numpy.count_neighbours(board) == count).all())
+
+    def test_boards_stop_like_single_games(self):
+        for max_period in (0, 2):
+            with self.subTest(max_period=max_period):
+                random.seed(7)
+                games = [life.GameOfLife((8, 8), max_generations=60, max_period=max_period) for _ in range(30)]
+                random.seed(7)
+                ensemble = life_ensemble.Ensemble(30, (8, 8), max_generations=60, max_period=max_period)
+                ensemble.run()
+                for k, game in enumerate(games):
+                    while game.is_changing and not game.is_max_generations_exceeded:
+                        game.step()
+                    self.assertEqual(game.generations, ensemble.stopped_at[k])
+                    self.assertEqual(game.curr_generation, ensemble.boards[k].tolist())
+                    if max_period:
+                        self.assertEqual(game.cycle.period if game.cycle else 0, ensemble.periods[k])
+                    else:
+                        self.assertEqual(int(not game.is_changing), ensemble.periods[k])
+                self.assertEqual(0, ensemble.active)
+
+    def test_finished_boards_leave_the_batch(self):
+        ensemble = life_ensemble.Ensemble(3, (5, 5), randomize=False, max_period=2)
+        ensemble._active[0, 1:3, 1:3] = 1
+        ensemble._active[1, 2, 1:4] = 1
+        ensemble._active[2, 0, 0:3] = 1
+        ensemble._active[2, 4, 2:5] = 1
+        ensemble.step()
+        self.assertEqual(2, ensemble.active)
+        ensemble.step()
+        self.assertEqual(1, ensemble.active)
+        self.assertEqual([2, 3, 0], ensemble.stopped_at.tolist())
+        ensemble.run()
+        self.assertEqual([2, 3, 4], ensemble.stopped_at.tolist())
+        self.assertEqual([1, 2, 1], ensemble.periods.tolist())
+        self.assertEqual([4, 3, 0], ensemble.population().tolist())
+
+    def test_rule(self):
+        random.seed(1)
+        game = life_numpy.NumpyGameOfLife((10, 10), rule="B36/S23")
+        random.seed(1)
+        ensemble = life_ensemble.Ensemble(1, (10, 10), max_generations=5, rule="B36/S23")
+        for _ in range(4):
+            game.step()
+        ensemble.run()
+        self.assertTrue((game.curr_generation == ensemble.boards[0]).all())
+        self.assertEqual(5, ensemble.stopped_at[0])
+
+    def test_torus(self):
+        random.seed(2)
+        game = life_numpy.NumpyGameOfLife((10, 10), boundary="torus")
+        random.seed(2)
+        ensemble = life_ensemble.Ensemble(1, (10, 10), max_generations=5, boundary="torus")
+        for _ in range(4):
+            game.step()
+        ensemble.run()
+        self.assertTrue((game.curr_generation == ensemble.boards[0]).all())
+        with self.assertRaises(ValueError):
+            life_ensemble.Ensemble(1, (10, 10), boundary="sphere")
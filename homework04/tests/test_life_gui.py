@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock
+
+import life
+import life_gui
+import life_hashlife
+import life_numpy
+import life_packed
+import life_sparse
+import pygame
+
+life_gui.pygame.display = MagicMock()
+
+
+class TestGUI(unittest.TestCase):
+    def setUp(self):
+        self.grid = [[0] * 40 for _ in range(40)]
+        for i, j in [(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)]:
+            self.grid[i][j] = 1
+
+    def make_gui(self, game):
+        gui = life_gui.GUI(game, cell_size=4)
+        # Вместо окна рисуем в обычную поверхность
+        gui.screen = pygame.Surface((gui.width, gui.height))
+        return gui
+
+    def screen_cells(self, gui):
+        # Центр каждой клетки: зеленый - живая, белый - мертвая
+        pixels = pygame.surfarray.array3d(gui.screen)
+        centre = gui.cell_size // 2
+        cells = pixels[centre :: gui.cell_size, centre :: gui.cell_size]
+        return ((cells[..., 0] == 0) & (cells[..., 1] == 255)).T.astype(int).tolist()
+
+    def test_screen_follows_generations(self):
+        engines = (
+            life.GameOfLife,
+            life_numpy.NumpyGameOfLife,
+            life_packed.PackedGameOfLife,
+            life_sparse.SparseGameOfLife,
+            life_hashlife.HashLifeGameOfLife,
+        )
+        for engine in engines:
+            with self.subTest(engine=engine.__name__):
+                game = engine((40, 40), randomize=False)
+                game.curr_generation = self.grid
+                gui = self.make_gui(game)
+                self.assertEqual([pygame.Rect(0, 0, 160, 160)], gui.draw_grid())
+                for _ in range(30):
+                    game.step()
+                    gui.draw_grid()
+                    self.assertEqual(game.to_grid(), self.screen_cells(gui))
+
+    def test_only_changed_tiles_are_updated(self):
+        game = life.GameOfLife((40, 40), randomize=False)
+        game.curr_generation = self.grid
+        gui = self.make_gui(game)
+        gui.draw_grid()
+        game.step()
+        size = life_gui.TILE * gui.cell_size
+        self.assertEqual([pygame.Rect(0, 0, size, size)], gui.draw_grid())
+
+    def test_grid_lines_are_kept(self):
+        game = life.GameOfLife((40, 40), randomize=False)
+        game.curr_generation = self.grid
+        gui = self.make_gui(game)
+        gui.draw_grid()
+        game.step()
+        gui.draw_grid()
+        pixels = pygame.surfarray.array3d(gui.screen)
+        self.assertTrue((pixels[::4, :, :] == 0).all())
+        self.assertTrue((pixels[:, ::4, :] == 0).all())
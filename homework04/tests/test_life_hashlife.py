@@ -0,0 +1,116 @@
+import os
+import random
+import tempfile
+import unittest
+
+import life_hashlife
+import life_sparse
+
+
+class TestHashLifeGameOfLife(unittest.TestCase):
+    def setUp(self):
+        self.glider = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+
+    def test_canonical_nodes_are_shared(self):
+        universe = life_hashlife.HashLife()
+        a = universe.from_cells({(0, 0), (5, 5)})
+        b = universe.from_cells({(0, 0), (5, 5)})
+        self.assertIs(a.node, b.node)
+
+    def test_advance_matches_sparse_engine(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                random.seed(seed)
+                sparse = life_sparse.SparseGameOfLife((24, 24), bounded=False)
+                random.seed(seed)
+                game = life_hashlife.HashLifeGameOfLife((24, 24))
+                for n in (1, 2, 5, 16, 37):
+                    for _ in range(n):
+                        sparse.step()
+                    game.advance(n)
+                    self.assertEqual(sparse.curr_generation, game.live_cells())
+
+    def test_step_matches_sparse_engine(self):
+        random.seed(3)
+        sparse = life_sparse.SparseGameOfLife((16, 16), bounded=False)
+        random.seed(3)
+        game = life_hashlife.HashLifeGameOfLife((16, 16))
+        for _ in range(10):
+            sparse.step()
+            game.step()
+        self.assertEqual(sparse.curr_generation, game.live_cells())
+        self.assertEqual(11, game.generations)
+
+    def test_advance_millions_of_generations(self):
+        game = life_hashlife.HashLifeGameOfLife((5, 5), randomize=False)
+        game.curr_generation = self.glider
+        game.advance(4 * 10**6)
+        self.assertEqual({(i + 10**6, j + 10**6) for i, j in self.glider}, game.live_cells())
+        self.assertEqual(4 * 10**6 + 1, game.generations)
+
+    def test_window(self):
+        game = life_hashlife.HashLifeGameOfLife((5, 5), randomize=False)
+        game.curr_generation = self.glider
+        game.advance(400)
+        self.assertEqual([[0] * 5 for _ in range(5)], game.to_grid())
+        window = game.to_grid(100, 100, 3, 3)
+        self.assertEqual([[0, 1, 0], [0, 0, 1], [1, 1, 1]], window)
+
+    def test_cache_is_bounded(self):
+        random.seed(1)
+        sparse = life_sparse.SparseGameOfLife((32, 32), bounded=False)
+        random.seed(1)
+        game = life_hashlife.HashLifeGameOfLife((32, 32), max_nodes=500, max_results=200)
+        for _ in range(40):
+            sparse.step()
+        game.advance(40)
+        self.assertEqual(sparse.curr_generation, game.live_cells())
+        self.assertLessEqual(len(game.universe.results), 200)
+
+    def test_is_changing(self):
+        game = life_hashlife.HashLifeGameOfLife((4, 4), randomize=False)
+        game.curr_generation = [[1, 1, 0, 0], [1, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
+        game.step()
+        self.assertFalse(game.is_changing)
+        game.curr_generation = [[0, 1, 0, 0], [0, 1, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0]]
+        game.step()
+        self.assertTrue(game.is_changing)
+
+    def test_save(self):
+        game = life_hashlife.HashLifeGameOfLife((4, 6), randomize=False)
+        grid = [[0, 1, 0, 0, 0, 0], [0, 1, 0, 0, 1, 1], [0, 1, 0, 0, 1, 1], [0, 0, 0, 0, 0, 0]]
+        game.curr_generation = grid
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grid.txt")
+            game.save(path)
+            loaded = life_hashlife.HashLifeGameOfLife.from_file(path)
+        self.assertEqual(grid, loaded.to_grid())
+
+    def test_other_rules_match_sparse_engine(self):
+        for rule in ["B36/S23", "B3678/S34678", "B2/S"]:
+            with self.subTest(rule=rule):
+                random.seed(2)
+                sparse = life_sparse.SparseGameOfLife((16, 16), bounded=False, rule=rule)
+                random.seed(2)
+                game = life_hashlife.HashLifeGameOfLife((16, 16), rule=rule)
+                for _ in range(6):
+                    sparse.step()
+                game.advance(6)
+                self.assertEqual(sparse.curr_generation, game.live_cells())
+
+    def test_birth_without_neighbours_is_rejected(self):
+        with self.assertRaises(ValueError):
+            life_hashlife.HashLifeGameOfLife((5, 5), rule="B0/S8")
+
+    def test_stats(self):
+        game = life_hashlife.HashLifeGameOfLife((8, 8), randomize=False)
+        game.curr_generation = [[1 if (i, j) in self.glider else 0 for j in range(8)] for i in range(8)]
+        game.step()
+        self.assertEqual((5, 2, 2, (1, 0, 4, 3)), game.stats)
+        game.advance(4)
+        # После `advance` изменения считаются от поколения до прыжка
+        self.assertEqual((5, 4, 4, (2, 1, 5, 4)), game.stats)
+
+    def test_torus_is_rejected(self):
+        with self.assertRaises(ValueError):
+            life_hashlife.HashLifeGameOfLife((5, 5), boundary="torus")
@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+import unittest
+
+import life
+import life_hashlife
+import life_io
+import life_numpy
+import life_packed
+import life_sparse
+
+
+class TestPatternIO(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.glider = [
+            [0, 1, 0, 0, 0],
+            [0, 0, 1, 0, 0],
+            [1, 1, 1, 0, 0],
+            [0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0],
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def write(self, name, text):
+        with open(self.path(name), "w") as f:
+            f.write(text)
+        return self.path(name)
+
+    def test_read_rle(self):
+        path = self.write("glider.rle", "#N Glider\nx = 5, y = 5, rule = B3/S23\nbo$2bo$3o!\n")
+        pattern = life_io.read_rle(path)
+        self.assertEqual((5, 5, "B3/S23"), pattern[:3])
+        self.assertEqual([[1], [2], [0, 1, 2], [], []], list(pattern.lines))
+
+    def test_read_rle_with_blank_rows_and_split_counts(self):
+        path = self.write("gap.rle", "x = 12, y = 6\n3$1\n2o$\n2bo!")
+        self.assertEqual([[], [], [], list(range(12)), [2], []], list(life_io.read_pattern(path).lines))
+
+    def test_write_rle(self):
+        path = self.path("glider.rle")
+        life_io.write_pattern(path, (5, 5), [[1], [2], [0, 1, 2], [], []])
+        with open(path) as f:
+            self.assertEqual("x = 5, y = 5, rule = B3/S23\nbo$2bo$3o!\n", f.read())
+
+    def test_rle_round_trip(self):
+        random.seed(1)
+        game = life.GameOfLife((40, 150))
+        game.curr_generation[0] = [0] * 150
+        game.curr_generation[1] = [0] * 150
+        game.save(self.path("soup.rle"))
+        with open(self.path("soup.rle")) as f:
+            self.assertTrue(all(len(line) <= 71 for line in f))
+        loaded = life.GameOfLife.from_file(self.path("soup.rle"))
+        self.assertEqual(game.curr_generation, loaded.curr_generation)
+
+    def test_cells_round_trip(self):
+        path = self.write("glider.cells", "!Name: Glider\n.O\n..O\nOOO\n\n")
+        game = life.GameOfLife.from_file(path)
+        self.assertEqual([[0, 1, 0], [0, 0, 1], [1, 1, 1], [0, 0, 0]], game.curr_generation)
+        game.save(self.path("copy.cells"))
+        with open(self.path("copy.cells")) as f:
+            self.assertEqual(".O.\n..O\nOOO\n...\n", f.read())
+
+    def test_cells_keeps_board_size(self):
+        game = life.GameOfLife((4, 6), randomize=False)
+        game.curr_generation = [[0, 1, 0, 0, 0, 0], [1, 0, 0, 0, 0, 0], [0] * 6, [0] * 6]
+        game.save(self.path("board.cells"))
+        loaded = life.GameOfLife.from_file(self.path("board.cells"))
+        self.assertEqual((4, 6), (loaded.rows, loaded.cols))
+        self.assertEqual(game.curr_generation, loaded.curr_generation)
+
+    def test_text_file(self):
+        game = life.GameOfLife.from_file(os.path.join(os.path.dirname(__file__), "..", "glider.txt"))
+        self.assertEqual(self.glider, game.curr_generation)
+
+    def test_every_engine_loads_and_saves_rle(self):
+        path = self.path("glider.rle")
+        life_io.write_pattern(path, (5, 5), [[1], [2], [0, 1, 2], [], []])
+        engines = [
+            life_numpy.NumpyGameOfLife,
+            life_packed.PackedGameOfLife,
+            life_sparse.SparseGameOfLife,
+            life_hashlife.HashLifeGameOfLife,
+        ]
+        for engine in engines:
+            with self.subTest(engine=engine.__name__):
+                game = engine.from_file(path)
+                self.assertEqual(self.glider, game.to_grid())
+                game.save(self.path("copy.rle"))
+                self.assertEqual(self.glider, life.GameOfLife.from_file(self.path("copy.rle")).curr_generation)
+
+    def test_numpy_memmap_text(self):
+        game = life_numpy.NumpyGameOfLife((7, 9))
+        game.save(self.path("grid.txt"))
+        self.assertEqual(game.to_grid(), life_numpy.read_text_array(self.path("grid.txt")).tolist())
+        ragged = self.write("ragged.txt", "01\n1\n")
+        self.assertIsNone(life_numpy.read_text_array(ragged))
+        self.assertEqual([[0, 1], [1, 0]], life_numpy.NumpyGameOfLife.from_file(ragged).to_grid())
+
+    def test_numpy_memmap_text_with_crlf(self):
+        path = self.write("crlf.txt", "0110\r\n1001\r\n0000\r\n")
+        expected = [[0, 1, 1, 0], [1, 0, 0, 1], [0, 0, 0, 0]]
+        self.assertEqual(expected, life.GameOfLife.from_file(path).curr_generation)
+        self.assertEqual(expected, life_numpy.read_text_array(path).tolist())
+        self.assertEqual(expected, life_numpy.NumpyGameOfLife.from_file(path).to_grid())
+        mixed = self.write("mixed.txt", "01\r\n100\n")
+        self.assertIsNone(life_numpy.read_text_array(mixed))
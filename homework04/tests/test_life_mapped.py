@@ -0,0 +1,127 @@
+import os
+import pathlib
+import random
+import tempfile
+import unittest
+
+import life
+import life_mapped
+import life_numpy
+import numpy as np
+
+
+class TestMappedGameOfLife(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_random_grid_matches_list_engine(self):
+        random.seed(12345)
+        expected = life.GameOfLife((11, 13)).curr_generation
+        random.seed(12345)
+        with life_mapped.MappedGameOfLife((11, 13), stripe=4) as game:
+            self.assertEqual(expected, game.to_grid())
+            self.assertEqual([row[5:9] for row in expected[2:6]], game.to_grid(2, 5, 4, 4))
+            random.seed(12345)
+            reference = life.GameOfLife((11, 13))
+            for cell in ((0, 12), (5, 7), (10, 0)):
+                self.assertEqual(reference.get_neighbours(cell), game.get_neighbours(cell))
+
+    def test_matches_numpy_engine(self):
+        for rule in ("B3/S23", "B36/S23", "B0/S8", "B3678/S34678"):
+            for size, stripe in (((37, 53), None), ((37, 53), 5), ((20, 8), 3), ((9, 1), 2)):
+                with self.subTest(rule=rule, size=size, stripe=stripe):
+                    random.seed(1)
+                    serial = life_numpy.NumpyGameOfLife(size, rule=rule, max_period=4)
+                    random.seed(1)
+                    with life_mapped.MappedGameOfLife(size, rule=rule, stripe=stripe, max_period=4) as game:
+                        for _ in range(25):
+                            serial.step()
+                            game.step()
+                            self.assertEqual(serial.to_grid(), game.to_grid())
+                            self.assertEqual(serial.stats, game.stats)
+                            self.assertEqual(serial.is_changing, game.is_changing)
+                        self.assertEqual(serial.cycle, game.cycle)
+                        for expected, actual in zip(serial.changes, game.changes):
+                            self.assertEqual(sorted(expected.tolist()), sorted(actual.tolist()))
+
+    def test_stats_after_board_is_replaced(self):
+        with life_mapped.MappedGameOfLife((6, 10), randomize=False) as game:
+            game.curr_generation = [[0] * 10, [0, 0, 0, 1, 1, 1, 0, 0, 0, 0]] + [[0] * 10] * 4
+            self.assertEqual(life.Stats(3, 3, 0, (1, 3, 2, 6)), game.stats)
+            game.step()
+            self.assertEqual(life.Stats(3, 2, 2, (0, 4, 3, 5)), game.stats)
+
+    def test_pattern_and_history_files(self):
+        random.seed(5)
+        reference = life.GameOfLife((17, 19))
+        random.seed(5)
+        with life_mapped.MappedGameOfLife((17, 19), directory=self.path) as game:
+            self.assertEqual(3, len(list(self.path.glob("*.bits"))))
+            game.save(self.path / "start.rle")
+            game.save_history(self.path / "run.lifehist", 12, every=4)
+        reference.advance(12)
+        with life_mapped.MappedGameOfLife.from_file(self.path / "start.rle") as game:
+            game.advance(12)
+            self.assertEqual(reference.curr_generation, game.to_grid())
+        with life_mapped.MappedGameOfLife.load_history(self.path / "run.lifehist", 13) as game:
+            self.assertEqual(reference.curr_generation, game.to_grid())
+            self.assertEqual(13, game.generations)
+
+    def test_rewind(self):
+        random.seed(7)
+        with life_mapped.MappedGameOfLife((12, 12), history=5) as game:
+            grids = [game.to_grid()]
+            for _ in range(6):
+                game.step()
+                grids.append(game.to_grid())
+            game.rewind(2)
+            self.assertEqual(grids[-3], game.to_grid())
+            game.step()
+            self.assertEqual(grids[-2], game.to_grid())
+
+    def test_history_frames_survive_step(self):
+        for size in ((12, 12), (9, 1)):
+            with self.subTest(size=size):
+                random.seed(8)
+                reference = life_numpy.NumpyGameOfLife(size, history=5)
+                random.seed(8)
+                with life_mapped.MappedGameOfLife(size, history=5) as game:
+                    for _ in range(4):
+                        reference.step()
+                        game.step()
+                    expected = [reference.history[1].tolist(), reference.history[2].tolist()]
+                    frames = [game.history[1], game.history[2]]
+                    self.assertIsNot(frames[0], frames[1])
+                    game.step()
+                    for grid, frame in zip(expected, frames):
+                        self.assertEqual(grid, np.unpackbits(frame, axis=1, count=size[1]).tolist())
+                    game.curr_generation = frames[1]
+                    self.assertEqual(expected[1], game.to_grid())
+                    game.curr_generation = expected[0]
+                    self.assertEqual(expected[0], game.to_grid())
+
+    def test_close_removes_temporary_files(self):
+        game = life_mapped.MappedGameOfLife((8, 8))
+        directory = game.directory
+        self.assertTrue(os.path.isdir(directory))
+        game.close()
+        self.assertFalse(os.path.exists(directory))
+        game.close()
+
+    def test_torus_matches_list_engine(self):
+        for rule in ("B3/S23", "B0/S8"):
+            for size, stripe in (((13, 21), None), ((13, 21), 4), ((9, 16), 2), ((5, 1), 2)):
+                with self.subTest(rule=rule, size=size, stripe=stripe):
+                    random.seed(2)
+                    reference = life.GameOfLife(size, rule=rule, boundary="torus")
+                    random.seed(2)
+                    with life_mapped.MappedGameOfLife(size, rule=rule, stripe=stripe, boundary="torus") as game:
+                        for _ in range(12):
+                            reference.step()
+                            game.step()
+                            self.assertEqual(reference.curr_generation, game.to_grid())
+                        self.assertEqual(reference.get_neighbours((0, 0)), game.get_neighbours((0, 0)))
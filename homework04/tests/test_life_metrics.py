@@ -0,0 +1,119 @@
+import io
+import json
+import random
+import unittest
+
+import life
+import life_hashlife
+import life_metrics
+import life_numpy
+import ui
+
+
+class FrameUI(ui.UI):
+    def run(self) -> None:
+        for _ in range(3):
+            self.life.step()
+            self.draw_grid()
+
+    def draw_grid(self):
+        return self.life.to_grid()
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.game = life.GameOfLife((12, 15), max_period=2)
+
+    def test_phases_are_timed(self):
+        metrics = life_metrics.Metrics()
+        metrics.attach(self.game)
+        self.assertNotIn("advance", vars(self.game))
+        self.game.advance(4)
+        summary = metrics.summary()
+        self.assertEqual(4, summary.generations)
+        self.assertEqual(4 * 12 * 15, summary.cells)
+        # Статистику никто не спрашивал, поэтому она не считалась
+        self.assertEqual({"history", "next_generation", "cycle", "other"}, set(summary.phases))
+        self.assertAlmostEqual(summary.seconds, sum(summary.phases.values()))
+        self.assertEqual(0, summary.max_allocated)
+
+    def test_nested_phases_are_not_counted_twice(self):
+        random.seed(3)
+        game = life_numpy.NumpyGameOfLife((64, 64), max_period=2)
+        with life_metrics.Metrics() as metrics:
+            metrics.attach(game)
+            game.advance(4)
+            summary = metrics.summary()
+        # Поиск цикла спрашивает изменившиеся клетки, а они считаются вместе со статистикой
+        self.assertIn("stats", summary.phases)
+        self.assertAlmostEqual(summary.seconds, sum(summary.phases.values()))
+
+    def test_engine_advance_is_timed(self):
+        game = life_hashlife.HashLifeGameOfLife((16, 16))
+        with life_metrics.Metrics() as metrics:
+            metrics.attach(game)
+            game.advance(8)
+            game.step()
+            summary = metrics.summary()
+        self.assertEqual(9, summary.generations)
+        self.assertEqual(9 * 16 * 16, summary.cells)
+        self.assertIn("next_generation", summary.phases)
+        self.assertAlmostEqual(summary.seconds, sum(summary.phases.values()))
+        self.assertNotIn("advance", vars(game))
+
+    def test_json_without_time(self):
+        summary = life_metrics.Summary(0, 0, 0.0, {}, 0.0, 0)
+        data = json.loads(summary.to_json(name="run"), parse_constant=self.fail)
+        self.assertIsNone(data["cells_per_second"])
+
+    def test_detach_restores_methods(self):
+        metrics = life_metrics.Metrics()
+        metrics.attach(self.game)
+        metrics.detach()
+        self.assertNotIn("step", vars(self.game))
+        self.assertNotIn("get_next_generation", vars(self.game))
+        self.game.step()
+        self.assertEqual(0, metrics.summary().generations)
+
+    def test_periodic_summaries(self):
+        output = io.StringIO()
+        summaries = []
+        with life_metrics.Metrics(3, output, [summaries.append], labels={"name": "run"}) as metrics:
+            metrics.attach(self.game)
+            self.game.advance(7)
+        self.assertEqual([3, 3, 1], [summary.generations for summary in summaries])
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(["run"] * 3, [line["name"] for line in lines])
+        self.assertEqual([3, 3, 1], [line["generations"] for line in lines])
+        self.assertNotIn("step", vars(self.game))
+
+    def test_allocations(self):
+        random.seed(3)
+        game = life_numpy.NumpyGameOfLife((64, 64))
+        with life_metrics.Metrics(allocations=True) as metrics:
+            metrics.attach(game)
+            game.advance(3)
+            summary = metrics.summary()
+        # Следующее поколение - новый массив поля
+        self.assertGreaterEqual(summary.max_allocated, 64 * 64)
+        self.assertGreater(summary.allocated, 0)
+
+    def test_ui_render_is_timed(self):
+        frames = FrameUI(self.game)
+        with life_metrics.Metrics() as metrics:
+            metrics.attach(self.game)
+            metrics.attach(frames)
+            frames.run()
+            summary = metrics.summary()
+        self.assertEqual(3, summary.generations)
+        self.assertIn("render", summary.phases)
+        self.assertNotIn("draw_grid", vars(frames))
+
+    def test_profiled(self):
+        output = io.StringIO()
+        with life_metrics.profiled(output, limit=5):
+            self.game.advance(2)
+        text = output.getvalue()
+        self.assertIn("get_next_generation", text)
+        self.assertIn("пик памяти", text)
@@ -0,0 +1,194 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import life
+import life_numpy
+import numpy as np
+
+
+class TestNumpyGameOfLife(unittest.TestCase):
+    def setUp(self):
+        self.grid = [
+            [1, 1, 0, 0, 1, 1, 1, 1],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [1, 0, 1, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 0, 1, 1, 1],
+        ]
+        self.rows = 6
+        self.cols = 8
+
+    def test_random_grid_matches_list_engine(self):
+        random.seed(12345)
+        expected = life.GameOfLife((7, 11)).curr_generation
+        after = random.random()
+        random.seed(12345)
+        game = life_numpy.NumpyGameOfLife((7, 11))
+        self.assertEqual(expected, game.curr_generation.tolist())
+        self.assertEqual(after, random.random())
+
+    def test_get_neighbours_matches_list_engine(self):
+        reference = life.GameOfLife((self.rows, self.cols))
+        reference.curr_generation = self.grid
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        for i in range(self.rows):
+            for j in range(self.cols):
+                with self.subTest(cell=(i, j)):
+                    self.assertEqual(sorted(reference.get_neighbours((i, j))), sorted(game.get_neighbours((i, j))))
+
+    def test_can_update(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+
+        tests_dir = os.path.dirname(__file__)
+        steps_path = os.path.join(tests_dir, "steps.txt")
+        with open(steps_path) as f:
+            steps = json.load(f)
+
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step) - num_updates):
+                    game.step()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.curr_generation.tolist())
+
+    def test_is_changing(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        game.step()
+        self.assertTrue(game.is_changing)
+        for _ in range(20):
+            game.step()
+        self.assertFalse(game.is_changing)
+
+    def test_save_and_load(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grid.txt")
+            game.save(path)
+            loaded = life.GameOfLife.from_file(path)
+            numpy_loaded = life_numpy.NumpyGameOfLife.from_file(path)
+        self.assertEqual(self.grid, loaded.curr_generation)
+        self.assertEqual(self.grid, numpy_loaded.curr_generation.tolist())
+
+    def test_cell_keys_match_cell_key(self):
+        cells = [(0, 0), (3, 7), (-5, 2), (123456, -987654)]
+        keys = life_numpy.cell_keys(np.array(cells))
+        self.assertEqual([life.cell_key(cell) for cell in cells], keys.tolist())
+
+    def test_cycle_is_detected(self):
+        game = life_numpy.NumpyGameOfLife((6, 6), randomize=False, max_period=3)
+        game.curr_generation = [[0] * 6, [0] * 6, [0, 1, 1, 1, 0, 0], [0, 0, 1, 1, 1, 0], [0] * 6, [0] * 6]
+        for _ in range(3):
+            game.step()
+        self.assertEqual(life.Cycle(start=1, period=2), game.cycle)
+        self.assertEqual(game.hash_cells(game.live_cells()), game.board_hash)
+
+    def test_other_rules_match_list_engine(self):
+        for rule in ["B36/S23", "B3678/S34678", "B2/S", "B3/S012345678"] + ["B0/S8"]:
+            with self.subTest(rule=rule):
+                random.seed(11)
+                reference = life.GameOfLife((20, 33), rule=rule)
+                random.seed(11)
+                game = life_numpy.NumpyGameOfLife((20, 33), rule=rule)
+                for _ in range(8):
+                    reference.step()
+                    game.step()
+                    self.assertEqual(reference.curr_generation, game.curr_generation.tolist())
+
+    def test_generation_views_are_read_only(self):
+        game = life_numpy.NumpyGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        views = dict(game.iter_generations(stop=4))
+        self.assertEqual(self.grid, views[1].tolist())
+        with self.assertRaises(ValueError):
+            views[2][0, 0] = 1
+        game.step()
+        self.assertEqual(self.grid, views[1].tolist())
+
+    def test_stats_match_list_engine(self):
+        for rule in ["B3/S23", "B0/S8"]:
+            with self.subTest(rule=rule):
+                random.seed(5)
+                reference = life.GameOfLife((20, 33), rule=rule)
+                random.seed(5)
+                game = life_numpy.NumpyGameOfLife((20, 33), rule=rule)
+                for _ in range(12):
+                    reference.step()
+                    game.step()
+                    self.assertEqual(reference.stats, game.stats)
+        game = life_numpy.NumpyGameOfLife((20, 33))
+        game.step()
+        game.curr_generation = np.zeros((20, 33), dtype=np.uint8)
+        game.step()
+        self.assertEqual(life.Stats(0, 0, 0, None), game.stats)
+        self.assertFalse(game.is_changing)
+
+    def test_changes_match_list_engine(self):
+        for rule in ["B3/S23", "B0/S8"]:
+            with self.subTest(rule=rule):
+                random.seed(6)
+                reference = life.GameOfLife((20, 33), rule=rule)
+                random.seed(6)
+                game = life_numpy.NumpyGameOfLife((20, 33), rule=rule)
+                for _ in range(6):
+                    reference.step()
+                    game.step()
+                    for expected, cells in zip(reference.changes, game.changes):
+                        self.assertEqual(expected.tolist(), sorted(cells.tolist()))
+        game.curr_generation = np.zeros((20, 33), dtype=np.uint8)
+        self.assertEqual(0, len(game.changes.born))
+        self.assertEqual(game.stats.deaths, len(game.changes.died))
+
+    def test_stats_are_computed_on_demand(self):
+        random.seed(4)
+        game = life_numpy.NumpyGameOfLife((30, 30))
+        with mock.patch.object(game, "compute_stats", wraps=game.compute_stats) as compute:
+            game.advance(3)
+            self.assertEqual(0, compute.call_count)
+            game.stats
+            game.step()
+            stats = game.stats
+            self.assertEqual(2, compute.call_count)
+        # Статистика предыдущего поколения известна: считается только около его рамки
+        self.assertIsNone(compute.call_args_list[0].args[0])
+        self.assertIsNotNone(compute.call_args_list[1].args[0])
+        self.assertEqual(game.compute_stats(), stats)
+
+    def test_rewind(self):
+        random.seed(4)
+        game = life_numpy.NumpyGameOfLife((13, 21), history=8, max_period=2)
+        start = game.curr_generation.copy()
+        for _ in range(5):
+            game.step()
+        after = game.curr_generation.copy()
+        game.rewind(5)
+        self.assertTrue((start == game.curr_generation).all())
+        self.assertEqual(1, game.generations)
+        for _ in range(5):
+            game.step()
+        self.assertTrue((after == game.curr_generation).all())
+        self.assertEqual(6, len(game.history))
+
+    def test_torus_matches_list_engine(self):
+        for rule in ["B3/S23", "B36/S23", "B0/S8"]:
+            with self.subTest(rule=rule):
+                random.seed(3)
+                reference = life.GameOfLife((13, 21), rule=rule, boundary="torus")
+                random.seed(3)
+                game = life_numpy.NumpyGameOfLife((13, 21), rule=rule, boundary="torus")
+                for _ in range(12):
+                    reference.step()
+                    game.step()
+                    self.assertEqual(reference.curr_generation, game.curr_generation.tolist())
+                    self.assertEqual(reference.stats, game.stats)
+                for cell in ((0, 0), (12, 20), (6, 0)):
+                    self.assertEqual(reference.get_neighbours(cell), game.get_neighbours(cell))
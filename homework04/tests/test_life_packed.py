@@ -0,0 +1,143 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import life
+import life_packed
+
+
+class TestPackedGameOfLife(unittest.TestCase):
+    def setUp(self):
+        self.grid = [
+            [1, 1, 0, 0, 1, 1, 1, 1],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [1, 0, 1, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 0, 1, 1, 1],
+        ]
+        self.rows = 6
+        self.cols = 8
+
+    def test_grid_round_trip(self):
+        board = life_packed.PackedBoard.from_grid(self.grid)
+        self.assertEqual(self.grid, board.to_grid())
+        self.assertEqual(self.grid, list(board))
+        self.assertEqual(sum(map(sum, self.grid)), board.population())
+
+    def test_random_grid_matches_list_engine(self):
+        random.seed(12345)
+        expected = life.GameOfLife((5, 9)).curr_generation
+        random.seed(12345)
+        game = life_packed.PackedGameOfLife((5, 9))
+        self.assertEqual(expected, game.curr_generation.to_grid())
+
+    def test_get_neighbours(self):
+        game = life_packed.PackedGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        self.assertEqual(4, sum(game.get_neighbours((2, 3))))
+        self.assertEqual(3, len(game.get_neighbours((5, 7))))
+        self.assertEqual(1, sum(game.get_neighbours((5, 7))))
+
+    def test_can_update(self):
+        game = life_packed.PackedGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+
+        tests_dir = os.path.dirname(__file__)
+        steps_path = os.path.join(tests_dir, "steps.txt")
+        with open(steps_path) as f:
+            steps = json.load(f)
+
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step) - num_updates):
+                    game.step()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.curr_generation.to_grid())
+
+    def test_matches_list_engine_on_random_board(self):
+        random.seed(7)
+        reference = life.GameOfLife((40, 70))
+        game = life_packed.PackedGameOfLife((40, 70), randomize=False)
+        game.curr_generation = reference.curr_generation
+        for _ in range(10):
+            reference.step()
+            game.step()
+        self.assertEqual(reference.curr_generation, game.curr_generation.to_grid())
+        self.assertEqual(reference.is_changing, game.is_changing)
+
+    def test_save(self):
+        game = life_packed.PackedGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grid.txt")
+            game.save(path)
+            loaded = life_packed.PackedGameOfLife.from_file(path)
+        self.assertEqual(game.curr_generation, loaded.curr_generation)
+
+    def test_cycle_is_detected(self):
+        game = life_packed.PackedGameOfLife((self.rows, self.cols), max_period=10)
+        game.curr_generation = self.grid
+        while game.is_changing:
+            game.step()
+        self.assertEqual(life.Cycle(start=19, period=1), game.cycle)
+        self.assertEqual(game.hash_cells(game.live_cells()), game.board_hash)
+
+    def test_other_rules_match_list_engine(self):
+        for rule in ["B36/S23", "B3678/S34678", "B2/S", "B3/S012345678"]:
+            with self.subTest(rule=rule):
+                random.seed(11)
+                reference = life.GameOfLife((20, 33), rule=rule)
+                game = life_packed.PackedGameOfLife((20, 33), randomize=False, rule=rule)
+                game.curr_generation = reference.curr_generation
+                for _ in range(8):
+                    reference.step()
+                    game.step()
+                    self.assertEqual(reference.curr_generation, game.curr_generation.to_grid())
+
+    def test_generation_views_are_read_only(self):
+        game = life_packed.PackedGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        views = dict(game.iter_generations(stop=3))
+        self.assertEqual(self.grid, views[1].to_grid())
+        with self.assertRaises(TypeError):
+            views[1].set((0, 0), 0)
+
+    def test_stats_match_list_engine(self):
+        random.seed(5)
+        reference = life.GameOfLife((20, 70))
+        random.seed(5)
+        game = life_packed.PackedGameOfLife((20, 70))
+        for _ in range(12):
+            reference.step()
+            game.step()
+            self.assertEqual(reference.stats, game.stats)
+
+    def test_changes_match_list_engine(self):
+        random.seed(6)
+        reference = life.GameOfLife((20, 70))
+        random.seed(6)
+        game = life_packed.PackedGameOfLife((20, 70))
+        for _ in range(6):
+            reference.step()
+            game.step()
+            for expected, cells in zip(reference.changes, game.changes):
+                self.assertEqual(expected.tolist(), sorted(cells.tolist()))
+
+    def test_torus_matches_list_engine(self):
+        for rule in ["B3/S23", "B36/S23", "B0/S8"]:
+            for size in [(13, 21), (5, 8), (9, 64), (4, 70)]:
+                with self.subTest(rule=rule, size=size):
+                    random.seed(3)
+                    reference = life.GameOfLife(size, rule=rule, boundary="torus")
+                    game = life_packed.PackedGameOfLife(size, randomize=False, rule=rule, boundary="torus")
+                    game.curr_generation = reference.curr_generation
+                    for _ in range(10):
+                        reference.step()
+                        game.step()
+                        self.assertEqual(reference.curr_generation, game.curr_generation.to_grid())
+                    for cell in ((0, 0), (size[0] - 1, size[1] - 1)):
+                        self.assertEqual(reference.get_neighbours(cell), game.get_neighbours(cell))
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+import life_numpy
+import life_parallel
+
+
+class TestParallelGameOfLife(unittest.TestCase):
+    def test_split_rows(self):
+        self.assertEqual([(0, 3), (3, 6), (6, 10)], life_parallel.split_rows(10, 3))
+        self.assertEqual([(0, 1), (1, 2)], life_parallel.split_rows(2, 8))
+
+    def test_matches_serial_engine(self):
+        for workers in (1, 2, 3):
+            with self.subTest(workers=workers):
+                random.seed(workers)
+                serial = life_numpy.NumpyGameOfLife((37, 53))
+                random.seed(workers)
+                with life_parallel.ParallelGameOfLife((37, 53), workers=workers) as game:
+                    self.assertTrue((serial.curr_generation == game.curr_generation).all())
+                    for _ in range(15):
+                        serial.step()
+                        game.step()
+                        self.assertTrue((serial.curr_generation == game.curr_generation).all())
+                    self.assertEqual(serial.is_changing, game.is_changing)
+                    self.assertTrue((serial.prev_generation == game.prev_generation).all())
+
+    def test_generation_survives_close(self):
+        game = life_parallel.ParallelGameOfLife((6, 6), randomize=False, workers=2)
+        game.curr_generation = [[0, 0, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0], [0, 0, 1, 0, 0, 0], [0, 0, 1, 0, 0, 0]] + [
+            [0] * 6
+        ] * 2
+        game.step()
+        game.close()
+        self.assertEqual([0, 1, 1, 1, 0, 0], game.to_grid()[2])
+        self.assertTrue(game.is_changing)
+
+    def test_rule_is_passed_to_workers(self):
+        random.seed(4)
+        serial = life_numpy.NumpyGameOfLife((30, 30), rule="B36/S23")
+        random.seed(4)
+        with life_parallel.ParallelGameOfLife((30, 30), workers=2, rule="B36/S23") as game:
+            for _ in range(10):
+                serial.step()
+                game.step()
+            self.assertTrue((serial.curr_generation == game.curr_generation).all())
+
+    def test_generation_views_survive_buffer_swaps(self):
+        random.seed(9)
+        serial = life_numpy.NumpyGameOfLife((20, 20))
+        random.seed(9)
+        with life_parallel.ParallelGameOfLife((20, 20), workers=2) as game:
+            views = dict(game.iter_generations(stop=6))
+        for generation, view in sorted(views.items()):
+            self.assertTrue((serial.curr_generation == view).all())
+            serial.step()
+
+    def test_stats_match_serial_engine(self):
+        random.seed(3)
+        serial = life_numpy.NumpyGameOfLife((37, 53))
+        random.seed(3)
+        with life_parallel.ParallelGameOfLife((37, 53), workers=2) as game:
+            for _ in range(10):
+                serial.step()
+                game.step()
+                self.assertEqual(serial.stats, game.stats)
+
+    def test_torus_matches_serial_engine(self):
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                random.seed(workers)
+                serial = life_numpy.NumpyGameOfLife((13, 21), boundary="torus")
+                random.seed(workers)
+                with life_parallel.ParallelGameOfLife((13, 21), workers=workers, boundary="torus") as game:
+                    for _ in range(15):
+                        serial.step()
+                        game.step()
+                        self.assertTrue((serial.curr_generation == game.curr_generation).all())
@@ -112,3 +112,52 @@ class TestGameOfLife(unittest.TestCase):
                     game.grid = game.get_next_generation()
                     num_updates += 1
                 self.assertEqual(steps[step], game.grid)
+
+    def test_headless_game_does_not_open_a_window(self):
+        life_proto.pygame.display.set_mode.reset_mock()
+        game = life_proto.GameOfLife(width=80, height=60, cell_size=10, headless=True)
+        life_proto.pygame.display.set_mode.assert_not_called()
+        game.grid = [[1] + [0] * 7] + [[0] * 8 for _ in range(5)]
+        game.draw_grid()
+        self.assertEqual(life_proto.pygame.Color("green"), game.screen.get_at((5, 5)))
+        self.assertEqual(life_proto.pygame.Color("white"), game.screen.get_at((15, 5)))
+
+    def test_update_follows_target_rate(self):
+        game = life_proto.GameOfLife(
+            width=self.width, height=self.height, cell_size=1, generations_per_second=4, headless=True
+        )
+        game.grid = self.grid
+        reference = life_proto.GameOfLife(width=self.width, height=self.height, cell_size=1, headless=True)
+        reference.grid = self.grid
+        self.assertEqual(2, game.update(0.5))
+        self.assertEqual(0, game.update(0.125))
+        self.assertEqual(1, game.update(0.125))
+        for _ in range(3):
+            reference.grid = reference.get_next_generation()
+        self.assertEqual(reference.grid, game.grid)
+        self.assertEqual(3, game.generations)
+
+    def test_update_drops_lag_it_cannot_catch_up(self):
+        game = life_proto.GameOfLife(
+            width=self.width, height=self.height, cell_size=1, generations_per_second=100, headless=True
+        )
+        self.assertEqual(life_proto.MAX_CATCH_UP, game.update(60))
+        self.assertEqual(0, game.update(0.001))
+
+    def test_simulate_in_thread(self):
+        game = life_proto.GameOfLife(
+            width=self.width, height=self.height, cell_size=1, generations_per_second=200, headless=True
+        )
+        game.grid = self.grid
+        stop = life_proto.threading.Event()
+        worker = life_proto.threading.Thread(target=game.simulate, args=(stop,))
+        worker.start()
+        life_proto.time.sleep(0.2)
+        stop.set()
+        worker.join()
+        self.assertGreater(game.generations, 0)
+        reference = life_proto.GameOfLife(width=self.width, height=self.height, cell_size=1, headless=True)
+        reference.grid = self.grid
+        for _ in range(game.generations):
+            reference.grid = reference.get_next_generation()
+        self.assertEqual(reference.grid, game.grid)
@@ -0,0 +1,143 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import life
+import life_sparse
+
+
+class TestSparseGameOfLife(unittest.TestCase):
+    def setUp(self):
+        self.grid = [
+            [1, 1, 0, 0, 1, 1, 1, 1],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [1, 0, 1, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 0, 1, 1, 1],
+        ]
+        self.rows = 6
+        self.cols = 8
+
+    def test_empty_grid_has_no_cells(self):
+        game = life_sparse.SparseGameOfLife((10**6, 10**6), randomize=False)
+        self.assertEqual(set(), game.curr_generation)
+
+    def test_random_grid_matches_list_engine(self):
+        random.seed(12345)
+        expected = life.GameOfLife((5, 9)).curr_generation
+        random.seed(12345)
+        game = life_sparse.SparseGameOfLife((5, 9))
+        self.assertEqual(expected, game.to_grid())
+
+    def test_get_neighbours(self):
+        game = life_sparse.SparseGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        self.assertEqual(8, len(game.get_neighbours((2, 3))))
+        self.assertEqual(4, sum(game.get_neighbours((2, 3))))
+        self.assertEqual(3, len(game.get_neighbours((0, 0))))
+        self.assertEqual(5, len(game.get_neighbours((5, 3))))
+
+    def test_can_update(self):
+        game = life_sparse.SparseGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+
+        tests_dir = os.path.dirname(__file__)
+        steps_path = os.path.join(tests_dir, "steps.txt")
+        with open(steps_path) as f:
+            steps = json.load(f)
+
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step) - num_updates):
+                    game.step()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.to_grid())
+
+    def test_unbounded_glider_leaves_the_window(self):
+        glider = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+        game = life_sparse.SparseGameOfLife((5, 5), randomize=False, bounded=False)
+        game.curr_generation = set(glider)
+        for _ in range(40):
+            game.step()
+        self.assertEqual({(i + 10, j + 10) for i, j in glider}, game.curr_generation)
+        self.assertEqual([[0] * 5 for _ in range(5)], game.to_grid())
+
+    def test_bounded_glider_stops_at_the_edge(self):
+        game = life_sparse.SparseGameOfLife((5, 5), randomize=False)
+        game.curr_generation = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+        for _ in range(40):
+            game.step()
+        self.assertFalse(game.is_changing)
+        self.assertEqual({(3, 3), (3, 4), (4, 3), (4, 4)}, game.curr_generation)
+
+    def test_save(self):
+        game = life_sparse.SparseGameOfLife((self.rows, self.cols))
+        game.curr_generation = self.grid
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grid.txt")
+            game.save(path)
+            loaded = life.GameOfLife.from_file(path)
+        self.assertEqual(self.grid, loaded.curr_generation)
+
+    def test_cycle_is_detected(self):
+        game = life_sparse.SparseGameOfLife((self.rows, self.cols), max_period=10)
+        game.curr_generation = self.grid
+        while game.is_changing:
+            game.step()
+        self.assertEqual(life.Cycle(start=19, period=1), game.cycle)
+        self.assertEqual(game.hash_cells(game.live_cells()), game.board_hash)
+
+    def test_other_rules_match_list_engine(self):
+        for rule in ["B36/S23", "B3678/S34678", "B2/S", "B3/S012345678"]:
+            with self.subTest(rule=rule):
+                random.seed(11)
+                reference = life.GameOfLife((20, 33), rule=rule)
+                random.seed(11)
+                game = life_sparse.SparseGameOfLife((20, 33), rule=rule)
+                for _ in range(8):
+                    reference.step()
+                    game.step()
+                    self.assertEqual(reference.curr_generation, game.to_grid())
+
+    def test_birth_without_neighbours_is_rejected(self):
+        with self.assertRaises(ValueError):
+            life_sparse.SparseGameOfLife((5, 5), rule="B0/S8")
+
+    def test_stats_match_list_engine(self):
+        random.seed(5)
+        reference = life.GameOfLife((20, 33))
+        random.seed(5)
+        game = life_sparse.SparseGameOfLife((20, 33))
+        for _ in range(12):
+            reference.step()
+            game.step()
+            self.assertEqual(reference.stats, game.stats)
+
+    def test_changes_match_list_engine(self):
+        random.seed(6)
+        reference = life.GameOfLife((20, 33))
+        random.seed(6)
+        game = life_sparse.SparseGameOfLife((20, 33))
+        for _ in range(6):
+            reference.step()
+            game.step()
+            for expected, cells in zip(reference.changes, game.changes):
+                self.assertEqual(expected.tolist(), sorted(cells.tolist()))
+
+    def test_torus_matches_list_engine(self):
+        random.seed(3)
+        reference = life.GameOfLife((13, 21), boundary="torus")
+        random.seed(3)
+        game = life_sparse.SparseGameOfLife((13, 21), boundary="torus")
+        for _ in range(12):
+            reference.step()
+            game.step()
+            self.assertEqual(reference.curr_generation, game.to_grid())
+            self.assertEqual(reference.stats, game.stats)
+        self.assertEqual(reference.get_neighbours((0, 20)), game.get_neighbours((0, 20)))
+        with self.assertRaises(ValueError):
+            life_sparse.SparseGameOfLife((5, 5), bounded=False, boundary="torus")
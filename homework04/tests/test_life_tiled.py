@@ -0,0 +1,80 @@
+import random
+import unittest
+from unittest import mock
+
+import life_numpy
+import life_tiled
+
+
+class TestTiledGameOfLife(unittest.TestCase):
+    def test_matches_numpy_engine(self):
+        for tile_size in (1, 4, 7, 32):
+            with self.subTest(tile_size=tile_size):
+                random.seed(tile_size)
+                reference = life_numpy.NumpyGameOfLife((45, 61))
+                random.seed(tile_size)
+                game = life_tiled.TiledGameOfLife((45, 61), tile_size=tile_size)
+                for _ in range(60):
+                    reference.step()
+                    game.step()
+                    self.assertTrue((reference.curr_generation == game.curr_generation).all())
+                self.assertEqual(reference.is_changing, game.is_changing)
+
+    def test_stable_tiles_are_skipped(self):
+        game = life_tiled.TiledGameOfLife((64, 64), randomize=False, tile_size=16)
+        grid = [[0] * 64 for _ in range(64)]
+        # Блок в левом верхнем углу и мигалка в правом нижнем
+        grid[1][1] = grid[1][2] = grid[2][1] = grid[2][2] = 1
+        grid[50][50] = grid[50][51] = grid[50][52] = 1
+        game.curr_generation = grid
+        game.step()
+        self.assertEqual(life_tiled.TileStats(16, 0), game.tile_stats)
+        game.step()
+        self.assertEqual(life_tiled.TileStats(4, 12), game.tile_stats)
+        for _ in range(3):
+            game.step()
+        self.assertEqual(life_tiled.TileStats(4, 12), game.tile_stats)
+        self.assertEqual(1, game.to_grid()[49][51])
+        self.assertEqual(1, game.to_grid()[1][1])
+        self.assertEqual(life_tiled.TileStats(16 + 4 * 4, 12 * 4), game.total_tile_stats)
+
+    def test_other_rules_match_numpy_engine(self):
+        for rule in ["B36/S23", "B3678/S34678", "B0/S8"]:
+            with self.subTest(rule=rule):
+                random.seed(5)
+                reference = life_numpy.NumpyGameOfLife((45, 61), rule=rule)
+                random.seed(5)
+                game = life_tiled.TiledGameOfLife((45, 61), tile_size=8, rule=rule)
+                for _ in range(30):
+                    reference.step()
+                    game.step()
+                    self.assertTrue((reference.curr_generation == game.curr_generation).all())
+
+    def test_torus_matches_numpy_engine(self):
+        for tile_size in (1, 4, 7, 32):
+            with self.subTest(tile_size=tile_size):
+                random.seed(tile_size)
+                reference = life_numpy.NumpyGameOfLife((13, 21), boundary="torus")
+                random.seed(tile_size)
+                game = life_tiled.TiledGameOfLife((13, 21), tile_size=tile_size, boundary="torus")
+                for _ in range(40):
+                    reference.step()
+                    game.step()
+                    self.assertTrue((reference.curr_generation == game.curr_generation).all())
+
+    def test_still_tiles_are_not_compared_or_copied(self):
+        game = life_tiled.TiledGameOfLife((64, 64), randomize=False, tile_size=16)
+        grid = [[0] * 64 for _ in range(64)]
+        grid[50][50] = grid[50][51] = grid[50][52] = 1
+        game.curr_generation = grid
+        game.step()
+        view = game.generation_view()
+        buffers = {id(game.prev_generation), id(game.curr_generation)}
+        with mock.patch.object(game, "changed_tiles", wraps=game.changed_tiles) as changed_tiles:
+            for _ in range(3):
+                game.step()
+                self.assertIn(id(game.curr_generation), buffers)
+            self.assertEqual(0, changed_tiles.call_count)
+        self.assertEqual([1, 1, 1], game.to_grid()[50][50:53])
+        # Вид поколения не меняется, хотя его массив уже перезаписан
+        self.assertEqual([0, 1, 0], view[50, 50:53].tolist())